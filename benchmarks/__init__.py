@@ -0,0 +1,7 @@
+"""
+Performance benchmarks for the game's hot paths.
+
+    python -m benchmarks run -o results.json       # full suite (suite.py)
+    python -m benchmarks compare base.json results.json
+    python -m benchmarks.bench_collision            # grid index vs linear scan
+"""
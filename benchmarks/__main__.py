@@ -0,0 +1,54 @@
+"""
+Command line for the benchmark suite.
+
+    python -m benchmarks run [-o results.json] [--group frame ...]
+    python -m benchmarks compare baseline.json results.json [--threshold 0.1]
+
+`compare` exits with status 1 when any benchmark regressed.
+"""
+import argparse
+import json
+import sys
+from benchmarks.suite import BENCHMARKS, run, compare
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="run the suite and write JSON results")
+    run_p.add_argument("-o", "--output", default="bench_results.json")
+    run_p.add_argument("--group", action="append", choices=list(BENCHMARKS),
+                       help="only run these groups (repeatable)")
+    run_p.add_argument("--repeat", type=int, default=7)
+    run_p.add_argument("--min-time", type=float, default=0.05, help="seconds per timing round")
+
+    cmp_p = sub.add_parser("compare", help="flag regressions against a stored baseline")
+    cmp_p.add_argument("baseline")
+    cmp_p.add_argument("current")
+    cmp_p.add_argument("--threshold", type=float, default=0.10,
+                       help="allowed slowdown as a fraction (default 0.10)")
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        report = run(args.group, args.repeat, args.min_time)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {len(report['results'])} results to {args.output}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, args.threshold)
+    for name, base_us, cur_us, ratio in regressions:
+        print(f"REGRESSION {name}: {base_us:.2f} us -> {cur_us:.2f} us ({ratio:.2f}x)")
+    if not regressions:
+        print("No regressions.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
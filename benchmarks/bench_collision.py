@@ -0,0 +1,63 @@
+"""
+Bullet-vs-enemy collision benchmark: grid index vs linear scan.
+
+Run with:
+    python -m benchmarks.bench_collision
+"""
+import random
+import time
+import pygame
+from src.constants import *
+from src.entities import Fleet
+from src.array_fleet import ArrayFleet
+
+# (cols, rows) formations to compare, up to 100x the classic 11x5 fleet
+FLEET_SIZES = [(11, 5), (33, 15), (110, 50)]
+BULLETS = 2000
+
+
+def linear_hit_enemy(fleet, rect: pygame.Rect):
+    """The original O(enemies) scan, kept as the baseline."""
+    for e in fleet.all_enemies():
+        if e.alive and e.rect.colliderect(rect):
+            e.hit()
+            return e
+    return None
+
+
+def make_fleet(fleet_cls, cols: int, rows: int):
+    """Builds a fleet with small enemies so large grids fit on screen."""
+    return fleet_cls(cols, rows, 8, 6, 4, 4, 0, 100, SCREEN_WIDTH, last_step=0)
+
+
+def make_bullets(fleet, count: int, seed: int = 0) -> list[pygame.Rect]:
+    """Bullets scattered over the fleet's bounds, so roughly half of them hit."""
+    rng = random.Random(seed)
+    br = fleet.bounding_rect()
+    return [pygame.Rect(rng.randint(br.left, br.right), rng.randint(br.top, br.bottom),
+                        BULLET_WIDTH, BULLET_HEIGHT) for _ in range(count)]
+
+
+def time_hits(fleet, bullets, hit) -> tuple[float, int]:
+    """Runs every bullet through hit(); returns (microseconds per bullet, hits)."""
+    start = time.perf_counter()
+    hits = sum(1 for b in bullets if hit(fleet, b) is not None)
+    elapsed = time.perf_counter() - start
+    return elapsed / len(bullets) * 1e6, hits
+
+
+def main() -> None:
+    print(f"{'backend':<10} {'fleet':>9} {'linear us':>10} {'grid us':>9} {'speedup':>8}")
+    for fleet_cls in (Fleet, ArrayFleet):
+        for cols, rows in FLEET_SIZES:
+            # Fresh fleets per method, since hits kill enemies
+            bullets = make_bullets(make_fleet(fleet_cls, cols, rows), BULLETS)
+            linear_us, linear_hits = time_hits(make_fleet(fleet_cls, cols, rows), bullets, linear_hit_enemy)
+            grid_us, grid_hits = time_hits(make_fleet(fleet_cls, cols, rows), bullets, fleet_cls.hit_enemy)
+            assert linear_hits == grid_hits, "grid index disagrees with linear scan"
+            print(f"{fleet_cls.__name__:<10} {cols:>4}x{rows:<4} {linear_us:>10.2f} {grid_us:>9.2f} "
+                  f"{linear_us / grid_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
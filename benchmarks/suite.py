@@ -0,0 +1,311 @@
+"""
+Hot-path benchmarks: sprite drawing, fleet stepping, collisions and a full
+simulated-plus-rendered frame, parameterized by fleet size, bullet count and
+star count. Runs under the SDL dummy video driver, so no display is needed.
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import itertools
+import platform
+import random
+import statistics
+import time
+import numpy as np
+import pygame
+import src.sprites as sprites
+import src.collision as collision
+from src.constants import *
+from src.bullets import ENEMY
+from src.clock import ManualClock
+from src.entities import Fleet
+from src.array_fleet import ArrayFleet
+from src.simulation import GameConfig, new_game, reset_game, step, Inputs, GAMEOVER
+from src.starfield import Starfield
+from src.particles import ParticleSystem, PARTICLES_PER_EXPLOSION
+from src.text import TextCache
+from src.game import make_hud, draw_state
+from src.scenes import Scenes
+from src.render_target import RenderTarget
+from src.snapshot import snapshot, restore
+from benchmarks.bench_collision import make_fleet, make_bullets
+
+FLEET_SIZES = [(11, 5), (33, 15), (110, 50)]
+BULLET_COUNTS = [0, 100, 2000]
+STAR_COUNTS = [100, 10000]
+PARTICLE_COUNTS = [1000, 10000, 50000]
+RENDER_SCALES = [1, 2, 4]
+FLEET_BACKENDS = {"objects": Fleet, "numpy": ArrayFleet}
+
+
+def measure(fn, repeat: int = 7, min_time: float = 0.05) -> dict:
+    """
+    Times fn() and returns per-call statistics in microseconds.
+    Each of `repeat` rounds runs fn enough times to last at least min_time.
+    """
+    fn()  # warm up caches
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - start >= min_time / 4 or number >= 1 << 20:
+            break
+        number *= 2
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number * 1e6)
+    return {"median_us": statistics.median(samples), "min_us": min(samples), "calls": number * repeat}
+
+
+def fleet_config(cols: int, rows: int, backend: str = "numpy") -> GameConfig:
+    """A game config whose formation of cols x rows still fits on screen."""
+    enemy_w = max(4, min(64, (SCREEN_WIDTH - 200) // cols - 4))
+    enemy_h = max(3, enemy_w * 3 // 4)
+    return GameConfig(enemy_cols=cols, enemy_rows=rows, enemy_w=enemy_w, enemy_h=enemy_h,
+                      enemy_h_spacing=4, enemy_v_spacing=4, fleet_backend=backend)
+
+
+def bench_sprites(screen: pygame.Surface):
+    """Per-rect sprite drawing against the cached single-blit path."""
+    for name, pattern, w, h in [("alien", sprites.ALIEN_A_1, 64, 48), ("ship", sprites.PLAYER_SHIP, 50, 30)]:
+        yield (f"sprites.draw_pixel_sprite[{name}]", {},
+               lambda pattern=pattern, w=w, h=h: sprites.draw_pixel_sprite(screen, pattern, 100, 100, w, h, COLOR_ALIEN))
+        yield (f"sprites.blit_sprite[{name}]", {},
+               lambda pattern=pattern, w=w, h=h: sprites.blit_sprite(screen, pattern, 100, 100, w, h, COLOR_ALIEN))
+
+
+def bench_fleet_update(screen: pygame.Surface):
+    """Fleet.update with the clock pushed past the step interval, so every call steps."""
+    for (backend, fleet_cls), (cols, rows) in itertools.product(FLEET_BACKENDS.items(), FLEET_SIZES):
+        clock = ManualClock()
+        fleet = fleet_cls(cols, rows, 8, 6, 4, 4, 0, 100, SCREEN_WIDTH, clock=clock)
+
+        def update(fleet=fleet, clock=clock):
+            clock.advance(fleet.step_interval)
+            fleet.update()
+        yield f"fleet.update[{backend},{cols}x{rows}]", {"backend": backend, "enemies": cols * rows}, update
+
+
+def bench_hit_enemy(screen: pygame.Surface):
+    """Fleet.hit_enemy on bullets that miss, so the fleet stays intact."""
+    for (backend, fleet_cls), (cols, rows) in itertools.product(FLEET_BACKENDS.items(), FLEET_SIZES):
+        fleet = make_fleet(fleet_cls, cols, rows)
+        # Bullets in the spacing gaps between columns never hit
+        bullets = [b for b in make_bullets(fleet, 500) if not any(
+            e.rect.colliderect(b) for e in fleet.all_enemies())] or make_bullets(fleet, 1)
+        cycle = itertools.cycle(bullets)
+        yield (f"fleet.hit_enemy[{backend},{cols}x{rows}]", {"backend": backend, "enemies": cols * rows},
+               lambda fleet=fleet, cycle=cycle: fleet.hit_enemy(next(cycle)))
+
+
+def bench_pixel_collision(screen: pygame.Surface):
+    """
+    Pixel-accurate hit tests. Near misses overlap an enemy's box but none of
+    its pixels, so every one pays for the mask test and the fleet stays intact.
+    """
+    for name, pattern, w, h in [("alien", sprites.ALIEN_A_1, 64, 48), ("ship", sprites.PLAYER_SHIP, 50, 30)]:
+        rect = pygame.Rect(100, 100, BULLET_WIDTH, BULLET_HEIGHT)
+        yield (f"collision.rect_hits_sprite[{name}]", {},
+               lambda pattern=pattern, w=w, h=h, rect=rect: collision.rect_hits_sprite(rect, pattern, 100, 100, w, h))
+
+    for (backend, fleet_cls), (cols, rows) in itertools.product(FLEET_BACKENDS.items(), FLEET_SIZES):
+        fleet = make_fleet(fleet_cls, cols, rows)
+        enemies = fleet.all_enemies()
+        near_misses = [b for b in make_bullets(fleet, 5000) if any(e.rect.colliderect(b) for e in enemies)
+                       and not any(e.rect.colliderect(b) and collision.rect_hits_sprite(
+                           b, e.pattern, e.rect.x, e.rect.y, e.rect.width, e.rect.height) for e in enemies)]
+        if not near_misses:
+            continue
+        cycle = itertools.cycle(near_misses)
+        yield (f"fleet.hit_enemy[{backend},{cols}x{rows},pixel]", {"backend": backend, "enemies": cols * rows},
+               lambda fleet=fleet, cycle=cycle: fleet.hit_enemy(next(cycle), pixel=True))
+
+
+def bench_fleet_draw(screen: pygame.Surface):
+    """Fleet.draw of a full formation."""
+    for (backend, fleet_cls), (cols, rows) in itertools.product(FLEET_BACKENDS.items(), FLEET_SIZES):
+        fleet = make_fleet(fleet_cls, cols, rows)
+        yield (f"fleet.draw[{backend},{cols}x{rows}]", {"backend": backend, "enemies": cols * rows},
+               lambda fleet=fleet: fleet.draw(screen))
+
+
+def bench_starfield(screen: pygame.Surface):
+    """Starfield update plus draw."""
+    for count in STAR_COUNTS:
+        starfield = Starfield(count, rng=np.random.default_rng(0))
+
+        def frame(starfield=starfield):
+            starfield.update()
+            starfield.draw(screen)
+        yield f"starfield[{count}]", {"stars": count}, frame
+
+
+def bench_particles(screen: pygame.Surface):
+    """
+    Particle update plus draw of a fixed population. The particles are
+    motionless and long-lived, so every call integrates and draws all of them.
+    """
+    for count in PARTICLE_COUNTS:
+        particles = ParticleSystem(gravity=0.0, rng=np.random.default_rng(0))
+        for i in range(count // PARTICLES_PER_EXPLOSION):
+            particles.explode(100 + i * 37 % (SCREEN_WIDTH - 200), 100 + i * 53 % (SCREEN_HEIGHT // 2),
+                              64, 48, COLOR_ALIEN, speed=0.0, life=10**6)
+
+        def frame(particles=particles):
+            particles.update()
+            particles.draw(screen)
+        yield f"particles[{count}]", {"particles": count}, frame
+
+
+def bench_frame(screen: pygame.Surface):
+    """One full frame: simulation tick, starfield, scene drawing and flip."""
+    hud = make_hud(TextCache())
+    for (cols, rows), bullets, stars in itertools.product(FLEET_SIZES, BULLET_COUNTS, STAR_COUNTS):
+        state = new_game(fleet_config(cols, rows), seed=0)
+        reset_game(state)
+        # Park the ship's lives high so the frame never leaves PLAYING
+        state.spaceship.lives = 10**9
+        rng = random.Random(0)
+        for _ in range(bullets):
+            state.bullets.spawn(rng.randrange(SCREEN_WIDTH), rng.randrange(SCREEN_HEIGHT // 2),
+                                ENEMY_BULLET_WIDTH, ENEMY_BULLET_HEIGHT, 0, ENEMY)
+        starfield = Starfield(stars, rng=np.random.default_rng(0))
+        inputs = Inputs(fire=True)
+        scenes = Scenes()
+
+        def frame(state=state, starfield=starfield, scenes=scenes):
+            step(state, inputs, 16)
+            starfield.update()
+            screen.fill(COLOR_BLACK)
+            starfield.draw(screen)
+            draw_state(screen, state, hud, scenes=scenes)
+            pygame.display.flip()
+        yield (f"frame[{cols}x{rows},bullets={bullets},stars={stars}]",
+               {"enemies": cols * rows, "bullets": bullets, "stars": stars}, frame)
+
+
+def bench_render_scale(screen: pygame.Surface):
+    """
+    Drawing a frame of the default fleet at each render scale, and the
+    software upscale to the window (which a SCALED display does on the GPU).
+    """
+    for scale in RENDER_SCALES:
+        target = RenderTarget(screen, scale)
+        hud = make_hud(TextCache(), scale)
+        state = new_game(fleet_config(11, 5), seed=0)
+        reset_game(state)
+        starfield = Starfield(STAR_COUNT, rng=np.random.default_rng(0))
+        scenes = Scenes()
+
+        def draw(surface=target.surface, hud=hud, state=state, starfield=starfield, scale=scale,
+                 scenes=scenes):
+            surface.fill(COLOR_BLACK)
+            starfield.draw(surface, scale)
+            draw_state(surface, state, hud, scale=scale, scenes=scenes)
+        yield f"render_scale[draw,{scale}]", {"scale": scale}, draw
+        if scale > 1:
+            yield f"render_scale[upscale,{scale}]", {"scale": scale}, target.upscale
+
+
+def bench_scenes(screen: pygame.Surface):
+    """A frame of each static screen (starfield plus cached backdrop), after the first."""
+    hud = make_hud(TextCache())
+    starfield = Starfield(STAR_COUNT, rng=np.random.default_rng(0))
+    for name in ("menu", "banner", "game_over"):
+        state = new_game(fleet_config(11, 5), seed=0)
+        if name == "banner":
+            reset_game(state)
+            state.level_transition_start = 1
+        elif name == "game_over":
+            reset_game(state)
+            state.mode = GAMEOVER
+        scenes = Scenes()
+
+        def frame(state=state, scenes=scenes):
+            screen.fill(COLOR_BLACK)
+            starfield.draw(screen)
+            scenes.draw(screen, state, hud)
+        frame()
+        yield f"scenes[{name}]", {"scene": name}, frame
+
+
+def bench_snapshot(screen: pygame.Surface):
+    """Snapshotting and restoring a game in progress, with bullets in flight."""
+    for name in FLEET_BACKENDS:
+        for bullets in (0, 100):
+            state = new_game(fleet_config(11, 5, name), seed=0)
+            reset_game(state)
+            rng = random.Random(0)
+            for _ in range(bullets):
+                state.bullets.spawn(rng.randrange(SCREEN_WIDTH), rng.randrange(SCREEN_HEIGHT // 2),
+                                    ENEMY_BULLET_WIDTH, ENEMY_BULLET_HEIGHT, 0, ENEMY)
+            data = snapshot(state)
+            params = {"backend": name, "bullets": bullets, "bytes": len(data)}
+            yield (f"snapshot[{name},bullets={bullets}]", params,
+                   lambda state=state: snapshot(state))
+            yield (f"restore[{name},bullets={bullets}]", params,
+                   lambda state=state, data=data: restore(state, data))
+
+
+BENCHMARKS = {
+    "sprites": bench_sprites,
+    "fleet_update": bench_fleet_update,
+    "hit_enemy": bench_hit_enemy,
+    "pixel_collision": bench_pixel_collision,
+    "fleet_draw": bench_fleet_draw,
+    "starfield": bench_starfield,
+    "particles": bench_particles,
+    "frame": bench_frame,
+    "render_scale": bench_render_scale,
+    "scenes": bench_scenes,
+    "snapshot": bench_snapshot,
+}
+
+
+def run(groups: list[str] | None = None, repeat: int = 7, min_time: float = 0.05, log=print) -> dict:
+    """Runs the selected benchmark groups and returns a JSON-ready report."""
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    results = {}
+    for group in groups or BENCHMARKS:
+        for name, params, fn in BENCHMARKS[group](screen):
+            stats = measure(fn, repeat, min_time)
+            results[name] = {"group": group, "params": params, **stats}
+            log(f"{name:<55} {stats['median_us']:>12.2f} us")
+
+    pygame.quit()
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.10) -> list[tuple[str, float, float, float]]:
+    """
+    Returns (name, baseline_us, current_us, ratio) for every benchmark whose
+    median got slower than the baseline by more than `threshold`.
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        ratio = result["median_us"] / base["median_us"]
+        if ratio > 1 + threshold:
+            regressions.append((name, base["median_us"], result["median_us"], ratio))
+    return regressions
@@ -1,7 +1,58 @@
 """
 Entry point for the Space Invaders game.
 """
+import time
+
+# Taken before the heavier imports so the startup report covers them
+_START = time.perf_counter()
+
+import argparse
+from src.constants import RENDER_SCALE
 from src.game import run_game
+from src.profiler import StartupTimer
+from src.replay import Replay, play_headless
+
+
+def _seed(text: str) -> int:
+    # Replays store the seed as an unsigned 64-bit integer
+    seed = int(text)
+    if not 0 <= seed < 2 ** 64:
+        raise argparse.ArgumentTypeError(f"seed must be between 0 and 2**64 - 1, got {seed}")
+    return seed
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Space Invaders")
+    parser.add_argument("--seed", type=_seed, help="RNG seed for a reproducible session")
+    parser.add_argument("--record", metavar="PATH", help="save this session's inputs as a replay")
+    parser.add_argument("--replay", metavar="PATH", help="play back a recorded replay")
+    parser.add_argument("--headless", action="store_true",
+                        help="with --replay: simulate at full speed without a window")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="export the last frames' profile as Chrome trace JSON on exit")
+    parser.add_argument("--render-scale", type=int, default=RENDER_SCALE, metavar="N",
+                        help="draw at 1/N resolution and upscale to the window (e.g. 4 for 480x270)")
+    parser.add_argument("--pipelined", action="store_true",
+                        help="run the simulation on its own thread, overlapping it with rendering")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print the time spent in each startup phase up to the first frame")
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
-    run_game()
+    args = parse_args()
+    startup = StartupTimer(_START) if args.startup_report else None
+    if startup is not None:
+        startup.mark("imports")
+    if args.replay:
+        replay = Replay.load(args.replay)
+        if args.headless:
+            state = play_headless(replay)
+        else:
+            state = run_game(replay=replay, trace=args.trace, render_scale=args.render_scale,
+                             startup=startup, pipelined=args.pipelined)
+        print(f"Replay finished: score {state.score}, level {state.level} "
+              f"(recorded: score {replay.score}, level {replay.level})")
+    else:
+        run_game(seed=args.seed, record=args.record, trace=args.trace,
+                 render_scale=args.render_scale, startup=startup, pipelined=args.pipelined)
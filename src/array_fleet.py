@@ -0,0 +1,243 @@
+"""
+Struct-of-arrays fleet backend.
+
+ArrayFleet exposes the same public API as entities.Fleet but keeps enemy
+positions, alive flags and animation frames in NumPy arrays, so stepping,
+dropping, bounds and shooter selection are vectorized. It is meant for very
+large formations where walking Enemy objects every frame is too slow.
+"""
+import random
+from dataclasses import dataclass, field
+import numpy as np
+import pygame
+import src.sprites as sprites
+import src.collision as collision
+from src.constants import *
+from src.spatial import FleetGrid, FleetOccupancy
+from src.clock import Clock, RealClock
+from src.particles import NULL_PARTICLES
+
+
+class EnemyView:
+    """
+    Lightweight handle onto one enemy of an ArrayFleet.
+    Mirrors the attributes of entities.Enemy; `rect` is a fresh copy, so
+    moving an enemy has to go through the fleet.
+    """
+    __slots__ = ("fleet", "index", "row", "col")
+
+    def __init__(self, fleet: "ArrayFleet", index: int, row: int, col: int):
+        self.fleet = fleet
+        self.index = index
+        self.row = row
+        self.col = col
+
+    @property
+    def x(self) -> int:
+        return int(self.fleet.x[self.index])
+
+    @property
+    def y(self) -> int:
+        return int(self.fleet.y[self.index])
+
+    @property
+    def w(self) -> int:
+        return self.fleet.enemy_w
+
+    @property
+    def h(self) -> int:
+        return self.fleet.enemy_h
+
+    @property
+    def alive(self) -> bool:
+        return bool(self.fleet.alive[self.index])
+
+    @property
+    def frame(self) -> int:
+        return int(self.fleet.frame[self.index])
+
+    @property
+    def rect(self) -> pygame.Rect:
+        return pygame.Rect(self.x, self.y, self.w, self.h)
+
+    @property
+    def pattern(self) -> list[str]:
+        """Sprite pattern of the current animation frame."""
+        return sprites.ALIEN_A_1 if self.frame == 0 else sprites.ALIEN_A_2
+
+    def draw(self, screen: pygame.Surface, scale: int = 1) -> None:
+        """Draws the enemy sprite using the current animation frame."""
+        if not self.alive:
+            return
+        sprites.blit_sprite(screen, self.pattern, self.x, self.y, self.w, self.h, COLOR_ALIEN, scale)
+
+    def hit(self) -> None:
+        """Marks the enemy as dead."""
+        fleet = self.fleet
+        if fleet.alive[self.index]:
+            fleet.alive[self.index] = False
+            fleet.occupancy.kill(self.row, self.col)
+            fleet.version += 1
+            fleet.particles.explode(self.x, self.y, fleet.enemy_w, fleet.enemy_h, COLOR_ALIEN)
+
+
+@dataclass
+class ArrayFleet:
+    """
+    Grid of enemies stored as flat row-major arrays (index = row * cols + col).
+    """
+    cols: int
+    rows: int
+    enemy_w: int
+    enemy_h: int
+    h_spacing: int
+    v_spacing: int
+    start_x: int
+    start_y: int
+    screen_width: int
+
+    direction: int = 1
+    step_distance: int = 16
+    drop_amount: int = 32
+    step_interval: int = 600
+    last_step: int | None = None
+    clock: Clock = field(default_factory=RealClock)
+    # Receives an explosion for every enemy killed
+    particles: object = NULL_PARTICLES
+
+    # Bumped whenever an enemy moves, animates or dies
+    version: int = field(default=0, init=False, compare=False)
+    x: np.ndarray = field(init=False)
+    y: np.ndarray = field(init=False)
+    alive: np.ndarray = field(init=False)
+    frame: np.ndarray = field(init=False)
+    enemies: list = field(init=False)
+    grid: FleetGrid = field(init=False)
+    occupancy: FleetOccupancy = field(init=False)
+
+    def __post_init__(self):
+        cols = np.arange(self.cols, dtype=np.int32)
+        rows = np.arange(self.rows, dtype=np.int32)
+        # row-major layout, same ordering as Fleet.all_enemies()
+        self.x = np.tile(self.start_x + cols * (self.enemy_w + self.h_spacing), self.rows)
+        self.y = np.repeat(self.start_y + rows * (self.enemy_h + self.v_spacing), self.cols)
+        self.alive = np.ones(self.rows * self.cols, dtype=bool)
+        self.frame = np.zeros(self.rows * self.cols, dtype=np.uint8)
+
+        # Views are built once; all_enemies() never rebuilds them
+        self.enemies = [[EnemyView(self, r * self.cols + c, r, c) for c in range(self.cols)]
+                        for r in range(self.rows)]
+        self._flat = [e for row in self.enemies for e in row]
+        # Blit list of the last draw and the (version, scale) it was built for
+        self._blits = []
+        self._blits_key = None
+
+        # Collision index over the formation, moved along with the fleet
+        self.grid = FleetGrid(self.rows, self.cols, self.start_x, self.start_y,
+                              self.enemy_w + self.h_spacing, self.enemy_h + self.v_spacing)
+        # Living-enemy counts, updated by EnemyView.hit()
+        self.occupancy = FleetOccupancy(self.rows, self.cols, lambda r, c: self.alive[r * self.cols + c])
+
+        # Start the step timer now unless the caller supplied a start time
+        if self.last_step is None:
+            self.last_step = self.clock.now()
+
+    def all_enemies(self):
+        """Returns a flat list of all enemies in the fleet."""
+        return self._flat
+
+    def any_alive(self) -> bool:
+        """True while at least one enemy is still alive."""
+        return self.occupancy.alive > 0
+
+    def _bounds(self):
+        """(left, top, right, bottom) of the living enemies, or None."""
+        # Living enemies sit exactly on their grid cells
+        return self.occupancy.bounds(self.grid, self.enemy_w, self.enemy_h)
+
+    def bounding_rect(self):
+        """Calculates the bounding rectangle enclosing all living enemies."""
+        bounds = self._bounds()
+        if bounds is None:
+            return None
+        left, top, right, bottom = bounds
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def update(self) -> None:
+        """
+        Updates the fleet's position. Handles side collision detection
+        to reverse direction and drop down.
+        """
+        now = self.clock.now()
+        if now - self.last_step < self.step_interval:
+            return
+        self.last_step = now
+
+        bounds = self._bounds()
+        if bounds is None:
+            return
+        left, _, right, _ = bounds
+
+        would_hit_left = (left + self.direction * self.step_distance) < 0
+        would_hit_right = (right + self.direction * self.step_distance) > self.screen_width
+
+        if would_hit_left or would_hit_right:
+            # reverse and drop
+            self.direction *= -1
+            np.add(self.y, self.drop_amount, out=self.y, where=self.alive)
+            self.grid.translate(0, self.drop_amount)
+            # speed up slightly when changing direction
+            self.step_interval = max(100, int(self.step_interval * 0.95))
+        else:
+            np.add(self.x, self.direction * self.step_distance, out=self.x, where=self.alive)
+            self.grid.translate(self.direction * self.step_distance, 0)
+
+        # toggle simple animation frame
+        np.bitwise_xor(self.frame, 1, out=self.frame, where=self.alive)
+        self.version += 1
+
+    def draw(self, screen: pygame.Surface, scale: int = 1) -> None:
+        """
+        Draws all alive enemies with a single blits call from the alien atlas.
+        The blit list is only rebuilt after the fleet has changed.
+        """
+        key = (self.version, scale)
+        if key != self._blits_key:
+            atlas = sprites.atlas_cache.get(sprites.ALIEN_ATLAS, self.enemy_w // scale, self.enemy_h // scale)
+            surface, areas = atlas.surface, atlas.areas
+            rows = np.flatnonzero(self.alive)
+            xs = (self.x[rows] // scale).tolist()
+            ys = (self.y[rows] // scale).tolist()
+            self._blits = [(surface, (x, y), areas[f]) for x, y, f in zip(xs, ys, self.frame[rows].tolist())]
+            self._blits_key = key
+        screen.blits(self._blits, doreturn=False)
+
+    def pick_shooter(self, rng=random):
+        """
+        Selects a random enemy from the bottom row of any column to shoot.
+        `rng` can be a seeded random.Random for reproducible runs.
+        """
+        columns = self.occupancy.occupied_cols
+        if not columns:
+            return None
+        c = rng.choice(columns)
+        return self.enemies[self.occupancy.bottom[c]][c]
+
+    def hit_enemy(self, rect: pygame.Rect, pixel: bool = False):
+        """
+        Checks if any enemy is hit by the given rectangle (bullet). With
+        `pixel` set, the bullet must also cover a pixel of the enemy's sprite.
+        """
+        # Only the grid cells under the bullet can hold a colliding enemy
+        x, y, alive = self.x, self.y, self.alive
+        for r, c in self.grid.cells(rect):
+            i = r * self.cols + c
+            if (alive[i] and x[i] < rect.right and x[i] + self.enemy_w > rect.left
+                    and y[i] < rect.bottom and y[i] + self.enemy_h > rect.top):
+                e = self._flat[i]
+                if pixel and not collision.rect_hits_sprite(rect, e.pattern, e.x, e.y,
+                                                            self.enemy_w, self.enemy_h):
+                    continue
+                e.hit()
+                return e
+        return None
@@ -0,0 +1,132 @@
+"""
+Autopilot policies that play the simulation without a human.
+
+A policy is called once per tick with the GameState and returns the Inputs
+for that tick. Policies only read the state, and any randomness comes from
+their own seeded RNG, so a game played by a policy is reproducible from
+its seed.
+"""
+import random
+import numpy as np
+from src.bullets import ENEMY
+from src.simulation import GameState, Inputs, MENU, PLAYING
+
+# Starts the game from the menu
+_START = Inputs(fire=True)
+_IDLE = Inputs()
+
+
+class Policy:
+    """Base class for autopilots; subclasses implement play()."""
+    name = "idle"
+
+    def __init__(self, seed: int | None = None):
+        self.rng = random.Random(seed)
+
+    def __call__(self, state: GameState) -> Inputs:
+        if state.mode == MENU:
+            return _START
+        if state.mode != PLAYING:
+            return _IDLE
+        return self.play(state)
+
+    def play(self, state: GameState) -> Inputs:
+        """Inputs for one tick of gameplay."""
+        return _IDLE
+
+
+class RandomPolicy(Policy):
+    """Mashes fire and holds a random direction for a random number of ticks."""
+    name = "random"
+
+    def __init__(self, seed: int | None = None, min_hold: int = 5, max_hold: int = 40):
+        super().__init__(seed)
+        self.min_hold = min_hold
+        self.max_hold = max_hold
+        self._inputs = _IDLE
+        self._hold = 0
+
+    def play(self, state: GameState) -> Inputs:
+        if self._hold <= 0:
+            direction = self.rng.choice((-1, 0, 1))
+            self._inputs = Inputs(left=direction < 0, right=direction > 0, fire=True)
+            self._hold = self.rng.randint(self.min_hold, self.max_hold)
+        self._hold -= 1
+        return self._inputs
+
+
+class DodgePolicy(Policy):
+    """
+    Keeps firing and steps away from the nearest enemy bullet about to land
+    on the ship; holds still otherwise.
+
+    Attributes:
+        lookahead (int): How far above the ship (px) a bullet counts as a threat.
+        margin (int): Extra width (px) on each side of the ship to keep clear.
+    """
+    name = "dodge"
+
+    def __init__(self, seed: int | None = None, lookahead: int = 160, margin: int = 8):
+        super().__init__(seed)
+        self.lookahead = lookahead
+        self.margin = margin
+
+    def threat(self, state: GameState) -> int | None:
+        """Center x of the nearest bullet heading into the ship, or None."""
+        ship = state.spaceship
+        bullets = state.bullets
+        idx = bullets.indices(ENEMY)
+        if not len(idx):
+            return None
+        x, y, w, h = bullets.x[idx], bullets.y[idx], bullets.w[idx], bullets.h[idx]
+        near = ((y + h > ship.y - self.lookahead) & (y < ship.y + ship.height)
+                & (x < ship.x + ship.width + self.margin) & (x + w > ship.x - self.margin))
+        if not near.any():
+            return None
+        # the lowest bullet lands first
+        nearest = np.flatnonzero(near)[y[near].argmax()]
+        return int(x[nearest] + w[nearest] // 2)
+
+    def play(self, state: GameState) -> Inputs:
+        bullet_x = self.threat(state)
+        if bullet_x is None:
+            return Inputs(fire=True)
+        ship = state.spaceship
+        center = ship.x + ship.width // 2
+        # step away from the bullet, unless that would pin the ship to a wall
+        go_left = bullet_x >= center
+        if go_left and ship.x - ship.speed < 0:
+            go_left = False
+        elif not go_left and ship.x + ship.width + ship.speed > state.config.screen_width:
+            go_left = True
+        return Inputs(left=go_left, right=not go_left, fire=True)
+
+
+class AimPolicy(Policy):
+    """
+    Moves under the living enemy column closest to the ship and fires once
+    lined up. Ignores incoming fire.
+    """
+    name = "aim"
+
+    def play(self, state: GameState) -> Inputs:
+        ship = state.spaceship
+        center = ship.x + ship.width // 2
+        target = None
+        for enemy in state.fleet.all_enemies():
+            if enemy.alive:
+                enemy_x = enemy.rect.centerx
+                if target is None or abs(enemy_x - center) < abs(target - center):
+                    target = enemy_x
+        if target is None:
+            # level transition: wait for the next fleet
+            return _IDLE
+        dx = target - center
+        if abs(dx) <= ship.speed:
+            return Inputs(fire=True)
+        return Inputs(left=dx < 0, right=dx > 0)
+
+
+POLICIES = {
+    policy.name: policy for policy in (RandomPolicy, DodgePolicy, AimPolicy)
+}
@@ -0,0 +1,175 @@
+"""
+Batch runner for difficulty balancing.
+
+Plays many headless games with an autopilot across a grid of GameConfig
+variants, one worker process per core, and aggregates the score, level-reached
+and survival-time distributions of each variant.
+
+    python -m src.batch --policy dodge --games 1000 --step-interval 600 400 \\
+        --shot-interval 1500 1000 --bullet-speed 5 7 --fleet 11x5 8x4 -o balance.json
+
+Game i of every variant uses seed `seed + i`, so variants are compared on the
+same sequence of games and any single game can be re-run from its seed.
+"""
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import itertools
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict, replace
+from functools import partial
+import numpy as np
+from src.constants import *
+from src.autopilot import POLICIES
+from src.clock import FixedStepClock
+from src.simulation import GameConfig, new_game, step, GAMEOVER
+
+# Games stop after this much simulated time even if the ship survives
+MAX_GAME_SECONDS = 600
+
+
+@dataclass(frozen=True)
+class GameResult:
+    """
+    Outcome of one autopiloted game.
+
+    Attributes:
+        seed (int): Seed of both the game and the policy.
+        survival_s (float): Simulated seconds until game over (or the time cap).
+        timed_out (bool): True if the game hit the time cap before game over.
+    """
+    seed: int
+    score: int
+    level: int
+    survival_s: float
+    timed_out: bool
+
+
+def play_autopilot(config: GameConfig, policy: str, seed: int,
+                   max_seconds: float = MAX_GAME_SECONDS) -> GameResult:
+    """Plays one headless game with the named policy until game over."""
+    state = new_game(config, seed=seed)
+    pilot = POLICIES[policy](seed)
+    ticker = FixedStepClock(TICK_RATE)
+    max_ticks = int(max_seconds * TICK_RATE)
+    for _ in range(max_ticks):
+        step(state, pilot(state), ticker.tick())
+        if state.mode == GAMEOVER:
+            break
+    return GameResult(seed, state.score, state.level, state.time / 1000,
+                      state.mode != GAMEOVER)
+
+
+def _distribution(values: np.ndarray) -> dict:
+    """Mean, spread and percentiles of a sample."""
+    p10, p50, p90 = np.percentile(values, (10, 50, 90))
+    return {"mean": float(values.mean()), "std": float(values.std()),
+            "min": float(values.min()), "p10": float(p10), "p50": float(p50),
+            "p90": float(p90), "max": float(values.max())}
+
+
+def summarize(results: list[GameResult]) -> dict:
+    """Aggregates game results into per-metric distributions."""
+    score = np.array([r.score for r in results])
+    level = np.array([r.level for r in results])
+    survival = np.array([r.survival_s for r in results])
+    levels, counts = np.unique(level, return_counts=True)
+    return {
+        "games": len(results),
+        "timed_out": sum(r.timed_out for r in results),
+        "score": _distribution(score),
+        "level": _distribution(level),
+        "survival_s": _distribution(survival),
+        "levels_reached": {int(lv): int(n) for lv, n in zip(levels, counts)},
+    }
+
+
+def run_batch(variants: dict[str, GameConfig], policy: str, games: int, seed: int = 0,
+              workers: int | None = None, max_seconds: float = MAX_GAME_SECONDS) -> dict:
+    """
+    Plays `games` games of every variant and returns {variant: summary}.
+    Games are spread over `workers` processes (default: one per core);
+    with a single worker they run in this process.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"unknown policy {policy!r}; choose from {', '.join(POLICIES)}")
+    workers = workers or os.cpu_count() or 1
+    seeds = range(seed, seed + games)
+
+    report = {}
+    if workers == 1:
+        for name, config in variants.items():
+            results = [play_autopilot(config, policy, s, max_seconds) for s in seeds]
+            report[name] = summarize(results)
+        return report
+
+    # Large chunks keep inter-process traffic to a handful of messages per worker
+    chunksize = max(1, games // (workers * 4))
+    with ProcessPoolExecutor(workers) as pool:
+        for name, config in variants.items():
+            play = partial(play_autopilot, config, policy, max_seconds=max_seconds)
+            report[name] = summarize(list(pool.map(play, seeds, chunksize=chunksize)))
+    return report
+
+
+def make_variants(step_intervals: list[int], shot_intervals: list[int], bullet_speeds: list[int],
+                  fleets: list[tuple[int, int]], base: GameConfig | None = None) -> dict[str, GameConfig]:
+    """Every combination of the given parameters, keyed by a readable name."""
+    base = base or GameConfig()
+    variants = {}
+    for step_ms, shot_ms, speed, (cols, rows) in itertools.product(
+            step_intervals, shot_intervals, bullet_speeds, fleets):
+        name = f"step={step_ms} shot={shot_ms} speed={speed} fleet={cols}x{rows}"
+        variants[name] = replace(base, step_interval=step_ms, enemy_shot_interval=shot_ms,
+                                 enemy_bullet_speed=speed, enemy_cols=cols, enemy_rows=rows)
+    return variants
+
+
+def _fleet_size(text: str) -> tuple[int, int]:
+    cols, _, rows = text.partition("x")
+    return int(cols), int(rows)
+
+
+def main() -> None:
+    defaults = GameConfig()
+    parser = argparse.ArgumentParser(prog="python -m src.batch",
+                                     description="Play autopiloted games for difficulty balancing")
+    parser.add_argument("--policy", choices=list(POLICIES), default="dodge")
+    parser.add_argument("--games", type=int, default=100, help="games per variant")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--max-seconds", type=float, default=MAX_GAME_SECONDS,
+                        help="simulated time cap per game")
+    parser.add_argument("--step-interval", type=int, nargs="+", default=[defaults.step_interval])
+    parser.add_argument("--shot-interval", type=int, nargs="+", default=[defaults.enemy_shot_interval])
+    parser.add_argument("--bullet-speed", type=int, nargs="+", default=[defaults.enemy_bullet_speed])
+    parser.add_argument("--fleet", type=_fleet_size, nargs="+", metavar="COLSxROWS",
+                        default=[(defaults.enemy_cols, defaults.enemy_rows)])
+    parser.add_argument("-o", "--output", help="write the full report as JSON")
+    args = parser.parse_args()
+
+    variants = make_variants(args.step_interval, args.shot_interval, args.bullet_speed, args.fleet)
+    start = time.perf_counter()
+    report = run_batch(variants, args.policy, args.games, args.seed, args.workers, args.max_seconds)
+    elapsed = time.perf_counter() - start
+
+    print(f"{'variant':<44} {'score p50':>9} {'p90':>7} {'level p50':>9} {'survival p50':>12}")
+    for name, summary in report.items():
+        print(f"{name:<44} {summary['score']['p50']:>9.0f} {summary['score']['p90']:>7.0f} "
+              f"{summary['level']['p50']:>9.0f} {summary['survival_s']['p50']:>11.1f}s")
+    total = args.games * len(variants)
+    print(f"{total} games in {elapsed:.1f}s ({total / elapsed:.1f} games/s)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"policy": args.policy, "games": args.games, "seed": args.seed,
+                       "configs": {name: asdict(config) for name, config in variants.items()},
+                       "variants": report}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Fixed-capacity bullet pool shared by the player and the enemy fleet.
+
+Bullets live in preallocated NumPy arrays with an active mask. Spawning takes
+a slot from a free list, and integration, culling and collision tests run as
+in-place array operations, so the simulation path allocates nothing per frame.
+"""
+import numpy as np
+import pygame
+
+# Owner ids: players are numbered from 0, the fleet owns ENEMY bullets
+PLAYER = 0
+ENEMY = -1
+
+# Default number of bullet slots
+BULLET_CAPACITY = 1024
+
+# Large sentinel bounds for culling in one direction only
+_NO_LIMIT = 2**30
+
+# Returned by collide() on a miss, so misses allocate nothing
+_EMPTY = np.zeros(0, dtype=np.intp)
+
+
+class BulletPool:
+    """
+    Struct-of-arrays store for every bullet in play.
+
+    Attributes:
+        x, y (np.ndarray): Top-left corner of each slot.
+        w, h (np.ndarray): Size of each slot.
+        vy (np.ndarray): Vertical speed in pixels per tick (negative is up).
+        prev_y (np.ndarray): y at the previous tick, for render interpolation.
+        owner (np.ndarray): PLAYER index or ENEMY.
+        active (np.ndarray): True for slots holding a live bullet.
+    """
+
+    def __init__(self, capacity: int = BULLET_CAPACITY):
+        self.capacity = capacity
+        self.x = np.zeros(capacity, dtype=np.int32)
+        self.y = np.zeros(capacity, dtype=np.int32)
+        self.w = np.zeros(capacity, dtype=np.int32)
+        self.h = np.zeros(capacity, dtype=np.int32)
+        self.vy = np.zeros(capacity, dtype=np.int32)
+        self.prev_y = np.zeros(capacity, dtype=np.int32)
+        self.owner = np.zeros(capacity, dtype=np.int16)
+        self.active = np.zeros(capacity, dtype=bool)
+
+        # Scratch buffers reused by every masked operation
+        self._mask = np.zeros(capacity, dtype=bool)
+        self._tmp = np.zeros(capacity, dtype=bool)
+        self._tmp2 = np.zeros(capacity, dtype=bool)
+        self._ends = np.zeros(capacity, dtype=np.int32)
+        self._rect = pygame.Rect(0, 0, 0, 0)
+
+        # Lowest free slot is reused first, keeping live bullets packed
+        self._free = list(range(capacity - 1, -1, -1))
+        self._counts = {}
+        self._solids = {}
+
+    def __len__(self) -> int:
+        return self.capacity - len(self._free)
+
+    def count(self, owner: int | None = None) -> int:
+        """Number of live bullets, optionally only those of one owner."""
+        if owner is None:
+            return len(self)
+        return self._counts.get(owner, 0)
+
+    def spawn(self, x: int, y: int, w: int, h: int, vy: int, owner: int) -> int:
+        """
+        Activates a bullet and returns its slot, or -1 if the pool is full.
+        """
+        if not self._free:
+            return -1
+        i = self._free.pop()
+        self.x[i] = x
+        self.y[i] = y
+        self.prev_y[i] = y
+        self.w[i] = w
+        self.h[i] = h
+        self.vy[i] = vy
+        self.owner[i] = owner
+        self.active[i] = True
+        self._counts[owner] = self._counts.get(owner, 0) + 1
+        return i
+
+    def release(self, i: int) -> None:
+        """Frees a slot. Releasing an inactive slot is a no-op."""
+        if not self.active[i]:
+            return
+        self.active[i] = False
+        owner = int(self.owner[i])
+        self._counts[owner] -= 1
+        self._free.append(i)
+
+    def clear(self, owner: int | None = None) -> None:
+        """Releases every bullet, or only those of one owner."""
+        if owner is None:
+            self.active[:] = False
+            self._free = list(range(self.capacity - 1, -1, -1))
+            self._counts.clear()
+            return
+        if not self._counts.get(owner):
+            return
+        for i in self.indices(owner):
+            self.release(int(i))
+
+    def _select(self, owner: int | None) -> np.ndarray:
+        """Fills the scratch mask with the live bullets of an owner."""
+        if owner is None:
+            np.copyto(self._mask, self.active)
+        else:
+            np.equal(self.owner, owner, out=self._mask)
+            np.logical_and(self._mask, self.active, out=self._mask)
+        return self._mask
+
+    def indices(self, owner: int | None = None) -> np.ndarray:
+        """Slots of the live bullets, optionally only those of one owner."""
+        return np.flatnonzero(self._select(owner))
+
+    def rect(self, i: int) -> pygame.Rect:
+        """
+        The bounds of slot i. The Rect is a shared scratch object that is
+        overwritten by the next call; copy it to keep it.
+        """
+        self._rect.update(int(self.x[i]), int(self.y[i]), int(self.w[i]), int(self.h[i]))
+        return self._rect
+
+    def save_positions(self) -> None:
+        """Records the current positions as the previous tick's."""
+        np.copyto(self.prev_y, self.y)
+
+    def integrate(self, owner: int | None = None) -> None:
+        """Moves live bullets by their speed, optionally only one owner's."""
+        np.add(self.y, self.vy, out=self.y, where=self._select(owner))
+
+    def cull(self, owner: int | None = None, min_y: int = -_NO_LIMIT, max_y: int = _NO_LIMIT) -> None:
+        """Releases live bullets with y < min_y or y > max_y."""
+        mask = self._select(owner)
+        np.less(self.y, min_y, out=self._tmp)
+        np.greater(self.y, max_y, out=self._tmp2)
+        np.logical_or(self._tmp, self._tmp2, out=self._tmp)
+        np.logical_and(mask, self._tmp, out=mask)
+        if mask.any():
+            for i in np.flatnonzero(mask):
+                self.release(int(i))
+
+    def collide(self, rect: pygame.Rect, owner: int | None = None) -> np.ndarray:
+        """
+        Slots of the live bullets overlapping the rect. This is the spatial
+        query for single rects such as the player ship: one pass over the
+        pool, with no index to keep up to date as bullets move.
+        """
+        mask = self._select(owner)
+        tmp = self._tmp
+        np.less(self.x, rect.right, out=tmp)
+        mask &= tmp
+        np.add(self.x, self.w, out=self._ends)
+        np.greater(self._ends, rect.left, out=tmp)
+        mask &= tmp
+        np.less(self.y, rect.bottom, out=tmp)
+        mask &= tmp
+        np.add(self.y, self.h, out=self._ends)
+        np.greater(self._ends, rect.top, out=tmp)
+        mask &= tmp
+        return np.flatnonzero(mask) if mask.any() else _EMPTY
+
+    def _solid(self, w: int, h: int, color: tuple[int, int, int]) -> pygame.Surface:
+        """Cached filled surface used to stamp bullets with blits."""
+        key = (w, h, color)
+        surf = self._solids.get(key)
+        if surf is None:
+            surf = pygame.Surface((w, h))
+            surf.fill(color)
+            self._solids[key] = surf
+        return surf
+
+    def draw(self, screen: pygame.Surface, color: tuple[int, int, int], owner: int | None = None,
+             alpha: float = 1.0, scale: int = 1) -> None:
+        """
+        Draws the live bullets of an owner with a single blits call.
+        `alpha` below 1 draws them between their previous and current y;
+        `scale` above 1 draws onto a 1/scale render target.
+        """
+        idx = self.indices(owner)
+        if not len(idx):
+            return
+        xs, ys, ws, hs = self.x[idx], self.y[idx], self.w[idx], self.h[idx]
+        if alpha < 1:
+            prev = self.prev_y[idx]
+            ys = np.rint(prev + (ys - prev) * alpha).astype(np.int32)
+        if scale > 1:
+            # bullets stay at least one pixel wide and tall
+            xs, ys = xs // scale, ys // scale
+            ws, hs = np.maximum(ws // scale, 1), np.maximum(hs // scale, 1)
+        solid = self._solid
+        screen.blits([(solid(w, h, color), (x, y)) for x, y, w, h in
+                      zip(xs.tolist(), ys.tolist(), ws.tolist(), hs.tolist())], doreturn=False)
+
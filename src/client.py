@@ -0,0 +1,270 @@
+"""
+Co-op client.
+
+    python -m src.client [--host 127.0.0.1] [--port 8765] [--bot] [--seconds N]
+
+Sends the local player's controls to a src.server every tick and keeps a
+WorldView in sync from the server's deltas. Drawing interpolates between the
+last two deltas: ships slide from their previous to their latest x and
+bullets trail back along their velocity, so motion stays smooth when deltas
+arrive unevenly. The fleet steps discretely anyway and is drawn as received.
+
+Input latency is measured per input as the time from sending it to
+receiving the first delta that applied it.
+"""
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import numpy as np
+import pygame
+from src.constants import *
+import src.sprites as sprites
+from src.bullets import ENEMY
+from src.netstate import (HELLO, WELCOME, DELTA, DELTA_OFFSET, WorldView, NetMetrics, ProtocolError,
+                          SHIP_DEAD, SHIP_INVULNERABLE, apply_delta, read_message, message,
+                          input_message, parse_welcome, parse_delta_ack, max_delta_message,
+                          MAX_WELCOME_MESSAGE)
+from src.input import InputQueue
+from src.server import DEFAULT_PORT
+from src.simulation import Inputs, GAMEOVER
+from src.text import TextCache
+
+# Inputs remembered for latency measurement; older acks are ignored
+_SENT_HISTORY = 1024
+
+# Ship color of each player
+PLAYER_COLORS = (COLOR_CYAN, COLOR_YELLOW, (255, 0, 255), COLOR_WHITE)
+
+
+class CoopClient:
+    """
+    Connection to a co-op server and the world as last received.
+
+    Attributes:
+        player (int): This client's player id.
+        view (WorldView): The world after the latest delta.
+        prev_ship_x (dict[int, int]): Ship x of each player one delta earlier.
+        metrics (NetMetrics): Per delta: "rtt_ms" (input latency),
+            "delta_bytes" and "delta_gap_ms" (time since the previous delta).
+        error (Exception | None): Why the server's stream was dropped, if
+            it sent something malformed or the receive loop failed.
+    """
+
+    def __init__(self):
+        self.player = -1
+        self.tick_rate = TICK_RATE
+        self.config = None
+        self.view = None
+        self.prev_ship_x = {}
+        self.received_at = 0.0
+        self.metrics = NetMetrics()
+        self.connected = False
+        self.error = None
+        self._reader = None
+        self._writer = None
+        self._receiving = None
+        self._seq = 0
+        self._acked = 0
+        self._sent_at = np.zeros(_SENT_HISTORY)
+        self._max_message = MAX_WELCOME_MESSAGE
+
+    async def connect(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> None:
+        """Joins the server's session and waits for the first world state."""
+        self._reader, self._writer = await asyncio.open_connection(host, port)
+        self._writer.write(message(HELLO))
+        msg_type, data = await read_message(self._reader, MAX_WELCOME_MESSAGE)
+        if msg_type != WELCOME:
+            raise ProtocolError("server did not accept the connection")
+        self.player, self.tick_rate, self.config = parse_welcome(data)
+        self.view = WorldView(self.config.bullet_capacity)
+        self._max_message = max_delta_message(self.config)
+        msg_type, data = await read_message(self._reader, self._max_message)
+        if msg_type != DELTA:
+            raise ProtocolError("expected the initial world state")
+        apply_delta(self.view, data, DELTA_OFFSET)
+        self.received_at = time.perf_counter()
+        self.connected = True
+        self._receiving = asyncio.create_task(self._receive())
+
+    async def close(self) -> None:
+        if self._receiving is not None:
+            self._receiving.cancel()
+        if self._writer is not None:
+            self._writer.close()
+        self.connected = False
+
+    def send_input(self, inputs: Inputs) -> None:
+        """Sends this tick's controls."""
+        self._seq += 1
+        self._sent_at[self._seq % _SENT_HISTORY] = time.perf_counter()
+        self._writer.write(input_message(self._seq, inputs.to_mask()))
+
+    async def _receive(self) -> None:
+        try:
+            while True:
+                msg_type, data = await read_message(self._reader, self._max_message)
+                if msg_type != DELTA:
+                    continue
+                now = time.perf_counter()
+                view = self.view
+                self.prev_ship_x = {player: ship[0] for player, ship in view.ships.items()}
+                apply_delta(view, data, DELTA_OFFSET)
+
+                ack = parse_delta_ack(data)
+                if ack > self._acked and self._seq - ack < _SENT_HISTORY:
+                    self.metrics.add("rtt_ms", (now - self._sent_at[ack % _SENT_HISTORY]) * 1000)
+                self._acked = max(self._acked, ack)
+                self.metrics.add("delta_bytes", len(data) + 4)
+                self.metrics.add("delta_gap_ms", (now - self.received_at) * 1000)
+                self.received_at = now
+        except (asyncio.IncompleteReadError, ConnectionError):
+            self.connected = False
+        except Exception as exc:
+            # the stream can no longer be trusted, so stop sending on it
+            self.error = exc
+            self.connected = False
+
+    def alpha(self, now: float | None = None) -> float:
+        """How far the next delta is due, from 0 (just received) to 1."""
+        now = time.perf_counter() if now is None else now
+        return min(1.0, (now - self.received_at) * self.tick_rate)
+
+    def ship_x(self, player: int, alpha: float) -> int:
+        """A ship's x interpolated between the last two deltas."""
+        x = self.view.ships[player][0]
+        prev = self.prev_ship_x.get(player, x)
+        return round(prev + (x - prev) * alpha)
+
+    def bullet_y(self, alpha: float) -> np.ndarray:
+        """Every slot's bullet y interpolated between the last two deltas."""
+        bullets = self.view.bullets
+        return np.rint(bullets["y"] - bullets["vy"] * (1 - alpha)).astype(np.int32)
+
+
+def draw_world(screen: pygame.Surface, client: CoopClient, text: TextCache, alpha: float) -> None:
+    """Draws the client's view of the world."""
+    view = client.view
+    config = client.config
+    screen.fill(COLOR_BLACK)
+
+    if not view.in_transition:
+        pitch_x = config.enemy_w + config.enemy_h_spacing
+        pitch_y = config.enemy_h + config.enemy_v_spacing
+        pattern = sprites.ALIEN_A_1 if view.frame == 0 else sprites.ALIEN_A_2
+        alien = sprites.sprite_cache.get(pattern, config.enemy_w, config.enemy_h, COLOR_ALIEN)
+        rows, cols = np.divmod(np.flatnonzero(view.alive), view.cols)
+        screen.blits([(alien, (view.origin_x + c * pitch_x, view.origin_y + r * pitch_y))
+                      for r, c in zip(rows.tolist(), cols.tolist())], doreturn=False)
+
+    bullets = view.bullets
+    ys = client.bullet_y(alpha)
+    for i in np.flatnonzero(bullets["active"]).tolist():
+        owner = int(bullets["owner"][i])
+        color = COLOR_ORANGE if owner == ENEMY else PLAYER_COLORS[owner % len(PLAYER_COLORS)]
+        screen.fill(color, (int(bullets["x"][i]), int(ys[i]), int(bullets["w"][i]), int(bullets["h"][i])))
+
+    now = int(time.perf_counter() * 1000)
+    for player, (_, y, lives, flags) in view.ships.items():
+        if flags & SHIP_DEAD or (flags & SHIP_INVULNERABLE and now % 300 < 150):
+            continue
+        sprites.blit_sprite(screen, sprites.PLAYER_SHIP, client.ship_x(player, alpha), y,
+                            config.ship_width, config.ship_height, PLAYER_COLORS[player % len(PLAYER_COLORS)])
+
+    area = screen.get_rect()
+    screen.blit(text.render(f"SCORE: {view.score}", 36, COLOR_WHITE), (10, 10))
+    level_surf = text.render(f"LEVEL: {view.level}", 36, COLOR_WHITE)
+    screen.blit(level_surf, level_surf.get_rect(topright=(area.right - 10, 10)))
+    lives = view.ships.get(client.player, (0, 0, 0, 0))[2]
+    screen.blit(text.render(f"P{client.player + 1} LIVES: {lives}", 36,
+                            PLAYER_COLORS[client.player % len(PLAYER_COLORS)]), (10, area.bottom - 40))
+    if view.in_transition:
+        lvl_surf = text.render(f"LEVEL {view.level}", 100, COLOR_YELLOW)
+        screen.blit(lvl_surf, lvl_surf.get_rect(center=area.center))
+    elif view.mode == GAMEOVER:
+        go_surf = text.render("GAME OVER - R to restart", 72, COLOR_RED)
+        screen.blit(go_surf, go_surf.get_rect(center=area.center))
+
+
+class BotPilot:
+    """Headless stand-in for a player: always firing, drifting left and right."""
+
+    def __init__(self, seed: int | None = None):
+        self.rng = random.Random(seed)
+        self.direction = 1
+        self.ticks_left = 0
+
+    def __call__(self, client: CoopClient) -> Inputs:
+        if client.view.mode == GAMEOVER:
+            return Inputs(restart=True)
+        if self.ticks_left <= 0:
+            self.direction = self.rng.choice((-1, 0, 1))
+            self.ticks_left = self.rng.randrange(10, 60)
+        self.ticks_left -= 1
+        return Inputs(left=self.direction < 0, right=self.direction > 0, fire=True)
+
+
+async def play(host: str, port: int, bot: bool, seconds: float | None) -> dict:
+    """
+    Plays until the window closes, the server goes away or `seconds` pass;
+    returns the metrics. Re-raises the error that ended the stream, if the
+    server sent something malformed.
+    """
+    client = CoopClient()
+    await client.connect(host, port)
+    pilot = BotPilot() if bot else None
+    screen = text = None
+    input_queue = InputQueue()
+    if not bot:
+        pygame.display.init()
+        pygame.font.init()
+        screen = pygame.display.set_mode((client.config.screen_width, client.config.screen_height))
+        pygame.display.set_caption(f"Space Invaders co-op - Player {client.player + 1}")
+        text = TextCache()
+
+    loop = asyncio.get_running_loop()
+    period = 1 / client.tick_rate
+    end = None if seconds is None else loop.time() + seconds
+    next_tick = loop.time()
+    try:
+        while client.connected and (end is None or loop.time() < end):
+            if bot:
+                client.send_input(pilot(client))
+            else:
+                events = pygame.event.get()
+                if any(event.type == pygame.QUIT for event in events):
+                    break
+                for event in events:
+                    input_queue.push(event)
+                client.send_input(input_queue.next_inputs())
+                draw_world(screen, client, text, client.alpha())
+                pygame.display.flip()
+            next_tick += period
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+    finally:
+        await client.close()
+        if not bot:
+            pygame.quit()
+    if client.error is not None:
+        raise client.error
+    return client.metrics.stats()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.client", description="Join a co-op session")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--bot", action="store_true", help="play headless with a bot")
+    parser.add_argument("--seconds", type=float, help="leave after this long")
+    args = parser.parse_args()
+    stats = asyncio.run(play(args.host, args.port, args.bot, args.seconds))
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Clocks that entities read the current time from.
+
+Entities never call pygame.time.get_ticks() themselves; they ask the clock
+they were given. RealClock follows wall-clock time, while ManualClock and
+FixedStepClock only move when told to, so simulations can run as fast as
+the CPU allows and timing-dependent behavior is reproducible.
+"""
+import pygame
+
+
+class Clock:
+    """Interface for time sources: now() returns the time in milliseconds."""
+
+    def now(self) -> int:
+        raise NotImplementedError
+
+
+class RealClock(Clock):
+    """Milliseconds since pygame.init(), as reported by pygame."""
+
+    def now(self) -> int:
+        return pygame.time.get_ticks()
+
+
+class ManualClock(Clock):
+    """A clock that only moves when advanced explicitly."""
+
+    def __init__(self, start: int = 0):
+        self.time = start
+
+    def now(self) -> int:
+        return self.time
+
+    def advance(self, ms: int) -> None:
+        """Moves the clock forward by ms milliseconds."""
+        self.time += ms
+
+
+class FixedStepClock(ManualClock):
+    """
+    A manual clock advanced in fixed ticks of 1 / tick_rate seconds.
+    Tick lengths alternate between whole milliseconds (16, 17, 17 at 60 Hz)
+    so the time after n ticks is exactly n * 1000 // tick_rate.
+    """
+
+    def __init__(self, tick_rate: int, start: int = 0):
+        super().__init__(start)
+        self.tick_rate = tick_rate
+        self.ticks = 0
+
+    def tick(self) -> int:
+        """Advances by one tick and returns its length in milliseconds."""
+        start = self.ticks * 1000 // self.tick_rate
+        self.ticks += 1
+        dt = self.ticks * 1000 // self.tick_rate - start
+        self.advance(dt)
+        return dt
@@ -13,9 +13,39 @@ COLOR_GREEN = (0, 255, 0)
 COLOR_CYAN = (0, 255, 255)
 COLOR_YELLOW = (255, 255, 0)
 COLOR_ORANGE = (255, 128, 0)
+COLOR_ALIEN = (50, 255, 50)
 
 # Gameplay Constants
 BULLET_WIDTH = 4
 BULLET_HEIGHT = 10
 ENEMY_BULLET_WIDTH = 6
 ENEMY_BULLET_HEIGHT = 14
+
+# Timing
+# Simulation ticks per second; movement speeds are in pixels per tick
+TICK_RATE = 60
+# Most ticks simulated in one frame before falling behind real time
+MAX_CATCH_UP_TICKS = 5
+
+# Rendering
+# Frame rate cap for rendering (0 = uncapped)
+RENDER_FPS = 60
+# Frames skipped between rendered frames (0 = render every frame)
+FRAME_SKIP = 0
+# Draw moving objects between their last two tick positions
+INTERPOLATE = True
+# Run the simulation on its own thread, rendering the latest published tick
+PIPELINED = False
+# Redraw and present only the regions that changed instead of full frames
+DIRTY_RECT_RENDERING = False
+# Draw the scene at 1/RENDER_SCALE of the window size and upscale it once per
+# frame (1 = native; 4 = 480x270 for a 1920x1080 window)
+RENDER_SCALE = 1
+
+# Font file for all text; None loads pygame's bundled default font directly,
+# skipping system font discovery
+FONT_PATH = None
+
+# Starfield: number of stars and scroll speed (px per tick) of each parallax layer
+STAR_COUNT = 100
+STAR_SPEEDS = (1, 2, 3)
@@ -0,0 +1,133 @@
+"""
+Co-op simulation: several player ships against one shared fleet.
+
+CoopState mirrors GameState but holds one Spaceship per player, each firing
+bullets tagged with its player id into the shared pool. A session plays
+continuously: players can join and leave at any time, the game is over once
+every ship has lost its last life, and any player can restart it.
+"""
+import random
+from dataclasses import dataclass, field
+from src.constants import *
+from src.entities import Spaceship, Fleet
+from src.array_fleet import ArrayFleet
+from src.bullets import BulletPool
+from src.clock import ManualClock
+from src.profiler import NULL_PROFILER
+from src.particles import NULL_PARTICLES
+from src.simulation import GameConfig, Inputs, new_fleet, revive_ship, step_ships, PLAYING, GAMEOVER
+
+# Most ships in one session; player ids run from 0 to MAX_PLAYERS - 1
+MAX_PLAYERS = 4
+
+_IDLE = Inputs()
+
+
+@dataclass
+class CoopState:
+    """
+    Complete state of a co-op session.
+
+    Attributes:
+        ships (dict[int, Spaceship]): Ship of each player, by player id.
+        tick (int): Ticks simulated since the session started.
+    """
+    config: GameConfig
+    fleet: Fleet | ArrayFleet
+    bullets: BulletPool
+    ships: dict[int, Spaceship] = field(default_factory=dict)
+    mode: str = PLAYING
+    score: int = 0
+    level: int = 1
+    level_transition_start: int = 0
+    last_enemy_shot: int = 0
+    tick: int = 0
+    rng: random.Random = field(default_factory=random.Random)
+    clock: ManualClock = field(default_factory=ManualClock)
+    profiler: object = NULL_PROFILER
+    particles: object = NULL_PARTICLES
+
+    @property
+    def time(self) -> int:
+        """Simulation time in milliseconds."""
+        return self.clock.now()
+
+    @property
+    def in_level_transition(self) -> bool:
+        """True while waiting to spawn the next level's fleet."""
+        return self.level_transition_start > 0
+
+
+def new_coop_game(config: GameConfig | None = None, seed: int | None = None) -> CoopState:
+    """Builds a co-op session with no players yet."""
+    config = config or GameConfig()
+    clock = ManualClock()
+    return CoopState(config, new_fleet(config, clock), BulletPool(config.bullet_capacity),
+                     rng=random.Random(seed), clock=clock)
+
+
+def spawn_x(config: GameConfig, player: int) -> int:
+    """Spawn x of a player's ship; the slots are spread across the screen."""
+    center = config.screen_width * (player + 1) // (MAX_PLAYERS + 1)
+    return center - config.ship_width // 2
+
+
+def add_player(state: CoopState) -> int | None:
+    """Adds a ship for a new player and returns its id, or None when the session is full."""
+    player = next((p for p in range(MAX_PLAYERS) if p not in state.ships), None)
+    if player is None:
+        return None
+    config = state.config
+    y = config.screen_height - config.ship_height - config.ship_padding
+    ship = Spaceship(f"Player {player + 1}", 100, x=spawn_x(config, player), y=y,
+                     width=config.ship_width, height=config.ship_height,
+                     bullets=state.bullets, owner=player, clock=state.clock, particles=state.particles)
+    # joining mid-game gets the same grace period as a respawn
+    ship.invulnerable = True
+    ship.invulnerable_start = state.time
+    state.ships[player] = ship
+    return player
+
+
+def remove_player(state: CoopState, player: int) -> None:
+    """Removes a player's ship and bullets."""
+    if state.ships.pop(player, None) is not None:
+        state.bullets.clear(player)
+
+
+def reset_coop(state: CoopState) -> None:
+    """Starts the session over from level 1 with every ship revived."""
+    for ship in state.ships.values():
+        revive_ship(ship, state.time)
+    state.mode = PLAYING
+    state.score = 0
+    state.level = 1
+    state.level_transition_start = 0
+    state.fleet = new_fleet(state.config, state.clock, state.particles)
+    state.bullets.clear()
+
+
+def step_coop(state: CoopState, inputs: dict[int, Inputs], dt: int) -> None:
+    """
+    Advances the session by one tick of dt milliseconds, given each player's
+    controls. Players missing from `inputs` are treated as idle.
+    """
+    state.clock.advance(dt)
+    state.tick += 1
+
+    ships = list(state.ships.values())
+    for ship in ships:
+        ship.prev_x = ship.x
+    state.bullets.save_positions()
+
+    if state.mode == GAMEOVER:
+        if any(player_inputs.restart for player_inputs in inputs.values()):
+            reset_coop(state)
+        return
+
+    # dead ships stay put, but their bullets keep flying
+    step_ships(state, [(ship, _IDLE if ship.dead else inputs.get(player, _IDLE))
+                       for player, ship in state.ships.items()])
+
+    if ships and all(ship.dead for ship in ships):
+        state.mode = GAMEOVER
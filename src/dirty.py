@@ -0,0 +1,67 @@
+"""
+Dirty-rectangle presentation.
+
+Instead of clearing and flipping the whole screen, DirtyRects erases only the
+regions drawn on the previous frame and pushes the union of last frame's and
+this frame's regions to the display with pygame.display.update(rects). Any
+change of scene falls back to a full clear and flip.
+"""
+import pygame
+from src.constants import *
+
+# Past this many rects per frame a single full flip is cheaper
+MAX_DIRTY_RECTS = 400
+
+
+class DirtyRects:
+    """
+    Tracks the screen regions touched by drawing, frame to frame.
+
+    Usage per frame: begin(), draw while calling add() with the bounds of
+    everything drawn, then present().
+    """
+
+    def __init__(self, screen: pygame.Surface, background: tuple[int, int, int] = COLOR_BLACK,
+                 max_rects: int = MAX_DIRTY_RECTS):
+        self.screen = screen
+        self.background = background
+        self.max_rects = max_rects
+        self._prev = []
+        self._cur = []
+        self._full = True
+        self._scene = None
+
+    def invalidate(self) -> None:
+        """Forces the next frame to be cleared and flipped in full."""
+        self._full = True
+
+    def begin(self, scene=None, full: bool = False) -> None:
+        """
+        Starts a frame by erasing last frame's regions. `scene` identifies
+        what is on screen (mode, banner...); when it changes, or with `full`,
+        the whole screen is cleared instead.
+        """
+        if full or scene != self._scene:
+            self._scene = scene
+            self._full = True
+
+        if self._full:
+            self.screen.fill(self.background)
+        else:
+            for rect in self._prev:
+                self.screen.fill(self.background, rect)
+        self._cur = []
+
+    def add(self, rect: pygame.Rect | None) -> None:
+        """Records a region drawn this frame. None is ignored."""
+        if rect:
+            self._cur.append(rect)
+
+    def present(self) -> None:
+        """Pushes this frame's changes to the display."""
+        if self._full or len(self._prev) + len(self._cur) > self.max_rects:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self._prev + self._cur)
+        self._prev = self._cur
+        self._full = False
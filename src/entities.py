@@ -2,7 +2,12 @@ import pygame
 import random
 from dataclasses import dataclass, field
 import src.sprites as sprites
+import src.collision as collision
 from src.constants import *
+from src.spatial import FleetGrid, FleetOccupancy
+from src.bullets import BulletPool, PLAYER
+from src.clock import Clock, RealClock
+from src.particles import NULL_PARTICLES
 
 @dataclass
 class Spaceship:
@@ -15,6 +20,10 @@ class Spaceship:
         x (int): Current x-coordinate.
         y (int): Current y-coordinate.
         lives (int): Remaining lives.
+        bullets (BulletPool): Pool the ship fires into, usually shared with the fleet.
+        owner (int): Owner id tagged on this ship's bullets.
+        clock (Clock): Time source for shot cooldowns and invulnerability.
+        particles: Receives an explosion whenever the ship loses a life.
     """
     name: str
     health: int
@@ -30,18 +39,25 @@ class Spaceship:
     max_bullets: int = 3
     width: int = 50
     height: int = 30
+    speed: int = 5
     bullet_speed: int = 7
     last_shot_time: int = 0
     shoot_delay: int = 500
     
     # Mutable defaults need field(default_factory=...)
-    bullets: list = field(default_factory=list)
+    bullets: BulletPool = field(default_factory=BulletPool)
+    owner: int = PLAYER
+    clock: Clock = field(default_factory=RealClock)
+    particles: object = NULL_PARTICLES
     spawn_x: int = field(init=False)
     spawn_y: int = field(init=False)
+    # Position at the previous tick, for render interpolation
+    prev_x: int = field(init=False)
 
     def __post_init__(self):
         self.spawn_x = self.x
         self.spawn_y = self.y
+        self.prev_x = self.x
 
     def take_damage(self, amount: int) -> None:
         """
@@ -53,15 +69,18 @@ class Spaceship:
         self.health -= amount
         if self.health <= 0:
             # lose a life
+            self.particles.explode(self.x, self.y, self.width, self.height, COLOR_CYAN)
             self.lives -= 1
             if self.lives > 0:
                 # respawn
                 self.health = 100
                 self.x = self.spawn_x
                 self.y = self.spawn_y
-                self.bullets.clear()
+                # teleport rather than slide back when interpolating
+                self.prev_x = self.x
+                self.bullets.clear(self.owner)
                 self.invulnerable = True
-                self.invulnerable_start = pygame.time.get_ticks()
+                self.invulnerable_start = self.clock.now()
             else:
                 # final death
                 self.health = 0
@@ -76,63 +95,63 @@ class Spaceship:
         Fires a bullet if the cooldown has passed and max bullets limit isn't reached.
         """
         # Check current time
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.now()
         
         # Only shoot if enough time has passed since the last shot
-        if current_time - self.last_shot_time > self.shoot_delay and len(self.bullets) < self.max_bullets:
+        if current_time - self.last_shot_time > self.shoot_delay and self.bullets.count(self.owner) < self.max_bullets:
             # Create a bullet rect centered on the ship
             # Math: Bullet X = Ship X + (Ship Width / 2) - (Bullet Width / 2)
             bullet_w = BULLET_WIDTH
             bullet_h = BULLET_HEIGHT
             bullet_x = self.x + (self.width // 2) - (bullet_w // 2)
             bullet_y = self.y
-            
-            new_bullet = pygame.Rect(bullet_x, bullet_y, bullet_w, bullet_h)
-            self.bullets.append(new_bullet)
-            
+
+            # Bullets travel up, so their speed is negative
+            self.bullets.spawn(bullet_x, bullet_y, bullet_w, bullet_h, -self.bullet_speed, self.owner)
+
             self.last_shot_time = current_time
 
-    def move(self) -> None:
+    def move(self, left: bool, right: bool) -> None:
         """
-        Updates the ship's position based on keyboard input (Left/Right arrows).
+        Updates the ship's position based on the Left/Right controls.
         Also updates the position of active bullets.
         """
         # Update ship position based on input
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT]:
-            self.x -= 5
-        if keys[pygame.K_RIGHT]:
-            self.x += 5
+        if left:
+            self.x -= self.speed
+        if right:
+            self.x += self.speed
             
-        # Update bullets
-        # Iterate over a copy of the list [:] so we can remove items while looping
-        for bullet in self.bullets[:]:
-            bullet.y -= self.bullet_speed
-            # Remove bullet if it goes off screen
-            if bullet.y < 0:
-                self.bullets.remove(bullet)
+        # Update bullets, removing those that went off the top of the screen
+        self.bullets.integrate(self.owner)
+        self.bullets.cull(self.owner, min_y=0)
     
-    def draw_ship(self, screen: pygame.Surface) -> None:
+    def update_invulnerability(self) -> None:
+        """Ends the post-respawn invulnerability window once it has elapsed."""
+        if self.invulnerable and self.clock.now() - self.invulnerable_start >= self.invulnerable_duration:
+            self.invulnerable = False
+
+    def draw_ship(self, screen: pygame.Surface, alpha: float = 1.0, scale: int = 1) -> None:
         """
         Draws the ship to the screen. Handles blinking effect when invulnerable.
+        `alpha` below 1 draws the ship and bullets between their previous and
+        current tick positions; `scale` draws onto a 1/scale render target.
         """
         # Draw the ship (with invulnerability blink)
-        now = pygame.time.get_ticks()
+        now = self.clock.now()
+        self.update_invulnerability()
         draw = True
         if self.invulnerable:
-            if now - self.invulnerable_start >= self.invulnerable_duration:
-                self.invulnerable = False
-            else:
-                # blinking effect while invulnerable
-                if (now - self.invulnerable_start) % 300 < 150:
-                    draw = False
+            # blinking effect while invulnerable
+            if (now - self.invulnerable_start) % 300 < 150:
+                draw = False
         
+        x = self.x if alpha >= 1 else round(self.prev_x + (self.x - self.prev_x) * alpha)
         if draw and not self.dead:
-            sprites.draw_pixel_sprite(screen, sprites.PLAYER_SHIP, self.x, self.y, self.width, self.height, (0, 255, 255)) # Cyan ship
+            sprites.blit_sprite(screen, sprites.PLAYER_SHIP, x, self.y, self.width, self.height, COLOR_CYAN, scale) # Cyan ship
 
         # Draw the bullets
-        for bullet in self.bullets:
-            pygame.draw.rect(screen, (255, 255, 0), bullet)
+        self.bullets.draw(screen, COLOR_YELLOW, self.owner, alpha, scale)
     
 
 @dataclass
@@ -148,26 +167,34 @@ class Enemy:
     col: int
     alive: bool = True
     frame: int = 0
+    # Fleet notified when the enemy dies, to keep its bookkeeping current
+    fleet: "Fleet | None" = field(default=None, repr=False, compare=False)
     rect: pygame.Rect = field(init=False)
 
     def __post_init__(self):
         self.rect = pygame.Rect(self.x, self.y, self.w, self.h)
 
-    def draw(self, screen: pygame.Surface) -> None:
+    @property
+    def pattern(self) -> list[str]:
+        """Sprite pattern of the current animation frame."""
+        # simple two-frame animation
+        return sprites.ALIEN_A_1 if self.frame == 0 else sprites.ALIEN_A_2
+
+    def draw(self, screen: pygame.Surface, scale: int = 1) -> None:
         """Draws the enemy sprite using the current animation frame."""
         if not self.alive:
             return
-        
-        # simple two-frame animation
-        pattern = sprites.ALIEN_A_1 if self.frame == 0 else sprites.ALIEN_A_2
-        # Colors: Greenish
-        color = (50, 255, 50)
-        
-        sprites.draw_pixel_sprite(screen, pattern, self.rect.x, self.rect.y, self.rect.width, self.rect.height, color)
+        sprites.blit_sprite(screen, self.pattern, self.rect.x, self.rect.y, self.rect.width, self.rect.height, COLOR_ALIEN, scale)
 
     def hit(self) -> None:
         """Marks the enemy as dead."""
+        if not self.alive:
+            return
         self.alive = False
+        if self.fleet is not None:
+            self.fleet.occupancy.kill(self.row, self.col)
+            self.fleet.version += 1
+            self.fleet.particles.explode(self.rect.x, self.rect.y, self.rect.width, self.rect.height, COLOR_ALIEN)
 
 
 @dataclass
@@ -189,8 +216,15 @@ class Fleet:
     step_distance: int = 16
     drop_amount: int = 32
     step_interval: int = 600
-    last_step: int = field(default_factory=pygame.time.get_ticks)
+    last_step: int | None = None
+    clock: Clock = field(default_factory=RealClock)
+    # Receives an explosion for every enemy killed
+    particles: object = NULL_PARTICLES
+    # Bumped whenever an enemy moves, animates or dies
+    version: int = field(default=0, init=False, compare=False)
     enemies: list = field(init=False)
+    grid: FleetGrid = field(init=False)
+    occupancy: FleetOccupancy = field(init=False)
 
     def __post_init__(self):
         self.enemies = []  # 2D list [row][col]
@@ -199,42 +233,57 @@ class Fleet:
             for c in range(self.cols):
                 x = self.start_x + c * (self.enemy_w + self.h_spacing)
                 y = self.start_y + r * (self.enemy_h + self.v_spacing)
-                row_list.append(Enemy(x, y, self.enemy_w, self.enemy_h, r, c))
+                row_list.append(Enemy(x, y, self.enemy_w, self.enemy_h, r, c, fleet=self))
             self.enemies.append(row_list)
-        
-        # Override last_step to ensure it's current if get_ticks was called early
-        self.last_step = pygame.time.get_ticks()
+        self._flat = [e for row in self.enemies for e in row]
+        # Blit list of the last draw and the (version, scale) it was built for
+        self._blits = []
+        self._blits_key = None
+
+        # Collision index over the formation, moved along with the fleet
+        self.grid = FleetGrid(self.rows, self.cols, self.start_x, self.start_y,
+                              self.enemy_w + self.h_spacing, self.enemy_h + self.v_spacing)
+        # Living-enemy counts, updated by Enemy.hit()
+        self.occupancy = FleetOccupancy(self.rows, self.cols, lambda r, c: self.enemies[r][c].alive)
+
+        # Start the step timer now unless the caller supplied a start time
+        if self.last_step is None:
+            self.last_step = self.clock.now()
 
     def all_enemies(self):
         """Returns a flat list of all enemies in the fleet."""
-        return [e for row in self.enemies for e in row]
+        return self._flat
+
+    def any_alive(self) -> bool:
+        """True while at least one enemy is still alive."""
+        return self.occupancy.alive > 0
 
     def bounding_rect(self):
         """Calculates the bounding rectangle enclosing all living enemies."""
-        alive_rects = [e.rect for e in self.all_enemies() if e.alive]
-        if not alive_rects:
+        # Living enemies sit exactly on their grid cells
+        bounds = self.occupancy.bounds(self.grid, self.enemy_w, self.enemy_h)
+        if bounds is None:
             return None
-        br = alive_rects[0].copy()
-        for r in alive_rects[1:]:
-            br.union_ip(r)
-        return br
+        left, top, right, bottom = bounds
+        return pygame.Rect(left, top, right - left, bottom - top)
 
     def update(self) -> None:
         """
         Updates the fleet's position. Handles side collision detection
         to reverse direction and drop down.
         """
-        now = pygame.time.get_ticks()
+        now = self.clock.now()
         if now - self.last_step < self.step_interval:
             return
         self.last_step = now
 
-        br = self.bounding_rect()
-        if not br:
+        bounds = self.occupancy.bounds(self.grid, self.enemy_w, self.enemy_h)
+        if bounds is None:
             return
+        left, _, right, _ = bounds
 
-        would_hit_left = (br.left + self.direction * self.step_distance) < 0
-        would_hit_right = (br.right + self.direction * self.step_distance) > self.screen_width
+        would_hit_left = (left + self.direction * self.step_distance) < 0
+        would_hit_right = (right + self.direction * self.step_distance) > self.screen_width
 
         if would_hit_left or would_hit_right:
             # reverse and drop
@@ -242,41 +291,57 @@ class Fleet:
             for e in self.all_enemies():
                 if e.alive:
                     e.rect.y += self.drop_amount
+            self.grid.translate(0, self.drop_amount)
             # speed up slightly when changing direction
             self.step_interval = max(100, int(self.step_interval * 0.95))
         else:
             for e in self.all_enemies():
                 if e.alive:
                     e.rect.x += self.direction * self.step_distance
+            self.grid.translate(self.direction * self.step_distance, 0)
 
         # toggle simple animation frame
         for e in self.all_enemies():
             if e.alive:
                 e.frame ^= 1
+        self.version += 1
 
-    def draw(self, screen: pygame.Surface) -> None:
-        """Draws all alive enemies in the fleet."""
-        for e in self.all_enemies():
-            e.draw(screen)
+    def draw(self, screen: pygame.Surface, scale: int = 1) -> None:
+        """
+        Draws all alive enemies with a single blits call from the alien atlas.
+        The blit list is only rebuilt after the fleet has changed.
+        """
+        key = (self.version, scale)
+        if key != self._blits_key:
+            atlas = sprites.atlas_cache.get(sprites.ALIEN_ATLAS, self.enemy_w // scale, self.enemy_h // scale)
+            surface, areas = atlas.surface, atlas.areas
+            self._blits = [(surface, (e.rect.x // scale, e.rect.y // scale), areas[e.frame])
+                           for e in self._flat if e.alive]
+            self._blits_key = key
+        screen.blits(self._blits, doreturn=False)
 
-    def pick_shooter(self):
-        """Selects a random enemy from the bottom row of any column to shoot."""
-        # collect the bottom-most alive enemy in each column
-        candidates = []
-        for c in range(self.cols):
-            for r in range(self.rows - 1, -1, -1):
-                e = self.enemies[r][c]
-                if e.alive:
-                    candidates.append(e)
-                    break
-        if not candidates:
+    def pick_shooter(self, rng=random):
+        """
+        Selects a random enemy from the bottom row of any column to shoot.
+        `rng` can be a seeded random.Random for reproducible runs.
+        """
+        # the bottom-most alive enemy of a random occupied column
+        columns = self.occupancy.occupied_cols
+        if not columns:
             return None
-        return random.choice(candidates)
+        c = rng.choice(columns)
+        return self.enemies[self.occupancy.bottom[c]][c]
 
-    def hit_enemy(self, rect: pygame.Rect):
-        """Checks if any enemy is hit by the given rectangle (bullet)."""
-        for e in self.all_enemies():
-            if e.alive and e.rect.colliderect(rect):
+    def hit_enemy(self, rect: pygame.Rect, pixel: bool = False):
+        """
+        Checks if any enemy is hit by the given rectangle (bullet). With
+        `pixel` set, the bullet must also cover a pixel of the enemy's sprite.
+        """
+        # Only the grid cells under the bullet can hold a colliding enemy
+        for r, c in self.grid.cells(rect):
+            e = self.enemies[r][c]
+            if e.alive and e.rect.colliderect(rect) and (not pixel or collision.rect_hits_sprite(
+                    rect, e.pattern, e.rect.x, e.rect.y, e.rect.width, e.rect.height)):
                 e.hit()
                 return e
         return None
\ No newline at end of file
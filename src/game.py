@@ -1,260 +1,255 @@
 import pygame
 import random
+import threading
+import time
+from contextlib import nullcontext
+import numpy as np
 from src.constants import *
-from src.entities import Spaceship, Fleet
-
-def run_game() -> None:
+import src.sprites as sprites
+from src.text import TextCache
+from src.dirty import DirtyRects
+from src.starfield import Starfield
+from src.timestep import FixedTimestep
+from src.replay import Replay
+from src.profiler import FrameProfiler, StartupTimer
+from src.render_target import RenderTarget
+from src.particles import ParticleSystem
+from src.input import InputQueue
+from src.pipeline import ExplosionLog, SimulationThread, RenderView, StageTimeline, gil_enabled
+from src.scenes import Hud, Scenes, make_hud, mark_dirty
+from src.simulation import GameState, new_game, step
+
+
+# Scenes used by draw_state when the caller does not keep its own
+_SCENES = Scenes()
+
+
+def draw_state(screen: pygame.Surface, state: GameState, hud: Hud, dirty: DirtyRects | None = None,
+               alpha: float = 1.0, scale: int = 1, scenes: Scenes | None = None) -> None:
     """
-    Initializes Pygame, sets up the game state, and runs the main game loop.
-    Handles events, updates game logic, and renders the scene.
+    Renders the current game state (everything except the starfield).
+    With `dirty` set, the bounds of everything drawn are recorded on it.
+    `alpha` is the interpolation factor between the last two ticks.
+    `scale` above 1 draws onto a render target 1/scale the size of the game
+    area; layout offsets and font sizes shrink with it.
+    Without `scenes`, a module-wide Scenes keeps the cached backdrops.
     """
-    pygame.init()
-    
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    pygame.display.set_caption(f"Space Invaders — {SCREEN_WIDTH}x{SCREEN_HEIGHT}")
-    clock = pygame.time.Clock()
-    
-    # --- MATH FOR SPAWNING ---
-    ship_width = 50
-    ship_height = 30
-    padding = 10
-
-    # 1. Find the horizontal middle, then shift left by half the ship's width
-    start_x = (SCREEN_WIDTH // 2) - (ship_width // 2)
-
-    # 2. Find the bottom, then move up by ship height and padding
-    start_y = SCREEN_HEIGHT - ship_height - padding
-
-    spaceship = Spaceship("Falcon", 100, x=start_x, y=start_y)
-
-    # --- GAME STATE ---
-    score = 0
-    level = 1
-    level_transition_start = 0
-
-    # --- ENEMY FLEET SETUP ---
-    ENEMY_COLS = 11
-    ENEMY_ROWS = 5
-    ENEMY_W = 64
-    ENEMY_H = 48
-    ENEMY_H_SPACING = 20
-    ENEMY_V_SPACING = 18
+    (scenes if scenes is not None else _SCENES).draw(screen, state, hud, dirty, alpha, scale)
 
-    fleet_width = ENEMY_COLS * ENEMY_W + (ENEMY_COLS - 1) * ENEMY_H_SPACING
-    fleet_start_x = (SCREEN_WIDTH - fleet_width) // 2
-    fleet_start_y = 100
 
-    fleet = Fleet(ENEMY_COLS, ENEMY_ROWS, ENEMY_W, ENEMY_H, ENEMY_H_SPACING, ENEMY_V_SPACING, fleet_start_x, fleet_start_y, SCREEN_WIDTH)
+def run_game(dirty_rects: bool = DIRTY_RECT_RENDERING, render_fps: int = RENDER_FPS,
+             frame_skip: int = FRAME_SKIP, interpolate: bool = INTERPOLATE,
+             seed: int | None = None, record: str | None = None,
+             replay: Replay | None = None, trace: str | None = None,
+             render_scale: int = RENDER_SCALE, startup: StartupTimer | None = None,
+             pipelined: bool = PIPELINED) -> GameState:
+    """
+    Initializes Pygame and runs the main loop: polls input, advances the
+    simulation in fixed ticks of 1 / TICK_RATE seconds and renders the scene.
+
+    Rendering is decoupled from the simulation: it runs at up to `render_fps`
+    (0 = uncapped), draws one frame out of every `frame_skip + 1`, and with
+    `interpolate` draws moving objects between their last two tick positions.
+    With `dirty_rects`, only the changed regions of the screen are redrawn.
+    A `render_scale` above 1 draws the scene at 1/render_scale resolution and
+    upscales it to the window each frame; it takes precedence over
+    `dirty_rects`, since the upscale rewrites the whole window anyway.
+
+    `seed` fixes the RNG for a reproducible session; `record` saves the
+    session's inputs to a replay file on exit. Passing a `replay` plays it
+    back instead of reading the keyboard. Returns the final game state.
+
+    Key events are queued and applied tick by tick (see src.input), so taps
+    shorter than a frame still register.
+
+    With `pipelined`, the simulation runs on its own thread and each frame
+    draws the latest tick it published (see src.pipeline); how much the two
+    stages overlapped is printed on exit.
+
+    Frames are always profiled, including input-to-present latency; F3
+    toggles the profiler overlay and `trace` exports the last frames as
+    Chrome trace-event JSON on exit. Passing a `startup` timer prints its
+    phase timings once the first frame is shown.
+    """
+    timer = startup if startup is not None else StartupTimer()
+    # Only what the game uses; pygame.init() would also start audio, joystick...
+    pygame.display.init()
+    pygame.font.init()
+    timer.mark("pygame init")
 
-    enemy_bullets = []
-    enemy_bullet_speed = 5
-    last_enemy_shot = pygame.time.get_ticks()
-    enemy_shot_interval = 1500
+    target = RenderTarget.open(SCREEN_WIDTH, SCREEN_HEIGHT, render_scale)
+    pygame.display.set_caption(f"Space Invaders — {SCREEN_WIDTH}x{SCREEN_HEIGHT}")
+    timer.mark("display")
+    clock = pygame.time.Clock()
+    screen = target.surface
+    window = target.window
+    # overlay text keeps the same size relative to the window
+    overlay_font_size = max(10, 24 * window.get_width() // SCREEN_WIDTH)
+    dirty = DirtyRects(screen) if dirty_rects and render_scale == 1 else None
+
+    if replay is not None:
+        seed = replay.seed
+    elif seed is None:
+        seed = random.getrandbits(63)
+    recording = Replay(seed, TICK_RATE) if record else None
+    replay_inputs = replay.inputs() if replay is not None else None
+
+    # Explosions are cosmetic and draw on their own RNG
+    particles = ParticleSystem(rng=np.random.default_rng(seed))
+    if pipelined:
+        # The simulation thread owns `state`; frames draw `view_state`, a
+        # copy restored from the snapshots it publishes, explosions included
+        state = new_game(seed=seed, particles=ExplosionLog())
+        view_state = new_game(seed=seed, particles=particles)
+    else:
+        state = view_state = new_game(seed=seed, particles=particles)
+    config = state.config
+    profiler = FrameProfiler(budget_ms=1000 / (render_fps or TICK_RATE))
+    view_state.profiler = profiler
+
+    # Fonts are loaded on first use; text is rendered on demand and cached
+    hud = make_hud(TextCache(), render_scale)
+    scenes = Scenes()
+    timer.mark("game state")
+
+    # The menu needs no sprites: rasterize the aliens and the player ship in
+    # the background while it is showing
+    enemy_w, enemy_h = config.enemy_w // render_scale, config.enemy_h // render_scale
+    sprites.warm_sprite_cache_async(
+        [(sprites.PLAYER_SHIP, config.ship_width // render_scale, config.ship_height // render_scale, COLOR_CYAN)],
+        atlases=[(sprites.ALIEN_ATLAS, enemy_w, enemy_h)],
+    )
     
-    # --- STARFIELD ---
-    stars = []
-    for _ in range(100):
-        # x, y, speed (brightness linked to speed)
-        stars.append([random.randint(0, SCREEN_WIDTH), random.randint(0, SCREEN_HEIGHT), random.randint(1, 3)])
-
-    game_state = "MENU" # MENU, PLAYING, GAMEOVER
-
-    running = True
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-        
+    starfield = Starfield(STAR_COUNT, speeds=STAR_SPEEDS, rng=np.random.default_rng(seed))
+    # Stars are tracked one rect each; past the budget, clear the whole frame
+    track_stars = dirty is not None and len(starfield) < dirty.max_rects // 2
+    timer.mark("starfield")
+    shown = False
+
+    tick_rate = replay.tick_rate if replay is not None else TICK_RATE
+    timestep = FixedTimestep(tick_rate, MAX_CATCH_UP_TICKS)
+    input_queue = InputQueue()
+    # the simulation thread takes inputs while the main thread pushes them
+    input_lock = threading.Lock() if pipelined else nullcontext()
+    sim = view = timeline = None
+    if pipelined:
+        def next_inputs():
+            if replay_inputs is not None:
+                return next(replay_inputs, None)
+            with input_lock:
+                return input_queue.next_inputs()
+
+        timeline = StageTimeline()
+        sim = SimulationThread(state, next_inputs, tick_rate,
+                               recording.record if recording is not None else None, timeline)
+        view = RenderView(view_state, sim.buffer, tick_rate)
+        sim.start()
+
+    frame = 0
+    frame_ms = clock.tick(render_fps)
+    while state.running:
+        profiler.begin_frame()
+        frame_start = time.perf_counter()
+        with profiler.span("event poll"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    state.running = False
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    profiler.overlay = not profiler.overlay
+                else:
+                    with input_lock:
+                        input_queue.push(event)
+
+        if view is not None:
+            # Catch up with the simulation thread's latest tick
+            with profiler.span("snapshot"):
+                ticks = min(view.update(), MAX_CATCH_UP_TICKS)
+            for _ in range(ticks):
+                with profiler.span("starfield"):
+                    starfield.update()
+                with profiler.span("particles"):
+                    scenes.update(view_state)
+            alpha = view.alpha()
+        else:
+            # Run as many fixed ticks as the elapsed time calls for
+            for _ in range(timestep.add_time(frame_ms)):
+                if not state.running:
+                    break
+                if replay_inputs is not None:
+                    inputs = next(replay_inputs, None)
+                    if inputs is None:
+                        # end of the replay
+                        state.running = False
+                        break
+                else:
+                    inputs = input_queue.next_inputs()
+                if recording is not None:
+                    recording.record(inputs)
+                step(state, inputs, timestep.next_dt())
+                with profiler.span("starfield"):
+                    starfield.update()
+                with profiler.span("particles"):
+                    scenes.update(state)
+            alpha = timestep.alpha
+
+        frame += 1
+        if frame % (frame_skip + 1):
+            profiler.end_frame()
+            frame_ms = clock.tick(render_fps)
+            continue
+
+        scene = scenes.select(view_state)
         # Draw background (clear)
-        screen.fill("black")
+        if dirty is not None:
+            # Full clear whenever the scene changes
+            dirty.begin(scene=scene, full=not track_stars)
+        else:
+            screen.fill("black")
         
-        # Update and Draw Stars
-        for star in stars:
-            star[1] += star[2] # move down
-            if star[1] > SCREEN_HEIGHT:
-                star[1] = 0
-                star[0] = random.randint(0, SCREEN_WIDTH)
-            
-            # dim stars are slower, bright are faster
-            color_val = min(255, star[2] * 80)
-            pygame.draw.circle(screen, (color_val, color_val, color_val), (star[0], star[1]), 2 if star[2] > 2 else 1)
-
-        keys = pygame.key.get_pressed()
-
-        if game_state == "MENU":
-            # Title Screen
-            title_font = pygame.font.SysFont(None, 120)
-            title_surf = title_font.render("SPACE INVADERS", True, COLOR_GREEN)
-            title_rect = title_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
-            screen.blit(title_surf, title_rect)
-
-            instr_font = pygame.font.SysFont(None, 48)
-            instr_surf = instr_font.render("Press SPACE to Start", True, COLOR_WHITE)
-            instr_rect = instr_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-            screen.blit(instr_surf, instr_rect)
-
-            if keys[pygame.K_SPACE]:
-                game_state = "PLAYING"
-                # Reset game
-                spaceship.lives = 3
-                spaceship.health = 100
-                spaceship.dead = False
-                spaceship.invulnerable = True
-                spaceship.invulnerable_start = pygame.time.get_ticks()
-                spaceship.x = spaceship.spawn_x
-                spaceship.y = spaceship.spawn_y
-                score = 0
-                level = 1
-                level_transition_start = 0
-                fleet = Fleet(ENEMY_COLS, ENEMY_ROWS, ENEMY_W, ENEMY_H, ENEMY_H_SPACING, ENEMY_V_SPACING, fleet_start_x, fleet_start_y, SCREEN_WIDTH)
-                enemy_bullets.clear()
-                spaceship.bullets.clear()
-
-        elif game_state == "PLAYING":
-            spaceship.move()
-            # keep ship onscreen
-            spaceship.x = max(0, min(spaceship.x, SCREEN_WIDTH - spaceship.width))
-
-            # Player firing only when pressing Space
-            if keys[pygame.K_SPACE]:
-                spaceship.shoot()
-
-            # Logic depends on whether we are transitioning between levels
-            if level_transition_start > 0:
-                # We are in transition (delay before next level)
-                if pygame.time.get_ticks() - level_transition_start > 2000:
-                    # Time to spawn new fleet
-                    fleet = Fleet(ENEMY_COLS, ENEMY_ROWS, ENEMY_W, ENEMY_H, ENEMY_H_SPACING, ENEMY_V_SPACING, fleet_start_x, fleet_start_y, SCREEN_WIDTH)
-                    
-                    # Increase difficulty
-                    new_interval = max(100, 600 - (level - 1) * 50)
-                    fleet.step_interval = new_interval
-                    
-                    level_transition_start = 0
-                else:
-                    # Draw "Level X" message
-                    lvl_font = pygame.font.SysFont(None, 100)
-                    lvl_surf = lvl_font.render(f"LEVEL {level}", True, COLOR_YELLOW)
-                    lvl_rect = lvl_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-                    screen.blit(lvl_surf, lvl_rect)
-
+        # Draw Stars
+        with profiler.span("starfield"):
+            starfield.draw(screen, render_scale)
+            if track_stars:
+                for star_rect in starfield.rects():
+                    dirty.add(star_rect)
+
+        scene.draw(screen, view_state, hud, dirty, alpha if interpolate else 1.0, render_scale)
+
+        with profiler.span("upscale"):
+            target.upscale()
+        # drawn on the window so it is not shrunk by a software upscale
+        mark_dirty(dirty, profiler.draw_overlay(window, hud.text.font(overlay_font_size)))
+
+        with profiler.span("flip"):
+            if dirty is not None:
+                dirty.present()
             else:
-                # Normal Gameplay Logic
-                
-                # Fleet movement/animation
-                fleet.update()
-
-                # Enemy shooting (choose bottom-most enemy in a random column)
-                now = pygame.time.get_ticks()
-                if now - last_enemy_shot > enemy_shot_interval:
-                    shooter = fleet.pick_shooter()
-                    if shooter:
-                        bw, bh = ENEMY_BULLET_WIDTH, ENEMY_BULLET_HEIGHT
-                        bx = shooter.rect.x + shooter.rect.width // 2 - bw // 2
-                        by = shooter.rect.bottom
-                        enemy_bullets.append(pygame.Rect(bx, by, bw, bh))
-                    last_enemy_shot = now
-
-                # Update enemy bullets
-                ship_rect = pygame.Rect(spaceship.x, spaceship.y, spaceship.width, spaceship.height)
-                for b in enemy_bullets[:]:
-                    b.y += enemy_bullet_speed
-                    if b.y > SCREEN_HEIGHT:
-                        enemy_bullets.remove(b)
-                        continue
-                    if b.colliderect(ship_rect):
-                        # enemy hit should be lethal
-                        spaceship.take_damage(100)
-                        try:
-                            enemy_bullets.remove(b)
-                        except ValueError:
-                            pass
-
-                # Check player bullets vs enemies
-                for bullet in spaceship.bullets[:]:
-                    hit = fleet.hit_enemy(bullet)
-                    if hit:
-                        score += 10 * level  # Points increase with level
-                        try:
-                            spaceship.bullets.remove(bullet)
-                        except ValueError:
-                            pass
-                
-                # Check for level complete
-                if not any(e.alive for e in fleet.all_enemies()):
-                    level += 1
-                    spaceship.bullets.clear()
-                    enemy_bullets.clear()
-                    level_transition_start = pygame.time.get_ticks()
-
-            if spaceship.dead:
-                game_state = "GAMEOVER"
-
-            # Draw fleet and enemy bullets
-            if level_transition_start == 0:
-                fleet.draw(screen)
-                for b in enemy_bullets:
-                    pygame.draw.rect(screen, COLOR_ORANGE, b)
-
-            # Draw player
-            spaceship.draw_ship(screen)
-
-            # Draw UI: lives, score, level
-            font = pygame.font.SysFont(None, 36)
-            lives_surf = font.render(f"Lives: {spaceship.lives}", True, COLOR_WHITE)
-            screen.blit(lives_surf, (10, SCREEN_HEIGHT - 40))
-            
-            score_surf = font.render(f"Score: {score}", True, COLOR_WHITE)
-            screen.blit(score_surf, (10, 10))
-            
-            level_surf = font.render(f"Level: {level}", True, COLOR_WHITE)
-            # align level to top right
-            level_rect = level_surf.get_rect(topright=(SCREEN_WIDTH - 10, 10))
-            screen.blit(level_surf, level_rect)
-
-        elif game_state == "GAMEOVER":
-            # Draw game state (static)
-            fleet.draw(screen)
-            for b in enemy_bullets:
-                pygame.draw.rect(screen, COLOR_ORANGE, b)
-            spaceship.draw_ship(screen)
-
-            # Draw overlay
-            go_font = pygame.font.SysFont(None, 120)
-            go_surf = go_font.render("GAME OVER", True, COLOR_RED)
-            go_rect = go_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 40))
-            screen.blit(go_surf, go_rect)
-            
-            info_font = pygame.font.SysFont(None, 36)
-            info = info_font.render("Press R to restart or Q to Quit", True, COLOR_WHITE)
-            info_rect = info.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 40))
-            screen.blit(info, info_rect)
-            
-            final_score = info_font.render(f"Final Score: {score}", True, COLOR_YELLOW)
-            fs_rect = final_score.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 80))
-            screen.blit(final_score, fs_rect)
-            
-            if keys[pygame.K_r]:
-                game_state = "PLAYING"
-                spaceship.lives = 3
-                spaceship.health = 100
-                spaceship.dead = False
-                spaceship.invulnerable = True
-                spaceship.invulnerable_start = pygame.time.get_ticks()
-                spaceship.x = spaceship.spawn_x
-                spaceship.y = spaceship.spawn_y
-                spaceship.bullets.clear()
-                score = 0
-                level = 1
-                level_transition_start = 0
-                fleet = Fleet(ENEMY_COLS, ENEMY_ROWS, ENEMY_W, ENEMY_H, ENEMY_H_SPACING, ENEMY_V_SPACING, fleet_start_x, fleet_start_y, SCREEN_WIDTH)
-                enemy_bullets.clear()
-            
-            if keys[pygame.K_q]:
-                running = False
-
-        pygame.display.flip()
-
-        clock.tick(60)
+                pygame.display.flip()
+        with input_lock:
+            profiler.record_latency(input_queue.take_latency())
+        profiler.end_frame()
+        if timeline is not None:
+            timeline.record("render", frame_start, time.perf_counter())
+
+        if not shown:
+            shown = True
+            timer.mark("first frame")
+            if startup is not None:
+                print(startup.report())
+
+        frame_ms = clock.tick(render_fps)
+
+    if sim is not None:
+        sim.stop()
+        stats = timeline.stats()
+        print(f"pipeline: sim {stats['sim_ms']:.0f} ms, render {stats['render_ms']:.0f} ms, "
+              f"overlap {stats['overlap_ms']:.0f} ms ({stats['overlap']:.0%}), "
+              f"GIL {'on' if gil_enabled() else 'off'}")
+    if trace is not None:
+        profiler.export_chrome_trace(trace)
+    if recording is not None:
+        recording.finish(state)
+        recording.save(record)
 
     pygame.quit()
+    return state
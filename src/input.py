@@ -0,0 +1,107 @@
+"""
+Event-driven keyboard input.
+
+Instead of sampling pygame.key.get_pressed() once per frame, InputQueue
+drains the key events of each frame into a timestamped queue and replays them
+tick by tick: every press and release lands on a simulation tick in the order
+it happened, and a tap that was pressed and released between two frames still
+holds its control down for one tick instead of vanishing.
+
+pygame does not expose SDL's event timestamps, so events are stamped when
+they are drained at the start of a frame. Input-to-present latency is the time
+from that stamp to the frame that first shows the input's effect being
+presented; it leaves out the time the event sat in the OS queue, which is at
+most one frame.
+"""
+import time
+from collections import deque
+import pygame
+from src.simulation import Inputs
+
+# Keyboard key -> Inputs field it drives
+KEY_BINDINGS = {
+    pygame.K_LEFT: "left",
+    pygame.K_RIGHT: "right",
+    pygame.K_SPACE: "fire",
+    pygame.K_r: "restart",
+    pygame.K_q: "quit",
+}
+
+
+class InputQueue:
+    """
+    Held controls plus the key events not yet applied to a tick.
+
+    Usage per frame: push() every event, call next_inputs() once per
+    simulation tick, then take_latency() once the frame is presented.
+    """
+
+    def __init__(self, bindings: dict[int, str] = KEY_BINDINGS):
+        self.bindings = bindings
+        self.held = set()
+        self._events = deque()
+        self._applied_at = None
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def push(self, event: pygame.event.Event, now: float | None = None) -> bool:
+        """
+        Queues a key event for a bound key, stamped with `now` (perf_counter
+        seconds, default: the current time). Returns False for any other event.
+        """
+        if event.type not in (pygame.KEYDOWN, pygame.KEYUP):
+            if event.type == pygame.WINDOWFOCUSLOST:
+                # key releases are not delivered to an unfocused window
+                self.release_all(now)
+                return True
+            return False
+        control = self.bindings.get(event.key)
+        if control is None:
+            return False
+        now = time.perf_counter() if now is None else now
+        self._events.append((now, control, event.type == pygame.KEYDOWN))
+        return True
+
+    def release_all(self, now: float | None = None) -> None:
+        """Queues a release of every control that is held or about to be."""
+        now = time.perf_counter() if now is None else now
+        controls = self.held | {control for _, control, down in self._events if down}
+        for control in sorted(controls):
+            self._events.append((now, control, False))
+
+    def next_inputs(self) -> Inputs:
+        """
+        Applies queued events to the held controls and returns the controls
+        for the next tick. Events are applied in order until one would change
+        a control already changed during this tick; it waits for the following
+        tick, so every press and every release lasts at least one tick.
+        """
+        events = self._events
+        held = self.held
+        changed = set()
+        while events:
+            stamp, control, down = events[0]
+            if control in changed:
+                break
+            changed.add(control)
+            if down:
+                held.add(control)
+            else:
+                held.discard(control)
+            events.popleft()
+            if self._applied_at is None:
+                self._applied_at = stamp
+        return Inputs(**{control: True for control in held})
+
+    def take_latency(self, now: float | None = None) -> float | None:
+        """
+        Milliseconds from the oldest event applied since the last call to
+        `now`, or None if no event was applied. Call it right after present.
+        """
+        stamp = self._applied_at
+        if stamp is None:
+            return None
+        self._applied_at = None
+        now = time.perf_counter() if now is None else now
+        return (now - stamp) * 1000
@@ -0,0 +1,428 @@
+"""
+What a co-op client sees of the world, and the per-tick deltas that keep it
+in sync.
+
+The server captures a WorldView after every tick and broadcasts only what
+changed since the previous one: enemies killed (or a whole new fleet), ship
+positions, and bullets added or removed. Bullets fly at a constant speed, so
+one that simply kept moving costs nothing: both ends advance it by its vy
+every tick. A client joining mid-game starts from a keyframe, which is the
+delta from an empty view.
+
+Framing: u32 length, then the message, which starts with a u8 type. Readers
+refuse lengths above the largest message the peer can legally send.
+    HELLO   client -> server: join the session
+    INPUT   client -> server: u32 sequence number, u8 input mask
+    WELCOME server -> client: u8 player id, u16 tick rate, JSON GameConfig
+    DELTA   server -> client: u32 last input sequence applied, then a delta
+
+Delta layout (little-endian):
+    u32 tick, u32 score, u16 level, u8 mode, u8 flags,
+    i32 fleet origin x, i32 fleet origin y,
+    if the fleet was replaced: u16 rows, u16 cols, alive bits
+    otherwise: u16 count, then the u16 indices of the enemies killed
+    u8 count, then ships (u8 player, i16 x, i16 y, u8 lives, u8 flags)
+    u16 count, then the u16 slots of the bullets removed
+    u16 count, then bullets added (u16 slot, i16 x, i16 y, u8 w, u8 h, i8 vy, i8 owner)
+
+The server refuses configs whose values would not fit these fields
+(check_config), and clients check the config they are welcomed with.
+"""
+import asyncio
+import json
+import struct
+from dataclasses import asdict
+import numpy as np
+from src.constants import *
+from src.entities import Spaceship
+from src.simulation import (GameConfig, MENU, PLAYING, GAMEOVER,
+                            INPUT_LEFT, INPUT_RIGHT, INPUT_FIRE, INPUT_RESTART, INPUT_QUIT)
+
+# Message types
+HELLO = 1
+INPUT = 2
+WELCOME = 3
+DELTA = 4
+
+_LENGTH = struct.Struct("<I")
+_TYPE = struct.Struct("<B")
+_INPUT = struct.Struct("<IB")
+_WELCOME = struct.Struct("<BH")
+_ACK = struct.Struct("<I")
+# Every bit an input mask may set
+_INPUT_BITS = INPUT_LEFT | INPUT_RIGHT | INPUT_FIRE | INPUT_RESTART | INPUT_QUIT
+# Where the delta starts in a DELTA message
+DELTA_OFFSET = 1 + _ACK.size
+
+_HEAD = struct.Struct("<IIHBBii")
+_FLEET_RESET = struct.Struct("<HH")
+_COUNT8 = struct.Struct("<B")
+_COUNT16 = struct.Struct("<H")
+# Longest message a client may send (HELLO or INPUT)
+MAX_CLIENT_MESSAGE = 1 + _INPUT.size
+# Longest WELCOME a client accepts, before it knows the config
+MAX_WELCOME_MESSAGE = 64 * 1024
+
+# Enemies are addressed by u16 index
+_MAX_ENEMIES = 1 << 16
+_SHIP = np.dtype([("player", "u1"), ("x", "<i2"), ("y", "<i2"), ("lives", "u1"), ("flags", "u1")])
+_ADDED = np.dtype([("slot", "<u2"), ("x", "<i2"), ("y", "<i2"), ("w", "u1"), ("h", "u1"),
+                   ("vy", "i1"), ("owner", "i1")])
+
+# Bullet table kept by both ends, one row per pool slot
+BULLET = np.dtype([("active", "?"), ("x", "<i4"), ("y", "<i4"), ("w", "<i4"), ("h", "<i4"),
+                   ("vy", "<i4"), ("owner", "<i2")])
+_BULLET_FIELDS = ("x", "y", "w", "h", "vy", "owner")
+
+_MODES = (MENU, PLAYING, GAMEOVER)
+
+# Delta flags
+_IN_TRANSITION = 1
+_FRAME = 2
+_NEW_FLEET = 4
+
+# Ship flags
+SHIP_DEAD = 1
+SHIP_INVULNERABLE = 2
+
+
+# Samples kept per metric
+METRIC_SAMPLES = 600
+
+
+class ProtocolError(ValueError):
+    """Raised for malformed messages."""
+
+
+class NetMetrics:
+    """Ring buffers of the most recent samples of named measurements."""
+
+    def __init__(self, capacity: int = METRIC_SAMPLES):
+        self.capacity = capacity
+        self._samples = {}
+        self._counts = {}
+
+    def add(self, name: str, value: float) -> None:
+        """Records one sample."""
+        samples = self._samples.get(name)
+        if samples is None:
+            samples = self._samples[name] = np.zeros(self.capacity)
+            self._counts[name] = 0
+        count = self._counts[name]
+        samples[count % self.capacity] = value
+        self._counts[name] = count + 1
+
+    def stats(self) -> dict:
+        """Mean, p50, p99 and max of the buffered samples of each measurement."""
+        report = {}
+        for name, samples in self._samples.items():
+            values = samples[:min(self._counts[name], self.capacity)]
+            p50, p99 = np.percentile(values, (50, 99))
+            report[name] = {"mean": float(values.mean()), "p50": float(p50), "p99": float(p99),
+                            "max": float(values.max()), "samples": self._counts[name]}
+        return report
+
+
+class WorldView:
+    """
+    The client-visible state after one tick.
+
+    Attributes:
+        fleet_id (int): Bumped whenever a new fleet spawns; -1 before the first.
+        alive (np.ndarray): Alive flag of every enemy, row-major.
+        frame (int): Animation frame shared by every living enemy.
+        ships (dict[int, tuple]): (x, y, lives, flags) of each player's ship.
+        bullets (np.ndarray): BULLET table with one row per pool slot.
+    """
+
+    def __init__(self, capacity: int):
+        self.tick = 0
+        self.score = 0
+        self.level = 1
+        self.mode = PLAYING
+        self.in_transition = False
+        self.fleet_id = -1
+        self.rows = 0
+        self.cols = 0
+        self.origin_x = 0
+        self.origin_y = 0
+        self.frame = 0
+        self.alive = np.zeros(0, dtype=bool)
+        self.ships = {}
+        self.bullets = np.zeros(capacity, dtype=BULLET)
+
+
+def _fleet_alive(fleet) -> np.ndarray:
+    """Alive flags of the fleet's enemies as an array."""
+    if isinstance(getattr(fleet, "alive", None), np.ndarray):
+        return fleet.alive.copy()
+    enemies = fleet.all_enemies()
+    return np.fromiter((e.alive for e in enemies), dtype=bool, count=len(enemies))
+
+
+def capture(state, fleet_id: int) -> WorldView:
+    """Takes the WorldView of a CoopState; `fleet_id` identifies its current fleet."""
+    bullets = state.bullets
+    fleet = state.fleet
+    occupancy = fleet.occupancy
+
+    view = WorldView(bullets.capacity)
+    view.tick = state.tick
+    view.score = state.score
+    view.level = state.level
+    view.mode = state.mode
+    view.in_transition = state.in_level_transition
+    view.fleet_id = fleet_id
+    view.rows = fleet.rows
+    view.cols = fleet.cols
+    view.origin_x = fleet.grid.origin_x
+    view.origin_y = fleet.grid.origin_y
+    view.alive = _fleet_alive(fleet)
+    if occupancy.alive:
+        # living enemies animate in lockstep
+        col = occupancy.occupied_cols[0]
+        view.frame = fleet.enemies[occupancy.bottom[col]][col].frame
+    view.ships = {player: (ship.x, ship.y, ship.lives,
+                           (SHIP_DEAD if ship.dead else 0) | (SHIP_INVULNERABLE if ship.invulnerable else 0))
+                  for player, ship in state.ships.items()}
+
+    table = view.bullets
+    table["active"] = bullets.active
+    for name in _BULLET_FIELDS:
+        table[name] = getattr(bullets, name)
+    return view
+
+
+def _continuing(prev: np.ndarray, cur: np.ndarray) -> np.ndarray:
+    """Slots holding the same bullet in both tables, one tick further along."""
+    same = prev["active"] & cur["active"] & (cur["y"] == prev["y"] + prev["vy"])
+    for name in ("x", "w", "h", "vy", "owner"):
+        same &= cur[name] == prev[name]
+    return same
+
+
+def encode_delta(prev: WorldView, cur: WorldView) -> bytes:
+    """Encodes what changed from prev to cur."""
+    new_fleet = cur.fleet_id != prev.fleet_id
+    flags = ((_IN_TRANSITION if cur.in_transition else 0) | (_FRAME if cur.frame else 0)
+             | (_NEW_FLEET if new_fleet else 0))
+    out = bytearray(_HEAD.pack(cur.tick, cur.score, cur.level, _MODES.index(cur.mode), flags,
+                               cur.origin_x, cur.origin_y))
+
+    if new_fleet:
+        out += _FLEET_RESET.pack(cur.rows, cur.cols)
+        out += np.packbits(cur.alive).tobytes()
+    else:
+        killed = np.flatnonzero(prev.alive & ~cur.alive)
+        out += _COUNT16.pack(len(killed))
+        out += killed.astype("<u2").tobytes()
+
+    ships = np.array([(player, *fields) for player, fields in cur.ships.items()], dtype=_SHIP)
+    out += _COUNT8.pack(len(ships))
+    out += ships.tobytes()
+
+    same = _continuing(prev.bullets, cur.bullets)
+    removed = np.flatnonzero(prev.bullets["active"] & ~same)
+    out += _COUNT16.pack(len(removed))
+    out += removed.astype("<u2").tobytes()
+
+    slots = np.flatnonzero(cur.bullets["active"] & ~same)
+    added = np.empty(len(slots), dtype=_ADDED)
+    added["slot"] = slots
+    for name in _BULLET_FIELDS:
+        added[name] = cur.bullets[name][slots]
+    out += _COUNT16.pack(len(added))
+    out += added.tobytes()
+    return bytes(out)
+
+
+class _Reader:
+    """Sequential reader over a message body."""
+
+    def __init__(self, data: bytes, pos: int = 0):
+        self.data = memoryview(data)
+        self.pos = pos
+
+    def take(self, size: int) -> memoryview:
+        if self.pos + size > len(self.data):
+            raise ProtocolError("truncated message")
+        chunk = self.data[self.pos:self.pos + size]
+        self.pos += size
+        return chunk
+
+    def unpack(self, fmt: struct.Struct) -> tuple:
+        return fmt.unpack(self.take(fmt.size))
+
+    def array(self, dtype, count: int) -> np.ndarray:
+        dtype = np.dtype(dtype)
+        return np.frombuffer(self.take(dtype.itemsize * count), dtype=dtype)
+
+
+def apply_delta(view: WorldView, data: bytes, pos: int = 0) -> None:
+    """
+    Applies an encoded delta (starting at data[pos]) to the view in place.
+    Raises ProtocolError, leaving the view untouched, if the delta does not
+    fit the view: an unknown mode, or an enemy or bullet slot out of range.
+    """
+    reader = _Reader(data, pos)
+    tick, score, level, mode, flags, origin_x, origin_y = reader.unpack(_HEAD)
+    if mode >= len(_MODES):
+        raise ProtocolError(f"unknown mode {mode}")
+
+    if flags & _NEW_FLEET:
+        rows, cols = reader.unpack(_FLEET_RESET)
+        n = rows * cols
+        if n > _MAX_ENEMIES:
+            raise ProtocolError(f"fleet of {rows}x{cols} enemies is too large")
+        bits = reader.array(np.uint8, (n + 7) // 8)
+        killed = None
+    else:
+        count, = reader.unpack(_COUNT16)
+        killed = reader.array("<u2", count)
+        if count and killed.max() >= len(view.alive):
+            raise ProtocolError(f"enemy {killed.max()} is outside the fleet of {len(view.alive)}")
+
+    count, = reader.unpack(_COUNT8)
+    ships = reader.array(_SHIP, count)
+
+    table = view.bullets
+    count, = reader.unpack(_COUNT16)
+    removed = reader.array("<u2", count)
+    count, = reader.unpack(_COUNT16)
+    added = reader.array(_ADDED, count)
+    for name, slots in (("removed", removed), ("added", added["slot"])):
+        if len(slots) and slots.max() >= len(table):
+            raise ProtocolError(f"{name} bullet slot {slots.max()} is outside the table of {len(table)}")
+
+    view.tick = tick
+    view.score = score
+    view.level = level
+    view.mode = _MODES[mode]
+    view.in_transition = bool(flags & _IN_TRANSITION)
+    view.frame = 1 if flags & _FRAME else 0
+    view.origin_x = origin_x
+    view.origin_y = origin_y
+
+    if killed is None:
+        view.rows, view.cols = rows, cols
+        view.alive = np.unpackbits(bits, count=n).astype(bool)
+        view.fleet_id += 1
+    else:
+        view.alive[killed] = False
+
+    view.ships = {int(s["player"]): (int(s["x"]), int(s["y"]), int(s["lives"]), int(s["flags"]))
+                  for s in ships}
+
+    # every bullet still in flight moved by its speed
+    active = table["active"]
+    table["y"][active] += table["vy"][active]
+    table["active"][removed] = False
+    slots = added["slot"].astype(np.intp)
+    for name in _BULLET_FIELDS:
+        table[name][slots] = added[name]
+    table["active"][slots] = True
+
+
+def message(msg_type: int, payload: bytes = b"") -> bytes:
+    """A framed message ready to write to a stream."""
+    return _LENGTH.pack(len(payload) + 1) + _TYPE.pack(msg_type) + payload
+
+
+def input_message(seq: int, mask: int) -> bytes:
+    """A framed INPUT message."""
+    return message(INPUT, _INPUT.pack(seq, mask))
+
+
+def parse_input(data: bytes) -> tuple[int, int]:
+    """
+    (sequence number, input mask) of an INPUT message. Raises ProtocolError
+    for a message of the wrong length or a mask with undefined bits.
+    """
+    if len(data) != 1 + _INPUT.size:
+        raise ProtocolError(f"INPUT message of {len(data)} bytes, expected {1 + _INPUT.size}")
+    seq, mask = _INPUT.unpack_from(data, 1)
+    if mask & ~_INPUT_BITS:
+        raise ProtocolError(f"input mask {mask:#x} has undefined bits")
+    return seq, mask
+
+
+def _fits(dtype: np.dtype, *values: int) -> bool:
+    info = np.iinfo(dtype)
+    return all(info.min <= value <= info.max for value in values)
+
+
+def check_config(config: GameConfig) -> None:
+    """
+    Raises ProtocolError if deltas cannot encode every value a session with
+    this config produces, instead of letting them wrap and desync clients.
+    """
+    added = _ADDED.fields
+    limits = [
+        ("bullet slot", added["slot"][0], (config.bullet_capacity - 1,)),
+        ("enemy index", np.dtype("<u2"), (config.enemy_rows * config.enemy_cols - 1,)),
+        ("screen size", added["x"][0], (config.screen_width, config.screen_height)),
+        ("bullet width", added["w"][0], (BULLET_WIDTH, ENEMY_BULLET_WIDTH)),
+        ("bullet height", added["h"][0], (BULLET_HEIGHT, ENEMY_BULLET_HEIGHT)),
+        # player bullets fly up, at negative speeds
+        ("bullet speed", added["vy"][0], (config.enemy_bullet_speed, -Spaceship.bullet_speed)),
+    ]
+    for name, dtype, values in limits:
+        if not _fits(dtype, *values):
+            info = np.iinfo(dtype)
+            raise ProtocolError(f"{name} {', '.join(map(str, values))} does not fit the delta format "
+                                f"({info.min} to {info.max})")
+
+
+def welcome_message(player: int, tick_rate: int, config: GameConfig) -> bytes:
+    """A framed WELCOME message."""
+    return message(WELCOME, _WELCOME.pack(player, tick_rate) + json.dumps(asdict(config)).encode())
+
+
+def parse_welcome(data: bytes) -> tuple[int, int, GameConfig]:
+    """
+    (player id, tick rate, config) of a WELCOME message. Raises
+    ProtocolError if the config's values do not fit the delta format.
+    """
+    player, tick_rate = _WELCOME.unpack_from(data, 1)
+    config = GameConfig(**json.loads(data[1 + _WELCOME.size:]))
+    check_config(config)
+    return player, tick_rate, config
+
+
+def delta_message(ack: int, delta: bytes) -> bytes:
+    """A framed DELTA message carrying the last input sequence applied."""
+    return _LENGTH.pack(len(delta) + 1 + _ACK.size) + _TYPE.pack(DELTA) + _ACK.pack(ack) + delta
+
+
+def parse_delta_ack(data: bytes) -> int:
+    """The last input sequence applied, from a DELTA message."""
+    return _ACK.unpack_from(data, 1)[0]
+
+
+def max_delta_message(config: GameConfig) -> int:
+    """
+    Length of the largest DELTA message a session with the config can send:
+    a full fleet (as alive bits or as killed indices, whichever is longer),
+    every ship the count allows, and every bullet slot removed and added.
+    """
+    n = config.enemy_rows * config.enemy_cols
+    fleet = max(_FLEET_RESET.size + (n + 7) // 8, _COUNT16.size + 2 * n)
+    ships = _COUNT8.size + np.iinfo(np.uint8).max * _SHIP.itemsize
+    bullets = 2 * _COUNT16.size + config.bullet_capacity * (2 + _ADDED.itemsize)
+    return DELTA_OFFSET + _HEAD.size + fleet + ships + bullets
+
+
+async def read_message(reader: asyncio.StreamReader, max_length: int) -> tuple[int, bytes]:
+    """
+    Reads one framed message of at most `max_length` bytes and returns
+    (type, whole message). Raises asyncio.IncompleteReadError when the peer
+    disconnects, and ProtocolError for an empty or oversized message, before
+    reading its body.
+    """
+    length, = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+    if not length:
+        raise ProtocolError("empty message")
+    if length > max_length:
+        raise ProtocolError(f"message of {length} bytes exceeds the limit of {max_length}")
+    data = await reader.readexactly(length)
+    return data[0], data
@@ -0,0 +1,195 @@
+"""
+Explosion and debris particles backed by NumPy arrays.
+
+Every live particle is a row in a set of fixed-capacity arrays (position,
+velocity, lifetime, color), kept packed at the front so integration, fading
+and culling are a few whole-array operations per tick. Colors index a small
+palette that is faded and mapped to pixel values once per frame, and drawing
+writes all particles' pixels at once through pygame.surfarray, the same way
+the starfield does, so tens of thousands of particles stay cheap.
+
+Particles are purely cosmetic: they draw on their own RNG and never feed
+back into the simulation, so replays and snapshots are unaffected.
+"""
+import numpy as np
+import pygame
+from src.constants import *
+
+# Most particles alive at once; bursts beyond it are cut short
+PARTICLE_CAPACITY = 65536
+# Particles in one enemy or ship explosion
+PARTICLES_PER_EXPLOSION = 48
+# Downward acceleration in pixels per tick²
+PARTICLE_GRAVITY = 0.15
+# Side of the square each particle draws, in pixels
+PARTICLE_SIZE = 2
+# Brightness steps a particle fades through over its lifetime
+FADE_LEVELS = 16
+
+
+class ParticleSystem:
+    """
+    Pool of short-lived particles.
+
+    Attributes:
+        count (int): Live particles; they occupy rows [0, count) of the arrays.
+        x, y, vx, vy (np.ndarray): Positions and velocities in pixels (per tick).
+        life (np.ndarray): Remaining lifetime in ticks.
+        fade (np.ndarray): Brightness levels lost per tick of lifetime.
+        color (np.ndarray): Index of each particle's color in `palette`.
+        palette (list): RGB colors at full brightness.
+    """
+
+    def __init__(self, capacity: int = PARTICLE_CAPACITY, gravity: float = PARTICLE_GRAVITY,
+                 size: int = PARTICLE_SIZE, rng: np.random.Generator | None = None):
+        self.capacity = capacity
+        self.gravity = gravity
+        self.size = size
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.count = 0
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.fade = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros(capacity, dtype=np.uint8)
+        self.palette = []
+
+    def __len__(self) -> int:
+        return self.count
+
+    def clear(self) -> None:
+        """Removes every particle."""
+        self.count = 0
+
+    def emit(self, x: np.ndarray, y: np.ndarray, vx: np.ndarray, vy: np.ndarray,
+             life: np.ndarray, color: tuple[int, int, int]) -> None:
+        """Adds a batch of particles of one color; those past the capacity are dropped."""
+        n = min(len(x), self.capacity - self.count)
+        if n <= 0:
+            return
+        rows = slice(self.count, self.count + n)
+        self.x[rows] = x[:n]
+        self.y[rows] = y[:n]
+        self.vx[rows] = vx[:n]
+        self.vy[rows] = vy[:n]
+        self.life[rows] = life[:n]
+        self.fade[rows] = FADE_LEVELS / life[:n]
+        self.color[rows] = self._color_index(color)
+        self.count += n
+
+    def _color_index(self, color: tuple[int, int, int]) -> int:
+        """Index of a color in the palette, adding it on first use."""
+        color = tuple(color)
+        if color not in self.palette:
+            self.palette.append(color)
+        return self.palette.index(color)
+
+    def explode(self, x: int, y: int, w: int, h: int, color: tuple[int, int, int],
+                count: int = PARTICLES_PER_EXPLOSION, speed: float = 4.0, life: int = 45) -> None:
+        """
+        Bursts `count` particles out of the w x h box at (x, y), flying in
+        random directions at up to `speed` px per tick for up to `life` ticks.
+        """
+        rng = self.rng
+        px = x + rng.random(count, dtype=np.float32) * w
+        py = y + rng.random(count, dtype=np.float32) * h
+        angle = rng.random(count, dtype=np.float32) * np.float32(2 * np.pi)
+        velocity = rng.random(count, dtype=np.float32) * np.float32(speed)
+        # lift the debris a little so it arcs before falling
+        vy = np.sin(angle) * velocity - np.float32(speed / 3)
+        ticks = rng.integers(life // 3, life, count, endpoint=True).astype(np.float32)
+        self.emit(px, py, np.cos(angle) * velocity, vy, ticks, color)
+
+    def update(self) -> None:
+        """Advances every particle by one tick and drops the expired ones."""
+        n = self.count
+        if not n:
+            return
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.vy[:n] += np.float32(self.gravity)
+        self.life[:n] -= 1
+
+        alive = self.life[:n] > 0
+        keep = int(np.count_nonzero(alive))
+        if keep < n:
+            # pack the survivors at the front, preserving their order
+            rows = np.flatnonzero(alive)
+            for arr in (self.x, self.y, self.vx, self.vy, self.life, self.fade, self.color):
+                arr[:keep] = arr[rows]
+            self.count = keep
+
+    def draw(self, screen: pygame.Surface, scale: int = 1) -> pygame.Rect | None:
+        """
+        Draws every particle in bulk, fading with its remaining lifetime, and
+        returns the bounds drawn, or None. `scale` above 1 draws onto a
+        1/scale render target.
+        """
+        n = self.count
+        if not n:
+            return None
+        size = max(1, self.size // scale)
+        w, h = screen.get_size()
+        xs = self.x[:n].astype(np.int32) // scale
+        ys = self.y[:n].astype(np.int32) // scale
+        # particles partly off the edge are skipped rather than clipped
+        visible = (xs >= 0) & (xs <= w - size) & (ys >= 0) & (ys <= h - size)
+        if not visible.any():
+            return None
+        color = self.color[:n].astype(np.intp)
+        level = (self.life[:n] * self.fade[:n]).astype(np.intp)
+        if not visible.all():
+            xs, ys, color, level = xs[visible], ys[visible], color[visible], level[visible]
+        # every palette color at every brightness level
+        shades = [[tuple(c * k // FADE_LEVELS for c in rgb) for k in range(FADE_LEVELS + 1)]
+                  for rgb in self.palette]
+
+        try:
+            pixels = pygame.surfarray.pixels2d(screen)
+        except ValueError:
+            # Surface formats without direct pixel access (e.g. 24-bit)
+            for x, y, c, k in zip(xs.tolist(), ys.tolist(), color.tolist(), level.tolist()):
+                screen.fill(shades[c][k], (x, y, size, size))
+        else:
+            table = np.array([[screen.map_rgb(shade) for shade in row] for row in shades],
+                             dtype=pixels.dtype)
+            mapped = table[color, level]
+            # 1-D view over the pixel rows: one flat index per particle is
+            # much cheaper to scatter through than (x, y) pairs
+            pitch = pixels.strides[1] // pixels.itemsize
+            flat = np.lib.stride_tricks.as_strided(pixels, shape=(pitch * (h - 1) + w,),
+                                                   strides=(pixels.itemsize,))
+            offsets = ys.astype(np.intp) * pitch + xs
+            for dy in range(size):
+                for dx in range(size):
+                    flat[offsets + (dy * pitch + dx)] = mapped
+            # release the surface lock
+            del flat, pixels
+
+        left, top = int(xs.min()), int(ys.min())
+        return pygame.Rect(left, top, int(xs.max()) + size - left, int(ys.max()) + size - top)
+
+
+class NullParticles:
+    """Stand-in used by headless simulations: spawns and draws nothing."""
+
+    def __len__(self) -> int:
+        return 0
+
+    def explode(self, *args, **kwargs) -> None:
+        pass
+
+    def update(self) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def draw(self, screen: pygame.Surface, scale: int = 1) -> None:
+        return None
+
+
+# Shared no-op instance used when no particle system is attached
+NULL_PARTICLES = NullParticles()
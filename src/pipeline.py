@@ -0,0 +1,256 @@
+"""
+Pipelined simulation and rendering.
+
+In the default loop each frame first runs its simulation ticks and then
+draws, so the two costs add up. With the pipeline, a SimulationThread steps
+the game on its own fixed-rate loop and publishes an immutable snapshot
+(src.snapshot bytes) after every tick into a SnapshotBuffer; the main thread
+restores the latest one into a separate render-side GameState and draws that.
+The stages share nothing but the published bytes and the input queue.
+
+While one thread holds the GIL the other only runs inside code that releases
+it (SDL blits and flips, NumPy), so on a standard build the overlap is
+partial. On a free-threaded CPython 3.13 build both stages run in parallel.
+StageTimeline records when each stage was busy and reports how much of that
+time the two stages ran at once.
+
+Explosions are cosmetic and snapshots do not carry particles: the simulation
+state records each tick's explosions in an ExplosionLog, they are published
+alongside the snapshot, and the render side bursts them into its own
+particle system where they happened.
+"""
+import sys
+import threading
+import time
+from typing import Callable
+import numpy as np
+from src.constants import *
+from src.simulation import GameState, Inputs, step
+from src.particles import NullParticles
+from src.snapshot import snapshot, restore
+from src.timestep import FixedTimestep
+
+# Busy intervals remembered per stage
+TIMELINE_CAPACITY = 4096
+
+
+class ExplosionLog(NullParticles):
+    """
+    Particle system stand-in for the simulation thread: draws nothing, but
+    remembers the arguments of every explode() call until taken.
+    """
+
+    def __init__(self):
+        self.pending = []
+
+    def explode(self, x: int, y: int, w: int, h: int, color: tuple[int, int, int]) -> None:
+        self.pending.append((x, y, w, h, color))
+
+    def take(self) -> list[tuple]:
+        """Returns and forgets the explosions recorded so far."""
+        pending, self.pending = self.pending, []
+        return pending
+
+
+class SnapshotBuffer:
+    """
+    Double buffer of published ticks. The simulation writes the back slot
+    and swaps it to the front; the renderer reads the front slot. Slots hold
+    (tick, published_at, snapshot bytes) and are never modified once swapped.
+
+    Explosions are events rather than state, so they queue up until the
+    renderer takes them instead of being overwritten by the next tick.
+    """
+
+    def __init__(self):
+        self._slots = [None, None]
+        self._front = 0
+        self._explosions = []
+        self._lock = threading.Lock()
+
+    def publish(self, tick: int, data: bytes, explosions: list[tuple] = ()) -> None:
+        """Makes a tick's snapshot the latest one and queues its explosions."""
+        back = 1 - self._front
+        self._slots[back] = (tick, time.perf_counter(), data)
+        with self._lock:
+            self._front = back
+            self._explosions.extend(explosions)
+
+    def latest(self) -> tuple[int, float, bytes] | None:
+        """The latest (tick, published_at, data), or None before the first tick."""
+        with self._lock:
+            return self._slots[self._front]
+
+    def take(self) -> tuple[tuple[int, float, bytes] | None, list[tuple]]:
+        """
+        The latest slot, plus the explosions of every tick up to it that
+        were not taken yet.
+        """
+        with self._lock:
+            explosions, self._explosions = self._explosions, []
+            return self._slots[self._front], explosions
+
+
+class StageTimeline:
+    """
+    Ring buffers of the intervals during which each stage was busy. Each
+    stage only ever writes its own buffer, so recording needs no lock.
+    """
+
+    def __init__(self, stages: tuple[str, ...] = ("sim", "render"), capacity: int = TIMELINE_CAPACITY):
+        self.capacity = capacity
+        self._intervals = {stage: np.zeros((capacity, 2)) for stage in stages}
+        self._counts = {stage: 0 for stage in stages}
+
+    def record(self, stage: str, start: float, end: float) -> None:
+        """Adds a busy interval (perf_counter seconds) for a stage."""
+        n = self._counts[stage]
+        self._intervals[stage][n % self.capacity] = start, end
+        self._counts[stage] = n + 1
+
+    def _recent(self, stage: str) -> np.ndarray:
+        n = self._counts[stage]
+        rows = self._intervals[stage][:min(n, self.capacity)].copy()
+        return rows[np.argsort(rows[:, 0])]
+
+    def stats(self) -> dict:
+        """
+        Busy time of each stage and how long both were busy at once, over the
+        span of time both stages' buffers cover. "overlap" is the share of
+        the shorter stage's busy time that ran concurrently with the other.
+        """
+        sim, render = self._recent("sim"), self._recent("render")
+        if not len(sim) or not len(render):
+            return {"sim_ms": 0.0, "render_ms": 0.0, "overlap_ms": 0.0, "overlap": 0.0}
+        # only the window both buffers cover
+        start = max(sim[0, 0], render[0, 0])
+        sim = np.clip(sim[sim[:, 1] > start], start, None)
+        render = np.clip(render[render[:, 1] > start], start, None)
+
+        overlap = 0.0
+        i = j = 0
+        while i < len(sim) and j < len(render):
+            lo = max(sim[i, 0], render[j, 0])
+            hi = min(sim[i, 1], render[j, 1])
+            if hi > lo:
+                overlap += hi - lo
+            if sim[i, 1] < render[j, 1]:
+                i += 1
+            else:
+                j += 1
+        overlap = float(overlap)
+        sim_busy = float((sim[:, 1] - sim[:, 0]).sum())
+        render_busy = float((render[:, 1] - render[:, 0]).sum())
+        shorter = min(sim_busy, render_busy)
+        return {
+            "sim_ms": sim_busy * 1000,
+            "render_ms": render_busy * 1000,
+            "overlap_ms": overlap * 1000,
+            "overlap": overlap / shorter if shorter else 0.0,
+        }
+
+
+def gil_enabled() -> bool:
+    """False on a free-threaded build running without the GIL."""
+    check = getattr(sys, "_is_gil_enabled", None)
+    return True if check is None else check()
+
+
+class SimulationThread:
+    """
+    Steps a GameState on a background thread at `tick_rate` and publishes a
+    snapshot after every tick. If the state was built with an ExplosionLog
+    as its particles, each tick's explosions are published with it.
+    `next_inputs` is called once per tick and
+    returns the controls, or None to end the session (e.g. end of a replay);
+    `record` (optional) receives each tick's controls.
+
+    The thread owns the state while it runs: other threads may only read
+    `state.running` or set it to False to stop.
+    """
+
+    def __init__(self, state: GameState, next_inputs: Callable[[], Inputs | None],
+                 tick_rate: int = TICK_RATE, record: Callable[[Inputs], None] | None = None,
+                 timeline: StageTimeline | None = None):
+        self.state = state
+        self.next_inputs = next_inputs
+        self.record = record
+        self.timestep = FixedTimestep(tick_rate, MAX_CATCH_UP_TICKS)
+        self.timeline = timeline if timeline is not None else StageTimeline()
+        self.explosions = state.particles if isinstance(state.particles, ExplosionLog) else None
+        self.buffer = SnapshotBuffer()
+        self.buffer.publish(0, snapshot(state))
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Ends the session and waits for the thread to finish."""
+        self.state.running = False
+        self._thread.join()
+
+    def _run(self) -> None:
+        try:
+            self._loop()
+        finally:
+            # an error on this thread ends the session instead of freezing it
+            self.state.running = False
+
+    def _loop(self) -> None:
+        state = self.state
+        timestep = self.timestep
+        last = time.perf_counter()
+        while state.running:
+            now = time.perf_counter()
+            ticks = timestep.add_time((now - last) * 1000)
+            last = now
+            for _ in range(ticks):
+                inputs = self.next_inputs()
+                if inputs is None:
+                    state.running = False
+                    break
+                if self.record is not None:
+                    self.record(inputs)
+                step(state, inputs, timestep.next_dt())
+                explosions = self.explosions.take() if self.explosions is not None else ()
+                self.buffer.publish(timestep.ticks, snapshot(state), explosions)
+            if ticks:
+                self.timeline.record("sim", now, time.perf_counter())
+            # sleep until the next tick is due
+            time.sleep(max(0.0, timestep.tick_ms - timestep.accumulator) / 1000)
+
+
+class RenderView:
+    """
+    Render-side copy of the game, kept up to date from a SnapshotBuffer.
+    The explosions published with the snapshots burst into its particle
+    system.
+    """
+
+    def __init__(self, state: GameState, buffer: SnapshotBuffer, tick_rate: int = TICK_RATE):
+        self.state = state
+        self.buffer = buffer
+        self.tick_rate = tick_rate
+        self.tick = 0
+        self.published_at = time.perf_counter()
+
+    def update(self) -> int:
+        """Restores the latest snapshot if it is new; returns the ticks it advanced."""
+        latest, explosions = self.buffer.take()
+        particles = self.state.particles
+        for explosion in explosions:
+            particles.explode(*explosion)
+        if latest is None or latest[0] == self.tick:
+            return 0
+        tick, self.published_at, data = latest
+        restore(self.state, data)
+
+        advanced = tick - self.tick
+        self.tick = tick
+        return advanced
+
+    def alpha(self, now: float | None = None) -> float:
+        """How far the next tick is due, from 0 (just published) to 1."""
+        now = time.perf_counter() if now is None else now
+        return min(1.0, (now - self.published_at) * self.tick_rate)
@@ -0,0 +1,225 @@
+"""
+Built-in frame profiler.
+
+Code marks the phases of a frame with `with profiler.span("name"):`. Span
+timings go into fixed-size ring buffers covering the last few hundred frames,
+from which the profiler reports per-phase averages, frame-time percentiles,
+dropped frames and input-to-present latency. It can draw those numbers as an
+on-screen overlay and export the buffered frames as Chrome trace-event JSON
+(chrome://tracing, Perfetto).
+
+StartupTimer times the phases between process start and the first frame.
+"""
+import json
+import time
+from contextlib import nullcontext
+import numpy as np
+import pygame
+from src.constants import *
+
+# Frames kept in the ring buffer
+PROFILER_FRAMES = 600
+# Most distinct phase names a profiler tracks
+MAX_PHASES = 16
+
+
+class _Span:
+    """Reusable context manager timing one phase."""
+    __slots__ = ("profiler", "index", "start")
+
+    def __init__(self, profiler: "FrameProfiler", index: int):
+        self.profiler = profiler
+        self.index = index
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._add(self.index, self.start, time.perf_counter())
+        return False
+
+
+class FrameProfiler:
+    """
+    Records per-phase span timings for each frame in ring buffers.
+
+    Attributes:
+        phases (list[str]): Phase names, in order of first use.
+        frames (int): Frames recorded since creation.
+        dropped (int): Frames whose duration exceeded `budget_ms`.
+        overlay (bool): Whether draw_overlay() draws anything.
+    """
+
+    def __init__(self, capacity: int = PROFILER_FRAMES, budget_ms: float = 1000 / TICK_RATE):
+        self.capacity = capacity
+        self.budget_ms = budget_ms
+        self.phases = []
+        self.frames = 0
+        self.dropped = 0
+        self.overlay = False
+
+        self._spans = {}
+        self._origin = time.perf_counter()
+        self._frame_t0 = self._origin
+        # Per frame: phase start (s since origin) and total duration (ms)
+        self._span_start = np.zeros((capacity, MAX_PHASES))
+        self._span_ms = np.zeros((capacity, MAX_PHASES))
+        self._frame_start = np.zeros(capacity)
+        self._frame_ms = np.zeros(capacity)
+        # Input-to-present latency of each frame, NaN for frames without input
+        self._latency_ms = np.full(capacity, np.nan)
+
+    def span(self, name: str) -> _Span:
+        """Returns the context manager timing the named phase."""
+        span = self._spans.get(name)
+        if span is None:
+            if len(self.phases) >= MAX_PHASES:
+                raise ValueError(f"profiler supports at most {MAX_PHASES} phases")
+            span = self._spans[name] = _Span(self, len(self.phases))
+            self.phases.append(name)
+        return span
+
+    def begin_frame(self) -> None:
+        """Starts recording a new frame."""
+        row = self.frames % self.capacity
+        self._span_ms[row] = 0
+        self._latency_ms[row] = np.nan
+        self._frame_t0 = time.perf_counter()
+        self._frame_start[row] = self._frame_t0 - self._origin
+
+    def end_frame(self) -> None:
+        """Closes the current frame."""
+        row = self.frames % self.capacity
+        ms = (time.perf_counter() - self._frame_t0) * 1000
+        self._frame_ms[row] = ms
+        if ms > self.budget_ms:
+            self.dropped += 1
+        self.frames += 1
+
+    def record_latency(self, ms: float | None) -> None:
+        """Records the current frame's input-to-present latency; None is ignored."""
+        if ms is not None:
+            self._latency_ms[self.frames % self.capacity] = ms
+
+    def _add(self, index: int, start: float, end: float) -> None:
+        """Adds a span to the current frame; repeated phases accumulate."""
+        row = self.frames % self.capacity
+        if self._span_ms[row, index] == 0:
+            self._span_start[row, index] = start - self._origin
+        self._span_ms[row, index] += (end - start) * 1000
+
+    def _rows(self) -> np.ndarray:
+        """Ring buffer rows holding completed frames, oldest first."""
+        n = min(self.frames, self.capacity)
+        first = self.frames - n
+        return (np.arange(first, first + n)) % self.capacity
+
+    def stats(self) -> dict:
+        """
+        Summary of the buffered frames: mean ms per phase, p50/p99 frame time,
+        the number of dropped frames and p50/p99/max input-to-present latency
+        over the frames that presented new input.
+        """
+        rows = self._rows()
+        if not len(rows):
+            return {"frames": 0, "phases": {}, "p50_ms": 0.0, "p99_ms": 0.0, "dropped": self.dropped,
+                    "input_frames": 0, "input_p50_ms": 0.0, "input_p99_ms": 0.0, "input_max_ms": 0.0}
+        spans = self._span_ms[rows]
+        frame_ms = self._frame_ms[rows]
+        latency = self._latency_ms[rows]
+        latency = latency[~np.isnan(latency)]
+        has_input = len(latency) > 0
+        return {
+            "frames": len(rows),
+            "phases": {name: float(spans[:, i].mean()) for i, name in enumerate(self.phases)},
+            "p50_ms": float(np.percentile(frame_ms, 50)),
+            "p99_ms": float(np.percentile(frame_ms, 99)),
+            "dropped": self.dropped,
+            "input_frames": len(latency),
+            "input_p50_ms": float(np.percentile(latency, 50)) if has_input else 0.0,
+            "input_p99_ms": float(np.percentile(latency, 99)) if has_input else 0.0,
+            "input_max_ms": float(latency.max()) if has_input else 0.0,
+        }
+
+    def export_chrome_trace(self, path: str) -> None:
+        """Writes the buffered frames as Chrome trace-event JSON."""
+        events = []
+        for row in self._rows():
+            frame_us = self._frame_start[row] * 1e6
+            events.append({"name": "frame", "ph": "X", "pid": 1, "tid": 1,
+                           "ts": frame_us, "dur": self._frame_ms[row] * 1000})
+            for i, name in enumerate(self.phases):
+                ms = self._span_ms[row, i]
+                if ms:
+                    events.append({"name": name, "ph": "X", "pid": 1, "tid": 1,
+                                   "ts": self._span_start[row, i] * 1e6, "dur": ms * 1000})
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def draw_overlay(self, screen: pygame.Surface, font: pygame.font.Font) -> pygame.Rect | None:
+        """Draws the stats in the top-left corner; returns the area drawn."""
+        if not self.overlay:
+            return None
+        stats = self.stats()
+        lines = [f"frame p50 {stats['p50_ms']:.2f} ms  p99 {stats['p99_ms']:.2f} ms  "
+                 f"dropped {stats['dropped']}",
+                 f"input  p50 {stats['input_p50_ms']:.2f} ms  p99 {stats['input_p99_ms']:.2f} ms  "
+                 f"max {stats['input_max_ms']:.2f} ms"]
+        lines += [f"{name:<20} {ms:6.2f} ms" for name, ms in stats["phases"].items()]
+
+        surfaces = [font.render(line, True, COLOR_WHITE) for line in lines]
+        line_h = font.get_linesize()
+        area = pygame.Rect(10, 50, max(s.get_width() for s in surfaces) + 16, line_h * len(lines) + 12)
+        panel = pygame.Surface(area.size, pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+        screen.blit(panel, area)
+        for i, surf in enumerate(surfaces):
+            screen.blit(surf, (area.x + 8, area.y + 6 + i * line_h))
+        return area
+
+
+class NullProfiler:
+    """Profiler stand-in that records nothing."""
+    overlay = False
+    _span = nullcontext()
+
+    def span(self, name: str):
+        return self._span
+
+    def begin_frame(self) -> None:
+        pass
+
+    def end_frame(self) -> None:
+        pass
+
+    def record_latency(self, ms: float | None) -> None:
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class StartupTimer:
+    """
+    Wall-clock time of each startup phase. Each mark() closes the phase
+    that began at the previous mark (or at `start`).
+    """
+
+    def __init__(self, start: float | None = None):
+        self.start = time.perf_counter() if start is None else start
+        self.phases = []
+        self._last = self.start
+
+    def mark(self, name: str) -> None:
+        """Ends the current phase under the given name."""
+        now = time.perf_counter()
+        self.phases.append((name, (now - self._last) * 1000))
+        self._last = now
+
+    def report(self) -> str:
+        """One line per phase plus the total, in milliseconds."""
+        lines = [f"{name:<20} {ms:8.1f} ms" for name, ms in self.phases]
+        lines.append(f"{'total':<20} {(self._last - self.start) * 1000:8.1f} ms")
+        return "\n".join(lines)
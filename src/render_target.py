@@ -0,0 +1,69 @@
+"""
+Low-resolution render target.
+
+The scene can be drawn to a surface 1/scale the size of the game area and
+blown up to the window with nearest-neighbour scaling. The pixel art survives
+integer upscaling unchanged, while fills, sprite blits and starfield writes
+touch scale² fewer pixels. Gameplay always runs in full-size coordinates;
+only the drawing code divides positions by the scale.
+
+Where SDL can create a renderer, the upscale is left to pygame's SCALED
+display mode and happens on the GPU when the frame is presented. Otherwise
+the scene is scaled into a full-size window in software.
+"""
+import pygame
+
+
+class RenderTarget:
+    """
+    The surface the scene is drawn on.
+
+    Attributes:
+        window (pygame.Surface): The surface that gets presented.
+        scale (int): Game-area pixels per drawn pixel along each axis.
+        surface (pygame.Surface): Where the scene is drawn; the window itself
+            at scale 1 or when SDL does the upscaling.
+    """
+
+    def __init__(self, window: pygame.Surface, scale: int = 1, scaled_display: bool = False):
+        """
+        Draws into `window` at 1/scale, upscaling in software, unless
+        `scaled_display` says the window already is the small SCALED display.
+        """
+        self.window = window
+        self.scale = scale
+        if scale == 1 or scaled_display:
+            self.surface = window
+        else:
+            width, height = window.get_size()
+            _check_scale(width, height, scale)
+            # same pixel format as the window so upscaling needs no conversion
+            self.surface = pygame.Surface((width // scale, height // scale), 0, window)
+
+    @classmethod
+    def open(cls, width: int, height: int, scale: int = 1) -> "RenderTarget":
+        """
+        Opens the display for a width x height game area drawn at 1/scale.
+        Above scale 1 the window is a SCALED display of the small surface,
+        falling back to a full-size window and software upscaling.
+        """
+        _check_scale(width, height, scale)
+        if scale > 1:
+            try:
+                small = pygame.display.set_mode((width // scale, height // scale), pygame.SCALED)
+            except pygame.error:
+                # no SDL renderer available: upscale in software instead
+                pass
+            else:
+                return cls(small, scale, scaled_display=True)
+        return cls(pygame.display.set_mode((width, height)), scale)
+
+    def upscale(self) -> None:
+        """Copies the drawn surface to the window, scaled up, if they differ."""
+        if self.surface is not self.window:
+            pygame.transform.scale(self.surface, self.window.get_size(), self.window)
+
+
+def _check_scale(width: int, height: int, scale: int) -> None:
+    if scale < 1 or width % scale or height % scale:
+        raise ValueError(f"render scale {scale} does not evenly divide {width}x{height}")
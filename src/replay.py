@@ -0,0 +1,143 @@
+"""
+Deterministic input recording and replay.
+
+A session is fully determined by its RNG seed and the controls held on each
+simulation tick. Replay stores exactly that: a small header followed by the
+per-tick input bitmasks, run-length encoded, so logs stay a few KB. Feeding
+a replay back through step() reproduces the session tick for tick.
+
+Binary layout (little-endian):
+    magic b"SIRP", u8 version, u16 tick rate, u64 seed, u32 ticks,
+    u32 final score, u16 final level,
+    then (u8 input mask, varint run length) pairs until the end.
+"""
+import struct
+from dataclasses import dataclass, field
+from src.constants import *
+from src.clock import FixedStepClock
+from src.simulation import GameConfig, GameState, Inputs, new_game, step
+
+MAGIC = b"SIRP"
+# 2: hits are pixel-accurate, so version 1 logs no longer reproduce
+VERSION = 2
+_HEADER = struct.Struct("<4sBHQIIH")
+
+
+class ReplayError(ValueError):
+    """Raised for malformed or incompatible replay data."""
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ReplayError("truncated run length")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+@dataclass
+class Replay:
+    """
+    A recorded session: seed, tick rate and one input bitmask per tick.
+    `score` and `level` hold the outcome so playback can be verified.
+    """
+    seed: int
+    tick_rate: int = TICK_RATE
+    masks: bytearray = field(default_factory=bytearray)
+    score: int = 0
+    level: int = 1
+
+    def __len__(self) -> int:
+        return len(self.masks)
+
+    def record(self, inputs: Inputs) -> None:
+        """Appends one tick's controls."""
+        self.masks.append(inputs.to_mask())
+
+    def inputs(self):
+        """Yields the recorded Inputs, one per tick."""
+        # Only 32 distinct masks exist, so share the Inputs objects
+        decoded = {}
+        for mask in self.masks:
+            inputs = decoded.get(mask)
+            if inputs is None:
+                inputs = decoded[mask] = Inputs.from_mask(mask)
+            yield inputs
+
+    def finish(self, state: GameState) -> None:
+        """Stores the session outcome at the end of recording."""
+        self.score = state.score
+        self.level = state.level
+
+    def to_bytes(self) -> bytes:
+        """Serializes to the compact binary format."""
+        out = bytearray(_HEADER.pack(MAGIC, VERSION, self.tick_rate, self.seed,
+                                     len(self.masks), self.score, self.level))
+        i = 0
+        n = len(self.masks)
+        while i < n:
+            mask = self.masks[i]
+            run = 1
+            while i + run < n and self.masks[i + run] == mask:
+                run += 1
+            out.append(mask)
+            _write_varint(out, run)
+            i += run
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Replay":
+        """Parses the binary format."""
+        if len(data) < _HEADER.size:
+            raise ReplayError("truncated header")
+        magic, version, tick_rate, seed, ticks, score, level = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ReplayError("not a replay file")
+        if version != VERSION:
+            raise ReplayError(f"unsupported replay version {version}")
+
+        masks = bytearray()
+        pos = _HEADER.size
+        while pos < len(data):
+            mask = data[pos]
+            run, pos = _read_varint(data, pos + 1)
+            masks.extend(bytes([mask]) * run)
+        if len(masks) != ticks:
+            raise ReplayError(f"expected {ticks} ticks, found {len(masks)}")
+        return cls(seed, tick_rate, masks, score, level)
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> "Replay":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+def play_headless(replay: Replay, config: GameConfig | None = None) -> GameState:
+    """
+    Runs a replay through the simulation as fast as possible, without a
+    display, and returns the final state.
+    """
+    state = new_game(config, seed=replay.seed)
+    ticker = FixedStepClock(replay.tick_rate)
+    for inputs in replay.inputs():
+        if not state.running:
+            break
+        step(state, inputs, ticker.tick())
+    return state
@@ -0,0 +1,305 @@
+"""
+Scenes: one object per screen of the game, each owning its per-tick
+presentation update and its rendering.
+
+The simulation still decides which screen is showing (state.mode and the
+level banner); Scenes maps that onto a scene object and switches between
+them. Screens whose content is frozen (the menu, the level banner, game over)
+composite that content once into a backdrop surface and per frame only blit
+it over the starfield, drawing nothing else but what still moves.
+
+Backdrops are colorkeyed on the background color with RLE acceleration, so
+blitting one costs a fraction of redrawing the sprites and text on it.
+"""
+from dataclasses import dataclass
+import pygame
+from src.constants import *
+from src.text import TextCache, HudText
+from src.dirty import DirtyRects
+from src.bullets import ENEMY
+from src.simulation import GameState, MENU, GAMEOVER
+
+
+@dataclass
+class Hud:
+    """
+    Text used by the renderer: the shared text cache plus the in-game labels
+    that only re-render when their values change.
+    """
+    text: TextCache
+    lives: HudText
+    score: HudText
+    level: HudText
+
+
+def make_hud(text: TextCache, scale: int = 1) -> Hud:
+    """Creates the HUD labels on top of a text cache, sized for the render scale."""
+    return Hud(
+        text,
+        lives=HudText(text, "Lives: {}", 36 // scale, COLOR_WHITE),
+        score=HudText(text, "Score: {}", 36 // scale, COLOR_WHITE),
+        level=HudText(text, "Level: {}", 36 // scale, COLOR_WHITE),
+    )
+
+
+class _Rects(list):
+    """Collects drawn regions with the same add() as DirtyRects."""
+
+    def add(self, rect: pygame.Rect | None) -> None:
+        if rect:
+            self.append(rect)
+
+
+def mark_dirty(dirty: DirtyRects | None, rect: pygame.Rect | None) -> None:
+    """Records a drawn region when dirty-rect rendering is on."""
+    if dirty is not None:
+        dirty.add(rect)
+
+
+def _mark_entities(dirty: DirtyRects | None, state: GameState, fleet: bool = True) -> None:
+    """
+    Records the bounds of the ship, bullets and (optionally) the fleet.
+    Moving objects are covered from their previous to their current tick
+    position, since interpolation may draw them anywhere in between.
+    """
+    if dirty is None:
+        return
+    # Sprites draw one pixel past their nominal size
+    ship = state.spaceship
+    dirty.add(pygame.Rect(min(ship.x, ship.prev_x), ship.y,
+                          ship.width + 1 + abs(ship.x - ship.prev_x), ship.height + 1))
+    if fleet:
+        br = state.fleet.bounding_rect()
+        if br:
+            dirty.add(pygame.Rect(br.x, br.y, br.width + 1, br.height + 1))
+    bullets = state.bullets
+    for i in bullets.indices():
+        rect = bullets.rect(i)
+        dirty.add(rect.union(rect.move(0, int(bullets.prev_y[i]) - rect.y)))
+
+
+def _draw_hud(screen: pygame.Surface, state: GameState, hud: Hud, dirty, scale: int) -> None:
+    """Draws lives, score and level."""
+    area = screen.get_rect()
+    margin = 10 // scale
+    mark_dirty(dirty, screen.blit(hud.lives.render(state.spaceship.lives), (margin, area.bottom - 40 // scale)))
+    mark_dirty(dirty, screen.blit(hud.score.render(state.score), (margin, margin)))
+
+    level_surf = hud.level.render(state.level)
+    # align level to top right
+    level_rect = level_surf.get_rect(topright=(area.right - margin, margin))
+    mark_dirty(dirty, screen.blit(level_surf, level_rect))
+
+
+class Scene:
+    """
+    One screen of the game. `update` runs once per simulation tick for
+    purely visual state; `draw` renders everything but the starfield.
+    """
+
+    def enter(self, state: GameState) -> None:
+        """Called when the scene becomes the current one."""
+
+    def update(self, state: GameState) -> None:
+        """Advances the scene's cosmetic effects by one tick."""
+        state.particles.update()
+
+    def draw(self, screen: pygame.Surface, state: GameState, hud: Hud, dirty: DirtyRects | None = None,
+             alpha: float = 1.0, scale: int = 1) -> None:
+        """
+        Renders the scene. With `dirty` set, the bounds of everything drawn
+        are recorded on it. `alpha` is the interpolation factor between the
+        last two ticks; `scale` above 1 draws onto a 1/scale render target.
+        """
+        raise NotImplementedError
+
+
+class StaticScene(Scene):
+    """
+    A scene whose content only changes with `backdrop_key`: `compose` draws
+    it once into a cached backdrop, and each frame blits the backdrop and
+    calls `draw_dynamic` for whatever still moves on top of it.
+    """
+
+    def __init__(self):
+        self.backdrop = None
+        self.rects = []
+        self._key = None
+
+    def backdrop_key(self, state: GameState) -> tuple:
+        """Values the static content depends on; the backdrop is rebuilt when they change."""
+        return ()
+
+    def compose(self, backdrop: pygame.Surface, state: GameState, hud: Hud, rects: _Rects, scale: int) -> None:
+        """Draws the static content, recording its bounds on `rects`."""
+        raise NotImplementedError
+
+    def draw_dynamic(self, screen: pygame.Surface, state: GameState, hud: Hud, dirty: DirtyRects | None,
+                     alpha: float, scale: int) -> None:
+        """Draws the moving parts over the backdrop."""
+
+    def draw(self, screen: pygame.Surface, state: GameState, hud: Hud, dirty: DirtyRects | None = None,
+             alpha: float = 1.0, scale: int = 1) -> None:
+        key = (screen.get_size(), scale, self.backdrop_key(state))
+        if key != self._key:
+            with state.profiler.span("backdrop"):
+                self._build(screen, state, hud, scale)
+            self._key = key
+        screen.blit(self.backdrop, (0, 0))
+        for rect in self.rects:
+            mark_dirty(dirty, rect)
+        self.draw_dynamic(screen, state, hud, dirty, alpha, scale)
+
+    def _build(self, screen: pygame.Surface, state: GameState, hud: Hud, scale: int) -> None:
+        # A fresh surface each time: drawing into an RLE-encoded one is slow
+        # and loses antialiased edges. Same pixel format as the screen, so
+        # blitting needs no conversion.
+        backdrop = pygame.Surface(screen.get_size(), 0, screen)
+        rects = _Rects()
+        self.compose(backdrop, state, hud, rects, scale)
+        # RLE skips the transparent runs wholesale when blitting
+        backdrop.set_colorkey(COLOR_BLACK, pygame.RLEACCEL)
+        self.backdrop = backdrop
+        self.rects = rects
+
+
+class MenuScene(StaticScene):
+    """Title screen: entirely static."""
+
+    def update(self, state: GameState) -> None:
+        pass
+
+    def compose(self, backdrop, state, hud, rects, scale):
+        text = hud.text
+        area = backdrop.get_rect()
+        title_surf = text.render("SPACE INVADERS", 120 // scale, COLOR_GREEN)
+        title_rect = title_surf.get_rect(center=(area.centerx, area.height // 3))
+        rects.add(backdrop.blit(title_surf, title_rect))
+
+        instr_surf = text.render("Press SPACE to Start", 48 // scale, COLOR_WHITE)
+        instr_rect = instr_surf.get_rect(center=area.center)
+        rects.add(backdrop.blit(instr_surf, instr_rect))
+
+
+class PlayingScene(Scene):
+    """Gameplay: everything moves, so everything is drawn every frame."""
+
+    def draw(self, screen, state, hud, dirty=None, alpha=1.0, scale=1):
+        profiler = state.profiler
+        # Draw fleet and enemy bullets
+        with profiler.span("fleet draw"):
+            state.fleet.draw(screen, scale)
+            state.bullets.draw(screen, COLOR_ORANGE, ENEMY, alpha, scale)
+
+        with profiler.span("particles"):
+            mark_dirty(dirty, state.particles.draw(screen, scale))
+
+        # Draw player
+        state.spaceship.draw_ship(screen, alpha, scale)
+        _mark_entities(dirty, state)
+
+        with profiler.span("HUD"):
+            _draw_hud(screen, state, hud, dirty, scale)
+
+
+class LevelBannerScene(StaticScene):
+    """
+    Between levels: the banner and HUD are fixed (there are no enemies to
+    score on or to shoot back), while the ship can still move and fire.
+    """
+
+    def backdrop_key(self, state):
+        return state.level, state.score, state.spaceship.lives
+
+    def compose(self, backdrop, state, hud, rects, scale):
+        area = backdrop.get_rect()
+        lvl_surf = hud.text.render(f"LEVEL {state.level}", 100 // scale, COLOR_YELLOW)
+        lvl_rect = lvl_surf.get_rect(center=area.center)
+        rects.add(backdrop.blit(lvl_surf, lvl_rect))
+        _draw_hud(backdrop, state, hud, rects, scale)
+
+    def draw_dynamic(self, screen, state, hud, dirty, alpha, scale):
+        with state.profiler.span("particles"):
+            mark_dirty(dirty, state.particles.draw(screen, scale))
+        state.spaceship.draw_ship(screen, alpha, scale)
+        _mark_entities(dirty, state, fleet=False)
+
+
+class GameOverScene(StaticScene):
+    """
+    Game over: the fleet, bullets and ship are frozen under the overlay;
+    only the last explosion's debris still moves.
+    """
+
+    def enter(self, state):
+        # Each game ends with its own frozen positions, which the key
+        # does not capture
+        self._key = None
+
+    def backdrop_key(self, state):
+        return state.level, state.score
+
+    def compose(self, backdrop, state, hud, rects, scale):
+        # Frozen game state, at its final tick positions
+        state.fleet.draw(backdrop, scale)
+        state.bullets.draw(backdrop, COLOR_ORANGE, ENEMY, 1.0, scale)
+        state.spaceship.draw_ship(backdrop, 1.0, scale)
+        _mark_entities(rects, state)
+
+        # Overlay
+        text = hud.text
+        area = backdrop.get_rect()
+        go_surf = text.render("GAME OVER", 120 // scale, COLOR_RED)
+        go_rect = go_surf.get_rect(center=(area.centerx, area.centery - 40 // scale))
+        rects.add(backdrop.blit(go_surf, go_rect))
+
+        info = text.render("Press R to restart or Q to Quit", 36 // scale, COLOR_WHITE)
+        info_rect = info.get_rect(center=(area.centerx, area.centery + 40 // scale))
+        rects.add(backdrop.blit(info, info_rect))
+
+        final_score = text.render(f"Final Score: {state.score}", 36 // scale, COLOR_YELLOW)
+        fs_rect = final_score.get_rect(center=(area.centerx, area.centery + 80 // scale))
+        rects.add(backdrop.blit(final_score, fs_rect))
+
+    def draw_dynamic(self, screen, state, hud, dirty, alpha, scale):
+        with state.profiler.span("particles"):
+            mark_dirty(dirty, state.particles.draw(screen, scale))
+
+
+class Scenes:
+    """
+    The scene state machine: follows the simulation's mode and level banner
+    and keeps one instance of each scene, so the menu and banner backdrops
+    survive switching back and forth. Game over recomposes on every entry.
+    """
+
+    def __init__(self):
+        self.menu = MenuScene()
+        self.playing = PlayingScene()
+        self.banner = LevelBannerScene()
+        self.game_over = GameOverScene()
+        self.current = None
+
+    def select(self, state: GameState) -> Scene:
+        """Returns the scene for the state, entering it if it changed."""
+        if state.mode == MENU:
+            scene = self.menu
+        elif state.mode == GAMEOVER:
+            scene = self.game_over
+        elif state.in_level_transition:
+            scene = self.banner
+        else:
+            scene = self.playing
+        if scene is not self.current:
+            self.current = scene
+            scene.enter(state)
+        return scene
+
+    def update(self, state: GameState) -> None:
+        """Runs the current scene's per-tick update."""
+        self.select(state).update(state)
+
+    def draw(self, screen: pygame.Surface, state: GameState, hud: Hud, dirty: DirtyRects | None = None,
+             alpha: float = 1.0, scale: int = 1) -> None:
+        """Renders the current scene."""
+        self.select(state).draw(screen, state, hud, dirty, alpha, scale)
@@ -0,0 +1,180 @@
+"""
+Authoritative co-op server.
+
+    python -m src.server [--host 127.0.0.1] [--port 8765] [--stats-every 5]
+
+Runs one CoopState on a fixed tick. Each client sends its input mask every
+tick with a sequence number; the server steps the shared session with the
+latest mask from every player, then broadcasts a single delta (see
+src.netstate) to all of them, tagged with the last input sequence it applied
+for that client. A client that joins mid-game receives a keyframe first.
+"""
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from src.constants import *
+from src.clock import FixedStepClock
+from src.coop import new_coop_game, add_player, remove_player, step_coop
+from src.netstate import (HELLO, INPUT, WorldView, NetMetrics, ProtocolError, capture, encode_delta,
+                          read_message, parse_input, welcome_message, delta_message, check_config,
+                          MAX_CLIENT_MESSAGE)
+from src.simulation import GameConfig, Inputs
+
+DEFAULT_PORT = 8765
+# Clients whose unsent data exceeds this are too slow to keep up and get dropped
+MAX_CLIENT_BACKLOG = 256 * 1024
+
+
+@dataclass
+class _Client:
+    player: int
+    writer: asyncio.StreamWriter
+    mask: int = 0
+    ack: int = 0
+
+
+class CoopServer:
+    """
+    Serves one co-op session over TCP.
+
+    Attributes:
+        state (CoopState): The authoritative session.
+        metrics (NetMetrics): Per tick: "tick_ms" (step, capture and encode
+            time), "delta_bytes" (bytes sent to each client) and "sent_bytes"
+            (bytes sent to all clients).
+    """
+
+    def __init__(self, config: GameConfig | None = None, tick_rate: int = TICK_RATE,
+                 seed: int | None = None):
+        self.state = new_coop_game(config, seed)
+        check_config(self.state.config)
+        self.tick_rate = tick_rate
+        self.metrics = NetMetrics()
+        self.clients = {}
+        self._ticker = FixedStepClock(tick_rate)
+        self._fleet = self.state.fleet
+        self._fleet_id = 0
+        self._view = capture(self.state, self._fleet_id)
+        self._server = None
+        self._ticks = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> int:
+        """Starts listening and ticking; returns the bound port (useful with port 0)."""
+        self._server = await asyncio.start_server(self._serve_client, host, port)
+        self._ticks = asyncio.create_task(self._run_ticks())
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        """Stops ticking and disconnects every client."""
+        if self._ticks is not None:
+            self._ticks.cancel()
+        for client in list(self.clients.values()):
+            client.writer.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def tick(self) -> None:
+        """
+        Steps the session once and sends the resulting delta to every client.
+        The session waits while nobody is connected.
+        """
+        if not self.clients:
+            return
+        start = time.perf_counter()
+        state = self.state
+        inputs = {player: Inputs.from_mask(client.mask) for player, client in self.clients.items()}
+        step_coop(state, inputs, self._ticker.tick())
+        if state.fleet is not self._fleet:
+            self._fleet = state.fleet
+            self._fleet_id += 1
+        view = capture(state, self._fleet_id)
+        delta = encode_delta(self._view, view)
+        self._view = view
+        self.metrics.add("tick_ms", (time.perf_counter() - start) * 1000)
+
+        sent = 0
+        for client in list(self.clients.values()):
+            msg = delta_message(client.ack, delta)
+            client.writer.write(msg)
+            sent += len(msg)
+            if client.writer.transport.get_write_buffer_size() > MAX_CLIENT_BACKLOG:
+                client.writer.close()
+        self.metrics.add("delta_bytes", sent / len(self.clients))
+        self.metrics.add("sent_bytes", sent)
+
+    async def _run_ticks(self) -> None:
+        loop = asyncio.get_running_loop()
+        period = 1 / self.tick_rate
+        next_tick = loop.time()
+        while True:
+            self.tick()
+            next_tick += period
+            delay = next_tick - loop.time()
+            if delay < 0:
+                # fell behind: carry on from now rather than bursting to catch up
+                next_tick = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        client = None
+        try:
+            msg_type, _ = await read_message(reader, MAX_CLIENT_MESSAGE)
+            if msg_type != HELLO:
+                return
+            player = add_player(self.state)
+            if player is None:
+                return
+            client = self.clients[player] = _Client(player, writer)
+            writer.write(welcome_message(player, self.tick_rate, self.state.config))
+            keyframe = encode_delta(WorldView(len(self._view.bullets)), self._view)
+            writer.write(delta_message(0, keyframe))
+
+            while True:
+                msg_type, data = await read_message(reader, MAX_CLIENT_MESSAGE)
+                if msg_type == INPUT:
+                    client.ack, client.mask = parse_input(data)
+        except (asyncio.IncompleteReadError, ConnectionError, ProtocolError):
+            pass
+        finally:
+            if client is not None:
+                del self.clients[client.player]
+                remove_player(self.state, client.player)
+            writer.close()
+
+
+async def serve(host: str, port: int, tick_rate: int, stats_every: float) -> None:
+    server = CoopServer(tick_rate=tick_rate)
+    port = await server.start(host, port)
+    print(f"Serving co-op on {host}:{port} at {tick_rate} Hz")
+    try:
+        while True:
+            await asyncio.sleep(stats_every)
+            print(json.dumps({"players": sorted(server.clients), **server.metrics.stats()}))
+    finally:
+        await server.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.server", description="Host a co-op session")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE)
+    parser.add_argument("--stats-every", type=float, default=5.0, metavar="SECONDS",
+                        help="how often to print throughput metrics")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.tick_rate, args.stats_every))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""
+Display-free simulation core.
+
+GameState holds everything the game logic needs and step() advances it by one
+tick from a set of Inputs. Nothing in here touches the pygame display, the
+keyboard or the wall clock, so the game can be simulated headless.
+"""
+import random
+from dataclasses import dataclass, field
+import pygame
+from src.constants import *
+import src.sprites as sprites
+import src.collision as collision
+from src.entities import Spaceship, Fleet
+from src.array_fleet import ArrayFleet
+from src.bullets import BulletPool, BULLET_CAPACITY, ENEMY
+from src.clock import ManualClock
+from src.profiler import NULL_PROFILER
+from src.particles import NULL_PARTICLES
+
+# Game modes
+MENU = "MENU"
+PLAYING = "PLAYING"
+GAMEOVER = "GAMEOVER"
+
+# Input bits, as stored in replays
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_FIRE = 4
+INPUT_RESTART = 8
+INPUT_QUIT = 16
+
+
+@dataclass
+class GameConfig:
+    """
+    Tunable parameters for a game session.
+    """
+    screen_width: int = SCREEN_WIDTH
+    screen_height: int = SCREEN_HEIGHT
+
+    # Player ship
+    ship_width: int = 50
+    ship_height: int = 30
+    ship_padding: int = 10
+
+    # Enemy fleet
+    enemy_cols: int = 11
+    enemy_rows: int = 5
+    enemy_w: int = 64
+    enemy_h: int = 48
+    enemy_h_spacing: int = 20
+    enemy_v_spacing: int = 18
+    fleet_start_y: int = 100
+    step_interval: int = 600
+    # "objects" (Fleet) or "numpy" (ArrayFleet, for very large formations)
+    fleet_backend: str = "objects"
+
+    # Enemy fire
+    bullet_capacity: int = BULLET_CAPACITY
+    enemy_bullet_speed: int = 5
+    enemy_shot_interval: int = 1500
+    # Bullets must touch a sprite's drawn pixels, not just its bounding box
+    pixel_collision: bool = True
+
+    # Delay between clearing a fleet and spawning the next one (ms)
+    level_transition_delay: int = 2000
+
+    @property
+    def fleet_start_x(self) -> int:
+        """X-coordinate that centers the fleet horizontally."""
+        fleet_width = self.enemy_cols * self.enemy_w + (self.enemy_cols - 1) * self.enemy_h_spacing
+        return (self.screen_width - fleet_width) // 2
+
+
+@dataclass(frozen=True)
+class Inputs:
+    """
+    The player's controls for a single tick.
+    """
+    left: bool = False
+    right: bool = False
+    fire: bool = False      # Space: shoot / start game
+    restart: bool = False   # R: restart on game over
+    quit: bool = False      # Q: quit on game over
+
+    def to_mask(self) -> int:
+        """Packs the controls into a bitmask of INPUT_* flags."""
+        return ((INPUT_LEFT if self.left else 0) | (INPUT_RIGHT if self.right else 0)
+                | (INPUT_FIRE if self.fire else 0) | (INPUT_RESTART if self.restart else 0)
+                | (INPUT_QUIT if self.quit else 0))
+
+    @classmethod
+    def from_mask(cls, mask: int) -> "Inputs":
+        """Unpacks a bitmask of INPUT_* flags."""
+        return cls(left=bool(mask & INPUT_LEFT), right=bool(mask & INPUT_RIGHT),
+                   fire=bool(mask & INPUT_FIRE), restart=bool(mask & INPUT_RESTART),
+                   quit=bool(mask & INPUT_QUIT))
+
+
+@dataclass
+class GameState:
+    """
+    Complete state of a game session.
+
+    Attributes:
+        config (GameConfig): Session parameters.
+        spaceship (Spaceship): The player's ship.
+        fleet (Fleet): The current enemy fleet.
+        bullets (BulletPool): Player and enemy bullets.
+        mode (str): MENU, PLAYING or GAMEOVER.
+        clock (ManualClock): Simulation clock shared with the entities;
+            only step() advances it.
+        profiler: Receives timing spans for the simulation phases.
+        particles: Explosion effects, shared with the ship and every fleet.
+    """
+    config: GameConfig
+    spaceship: Spaceship
+    fleet: Fleet | ArrayFleet
+    bullets: BulletPool
+    mode: str = MENU
+    score: int = 0
+    level: int = 1
+    level_transition_start: int = 0
+    last_enemy_shot: int = 0
+    running: bool = True
+    rng: random.Random = field(default_factory=random.Random)
+    clock: ManualClock = field(default_factory=ManualClock)
+    profiler: object = NULL_PROFILER
+    particles: object = NULL_PARTICLES
+
+    @property
+    def time(self) -> int:
+        """Simulation time in milliseconds."""
+        return self.clock.now()
+
+    @property
+    def in_level_transition(self) -> bool:
+        """True while waiting to spawn the next level's fleet."""
+        return self.level_transition_start > 0
+
+
+FLEET_BACKENDS = {
+    "objects": Fleet,
+    "numpy": ArrayFleet,
+}
+
+
+def new_fleet(config: GameConfig, clock: ManualClock, particles=NULL_PARTICLES) -> Fleet | ArrayFleet:
+    """Creates a fresh enemy fleet laid out according to the config."""
+    fleet_cls = FLEET_BACKENDS[config.fleet_backend]
+    return fleet_cls(config.enemy_cols, config.enemy_rows, config.enemy_w, config.enemy_h,
+                     config.enemy_h_spacing, config.enemy_v_spacing,
+                     config.fleet_start_x, config.fleet_start_y, config.screen_width,
+                     step_interval=config.step_interval, clock=clock, particles=particles)
+
+
+def new_game(config: GameConfig | None = None, seed: int | None = None,
+             particles=NULL_PARTICLES) -> GameState:
+    """
+    Builds the initial game state, sitting on the menu. `particles` receives
+    the explosions of the ship and of every fleet.
+    """
+    config = config or GameConfig()
+    clock = ManualClock()
+
+    # Center the ship horizontally, just above the bottom edge
+    start_x = (config.screen_width // 2) - (config.ship_width // 2)
+    start_y = config.screen_height - config.ship_height - config.ship_padding
+    bullets = BulletPool(config.bullet_capacity)
+    spaceship = Spaceship("Falcon", 100, x=start_x, y=start_y,
+                          width=config.ship_width, height=config.ship_height,
+                          bullets=bullets, clock=clock, particles=particles)
+
+    return GameState(config, spaceship, new_fleet(config, clock, particles), bullets,
+                     rng=random.Random(seed), clock=clock, particles=particles)
+
+
+def revive_ship(ship: Spaceship, now: int) -> None:
+    """Puts a ship back at its spawn point with full lives, briefly invulnerable."""
+    ship.lives = 3
+    ship.health = 100
+    ship.dead = False
+    ship.invulnerable = True
+    ship.invulnerable_start = now
+    ship.x = ship.spawn_x
+    ship.y = ship.spawn_y
+    ship.prev_x = ship.x
+
+
+def reset_game(state: GameState) -> None:
+    """Starts a new game from level 1, keeping the session config and RNG."""
+    revive_ship(state.spaceship, state.time)
+
+    state.mode = PLAYING
+    state.score = 0
+    state.level = 1
+    state.level_transition_start = 0
+    state.fleet = new_fleet(state.config, state.clock, state.particles)
+    state.bullets.clear()
+
+
+def step(state: GameState, inputs: Inputs, dt: int) -> None:
+    """
+    Advances the simulation by one tick of dt milliseconds.
+    Movement speeds are per tick, so ticks should be of a fixed length.
+    """
+    state.clock.advance(dt)
+
+    # Remember where things were for render interpolation
+    state.spaceship.prev_x = state.spaceship.x
+    state.bullets.save_positions()
+
+    if state.mode == MENU:
+        if inputs.fire:
+            reset_game(state)
+
+    elif state.mode == PLAYING:
+        _step_playing(state, inputs)
+
+    elif state.mode == GAMEOVER:
+        if inputs.restart:
+            reset_game(state)
+        if inputs.quit:
+            state.running = False
+
+
+def _step_playing(state: GameState, inputs: Inputs) -> None:
+    """Runs one tick of gameplay: player, fleet, bullets, scoring and levels."""
+    ship = state.spaceship
+    step_ships(state, [(ship, inputs)])
+
+    if ship.dead:
+        state.mode = GAMEOVER
+
+
+def step_ships(state, controls: list[tuple[Spaceship, Inputs]]) -> None:
+    """
+    Runs one tick of gameplay for any number of player ships sharing the
+    state's fleet and bullet pool (one, except in co-op): moves each ship by
+    its controls, then plays out the level transition or the combat. Deciding
+    when the game is over is left to the caller.
+    """
+    for ship, inputs in controls:
+        _step_ship(state, ship, inputs)
+
+    ships = [ship for ship, _ in controls]
+    if state.in_level_transition:
+        _step_level_transition(state)
+    else:
+        _step_combat(state, ships)
+
+    for ship in ships:
+        ship.update_invulnerability()
+
+
+def _step_ship(state: GameState, ship: Spaceship, inputs: Inputs) -> None:
+    """Moves a player ship and its bullets, and fires on request."""
+    with state.profiler.span("bullet integration"):
+        ship.move(inputs.left, inputs.right)
+    # keep ship onscreen
+    ship.x = max(0, min(ship.x, state.config.screen_width - ship.width))
+
+    # Player firing only when pressing Space
+    if inputs.fire:
+        ship.shoot()
+
+
+def _step_level_transition(state: GameState) -> None:
+    """Spawns the next level's fleet once the transition delay has passed."""
+    config = state.config
+    # Delay before next level
+    if state.time - state.level_transition_start > config.level_transition_delay:
+        state.fleet = new_fleet(config, state.clock, state.particles)
+        # Increase difficulty
+        state.fleet.step_interval = max(100, config.step_interval - (state.level - 1) * 50)
+        state.level_transition_start = 0
+
+
+def _step_combat(state: GameState, ships) -> None:
+    """
+    Fleet movement, enemy fire, bullet collisions and level completion.
+    `ships` are the player ships in play (one, except in co-op).
+    """
+    config = state.config
+    fleet = state.fleet
+    bullets = state.bullets
+    now = state.time
+    profiler = state.profiler
+
+    # Fleet movement/animation
+    with profiler.span("fleet update"):
+        fleet.update()
+
+    # Enemy shooting (choose bottom-most enemy in a random column)
+    with profiler.span("enemy fire"):
+        if now - state.last_enemy_shot > config.enemy_shot_interval:
+            shooter = fleet.pick_shooter(state.rng)
+            if shooter:
+                bw, bh = ENEMY_BULLET_WIDTH, ENEMY_BULLET_HEIGHT
+                bx = shooter.rect.x + shooter.rect.width // 2 - bw // 2
+                by = shooter.rect.bottom
+                bullets.spawn(bx, by, bw, bh, config.enemy_bullet_speed, ENEMY)
+            state.last_enemy_shot = now
+
+    # Update enemy bullets, dropping those that fell off the bottom
+    with profiler.span("bullet integration"):
+        bullets.integrate(ENEMY)
+        bullets.cull(ENEMY, max_y=config.screen_height)
+
+    with profiler.span("collision"):
+        for ship in ships:
+            if ship.dead:
+                continue
+            ship_rect = pygame.Rect(ship.x, ship.y, ship.width, ship.height)
+            for i in bullets.collide(ship_rect, ENEMY):
+                if config.pixel_collision and not collision.rect_hits_sprite(
+                        bullets.rect(i), sprites.PLAYER_SHIP, ship.x, ship.y, ship.width, ship.height):
+                    continue
+                # enemy hit should be lethal
+                ship.take_damage(100)
+                bullets.release(int(i))
+
+        # Check player bullets vs enemies
+        for ship in ships:
+            if bullets.count(ship.owner):
+                for i in bullets.indices(ship.owner):
+                    if fleet.hit_enemy(bullets.rect(i), config.pixel_collision):
+                        state.score += 10 * state.level  # Points increase with level
+                        bullets.release(int(i))
+
+    # Check for level complete
+    if not fleet.any_alive():
+        state.level += 1
+        bullets.clear()
+        state.level_transition_start = now
@@ -0,0 +1,285 @@
+"""
+Compact binary snapshots of the full game state.
+
+A snapshot holds everything step() reads or writes: the game timers, score
+and mode, the ship, the fleet's positions, alive and animation bits, every
+live bullet with the pool's free list, and the RNG. Restoring one into a
+GameState built from the same GameConfig continues the game exactly as the
+original would have. Snapshots are a few KB of packed structs and arrays, so
+hundreds of them can be kept in memory for rollback.
+
+Binary layout (little-endian):
+    header: magic b"SISS", u8 version, u8 mode, u8 flags, u8 RNG gauss flag
+    game:   i64 time, u32 score, u16 level, i64 level transition start,
+            i64 last enemy shot
+    ship:   i32 x, i32 y, i32 prev x, i32 health, u16 lives,
+            i64 invulnerable start, i64 last shot time
+    fleet:  u16 rows, u16 cols, i8 direction, u32 step interval,
+            i64 last step, i32 grid origin x, i32 grid origin y,
+            then i32 x[n], i32 y[n], alive bits, frame bits (n = rows * cols)
+    bullets: u32 capacity (at most 65536), u32 live count, u32 untouched
+            free slots, u32 other free slots, then the live slots (u16 slot,
+            i32 x, y, w, h, vy, prev y, i16 owner), then the other free
+            slots (u16)
+    rng:    625 u32 Mersenne Twister words, f64 gauss_next
+"""
+import struct
+from array import array
+from collections import Counter
+import numpy as np
+from src.bullets import BulletPool
+from src.simulation import GameState, new_fleet, MENU, PLAYING, GAMEOVER
+
+MAGIC = b"SISS"
+VERSION = 1
+
+# Ticks of history kept by a RollbackBuffer by default
+ROLLBACK_TICKS = 120
+
+_HEADER = struct.Struct("<4sBBBB")
+_GAME = struct.Struct("<qIHqq")
+_SHIP = struct.Struct("<iiiiHqq")
+_FLEET = struct.Struct("<HHbIqii")
+_BULLETS = struct.Struct("<IIII")
+_BULLET = np.dtype([("slot", "<u2"), ("x", "<i4"), ("y", "<i4"), ("w", "<i4"), ("h", "<i4"),
+                    ("vy", "<i4"), ("prev_y", "<i4"), ("owner", "<i2")])
+# Slot ids are stored as u16
+_MAX_BULLET_SLOTS = 1 << 16
+_RNG_WORDS = 625
+_GAUSS = struct.Struct("<d")
+
+_MODES = (MENU, PLAYING, GAMEOVER)
+
+# Header flags
+_RUNNING = 1
+_SHIP_DEAD = 2
+_SHIP_INVULNERABLE = 4
+
+
+class SnapshotError(ValueError):
+    """Raised for malformed or incompatible snapshot data."""
+
+
+def _fleet_arrays(fleet) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """(x, y, alive, frame) of every enemy, in row-major order."""
+    if isinstance(getattr(fleet, "x", None), np.ndarray):
+        return fleet.x, fleet.y, fleet.alive, fleet.frame
+    fields = [(e.rect.x, e.rect.y, e.alive, e.frame) for e in fleet.all_enemies()]
+    x, y, alive, frame = zip(*fields)
+    return (np.array(x, dtype=np.int32), np.array(y, dtype=np.int32),
+            np.array(alive, dtype=bool), np.array(frame, dtype=np.uint8))
+
+
+def _load_fleet(fleet, x: np.ndarray, y: np.ndarray, alive: np.ndarray, frame: np.ndarray) -> None:
+    """Writes enemy positions, alive flags and frames back into a fleet."""
+    if isinstance(getattr(fleet, "x", None), np.ndarray):
+        fleet.x[:] = x
+        fleet.y[:] = y
+        fleet.alive[:] = alive
+        fleet.frame[:] = frame
+    else:
+        for e, ex, ey, ealive, eframe in zip(fleet.all_enemies(), x.tolist(), y.tolist(),
+                                              alive.tolist(), frame.tolist()):
+            e.rect.topleft = (ex, ey)
+            e.alive = ealive
+            e.frame = eframe
+    fleet.occupancy.recount(alive.reshape(fleet.rows, fleet.cols))
+    fleet.version += 1
+
+
+def _free_list(bullets: BulletPool) -> tuple[int, np.ndarray]:
+    """
+    Splits the pool's free list into the length of its untouched prefix
+    (capacity-1, capacity-2, ... as after clear()) and the remaining slots.
+    """
+    free = np.frombuffer(array("H", bullets._free), dtype=np.uint16)
+    descending = np.arange(bullets.capacity - 1, bullets.capacity - 1 - len(free), -1)
+    mismatch = free != descending
+    run = int(mismatch.argmax()) if mismatch.any() else len(free)
+    return run, free[run:]
+
+
+def snapshot(state: GameState) -> bytes:
+    """Serializes the game state."""
+    ship = state.spaceship
+    fleet = state.fleet
+    bullets = state.bullets
+    rng_version, words, gauss = state.rng.getstate()
+
+    flags = ((_RUNNING if state.running else 0) | (_SHIP_DEAD if ship.dead else 0)
+             | (_SHIP_INVULNERABLE if ship.invulnerable else 0))
+    out = bytearray(_HEADER.pack(MAGIC, VERSION, _MODES.index(state.mode), flags,
+                                 gauss is not None))
+    out += _GAME.pack(state.time, state.score, state.level, state.level_transition_start,
+                      state.last_enemy_shot)
+    out += _SHIP.pack(ship.x, ship.y, ship.prev_x, ship.health, ship.lives,
+                      ship.invulnerable_start, ship.last_shot_time)
+
+    x, y, alive, frame = _fleet_arrays(fleet)
+    out += _FLEET.pack(fleet.rows, fleet.cols, fleet.direction, fleet.step_interval,
+                       fleet.last_step, fleet.grid.origin_x, fleet.grid.origin_y)
+    out += x.astype("<i4", copy=False).tobytes()
+    out += y.astype("<i4", copy=False).tobytes()
+    out += np.packbits(alive).tobytes()
+    out += np.packbits(frame.astype(bool)).tobytes()
+
+    if bullets.capacity > _MAX_BULLET_SLOTS:
+        raise SnapshotError(f"bullet pools over {_MAX_BULLET_SLOTS} slots cannot be snapshotted, "
+                            f"this one has {bullets.capacity}")
+    slots = bullets.indices()
+    run, rest = _free_list(bullets)
+    out += _BULLETS.pack(bullets.capacity, len(slots), run, len(rest))
+    live = np.empty(len(slots), dtype=_BULLET)
+    live["slot"] = slots
+    for name in ("x", "y", "w", "h", "vy", "prev_y", "owner"):
+        live[name] = getattr(bullets, name)[slots]
+    out += live.tobytes()
+    out += rest.astype("<u2", copy=False).tobytes()
+
+    out += array("I", words).tobytes()
+    out += _GAUSS.pack(gauss or 0.0)
+    return bytes(out)
+
+
+class _Reader:
+    """Sequential reader over a snapshot blob."""
+
+    def __init__(self, data: bytes):
+        self.data = memoryview(data)
+        self.pos = 0
+
+    def take(self, size: int) -> memoryview:
+        if self.pos + size > len(self.data):
+            raise SnapshotError("truncated snapshot")
+        chunk = self.data[self.pos:self.pos + size]
+        self.pos += size
+        return chunk
+
+    def unpack(self, fmt: struct.Struct) -> tuple:
+        return fmt.unpack(self.take(fmt.size))
+
+    def array(self, dtype, count: int) -> np.ndarray:
+        dtype = np.dtype(dtype)
+        return np.frombuffer(self.take(dtype.itemsize * count), dtype=dtype)
+
+
+def restore(state: GameState, data: bytes) -> None:
+    """
+    Overwrites the game state with a snapshot. The state must come from the
+    same GameConfig as the snapshot; its entities are reused in place.
+    """
+    reader = _Reader(data)
+    magic, version, mode, flags, has_gauss = reader.unpack(_HEADER)
+    if magic != MAGIC:
+        raise SnapshotError("not a snapshot")
+    if version != VERSION:
+        raise SnapshotError(f"unsupported snapshot version {version}")
+
+    time, score, level, transition_start, last_enemy_shot = reader.unpack(_GAME)
+    ship_fields = reader.unpack(_SHIP)
+    rows, cols, direction, step_interval, last_step, origin_x, origin_y = reader.unpack(_FLEET)
+    n = rows * cols
+    x = reader.array("<i4", n)
+    y = reader.array("<i4", n)
+    packed = (n + 7) // 8
+    alive = np.unpackbits(reader.array(np.uint8, packed), count=n).astype(bool)
+    frame = np.unpackbits(reader.array(np.uint8, packed), count=n)
+
+    capacity, count, run, rest_count = reader.unpack(_BULLETS)
+    bullets = state.bullets
+    if capacity != bullets.capacity:
+        raise SnapshotError(f"snapshot has {capacity} bullet slots, state has {bullets.capacity}")
+    live = reader.array(_BULLET, count)
+    rest = reader.array("<u2", rest_count).tolist()
+    words = reader.array("<u4", _RNG_WORDS).tolist()
+    gauss, = reader.unpack(_GAUSS)
+
+    state.clock.time = time
+    state.mode = _MODES[mode]
+    state.running = bool(flags & _RUNNING)
+    state.score = score
+    state.level = level
+    state.level_transition_start = transition_start
+    state.last_enemy_shot = last_enemy_shot
+    state.rng.setstate((3, tuple(words), gauss if has_gauss else None))
+
+    ship = state.spaceship
+    (ship.x, ship.y, ship.prev_x, ship.health, ship.lives,
+     ship.invulnerable_start, ship.last_shot_time) = ship_fields
+    ship.dead = bool(flags & _SHIP_DEAD)
+    ship.invulnerable = bool(flags & _SHIP_INVULNERABLE)
+
+    fleet = state.fleet
+    if (fleet.rows, fleet.cols) != (rows, cols):
+        fleet = state.fleet = new_fleet(state.config, state.clock, state.particles)
+        if (fleet.rows, fleet.cols) != (rows, cols):
+            raise SnapshotError(f"snapshot fleet is {cols}x{rows}, config is {fleet.cols}x{fleet.rows}")
+    fleet.direction = direction
+    fleet.step_interval = step_interval
+    fleet.last_step = last_step
+    fleet.grid.origin_x = origin_x
+    fleet.grid.origin_y = origin_y
+    _load_fleet(fleet, x, y, alive, frame)
+
+    bullets.active[:] = False
+    slots = live["slot"].astype(np.intp)
+    for name in ("x", "y", "w", "h", "vy", "prev_y", "owner"):
+        getattr(bullets, name)[slots] = live[name]
+    bullets.active[slots] = True
+    bullets._free = list(range(capacity - 1, capacity - 1 - run, -1)) + rest
+    bullets._counts = dict(Counter(live["owner"].tolist()))
+
+
+class RollbackBuffer:
+    """
+    Ring buffer of snapshots of the last `capacity` ticks.
+
+    Call push() after each step(); rollback() rewinds the state to an
+    earlier tick still in the buffer and drops the newer snapshots.
+    """
+
+    def __init__(self, capacity: int = ROLLBACK_TICKS):
+        self.capacity = capacity
+        self._snapshots = [None] * capacity
+        self._ticks = [-1] * capacity
+        self.newest = -1
+
+    def __len__(self) -> int:
+        return sum(1 for tick in self._ticks if tick >= 0)
+
+    def push(self, tick: int, state: GameState) -> None:
+        """Stores the state as of the given tick."""
+        slot = tick % self.capacity
+        self._snapshots[slot] = snapshot(state)
+        self._ticks[slot] = tick
+        self.newest = tick
+
+    def get(self, tick: int) -> bytes | None:
+        """The snapshot for a tick, or None if it is not in the buffer."""
+        slot = tick % self.capacity
+        return self._snapshots[slot] if self._ticks[slot] == tick else None
+
+    def rollback(self, state: GameState, tick: int) -> None:
+        """Restores the state as of `tick`, forgetting every later tick."""
+        data = self.get(tick)
+        if data is None:
+            raise KeyError(f"tick {tick} is not in the rollback buffer")
+        restore(state, data)
+        for later in range(tick + 1, min(self.newest, tick + self.capacity) + 1):
+            slot = later % self.capacity
+            if self._ticks[slot] == later:
+                self._ticks[slot] = -1
+                self._snapshots[slot] = None
+        self.newest = tick
+
+
+def save_state(state: GameState, path: str) -> None:
+    """Writes a snapshot of the state to a file."""
+    with open(path, "wb") as f:
+        f.write(snapshot(state))
+
+
+def load_state(state: GameState, path: str) -> None:
+    """Restores the state from a snapshot file."""
+    with open(path, "rb") as f:
+        restore(state, f.read())
@@ -0,0 +1,162 @@
+"""
+Spatial indexes used to narrow down collision checks.
+
+FleetGrid exploits the fleet's regular layout to map a rect straight to the
+few (row, col) cells it can touch, and FleetOccupancy tracks which of those
+cells still hold a living enemy.
+
+Enemy bullets against the player ship need no index of their own: a ship is
+one rect, and BulletPool.collide tests it against every live bullet in a few
+vectorized comparisons, which costs less than keeping a bucket grid in step
+with bullets that move every tick. Static obstacles such as bunkers would go
+through the same call.
+"""
+from collections.abc import Callable
+from dataclasses import dataclass
+import numpy as np
+import pygame
+
+
+@dataclass
+class FleetGrid:
+    """
+    Index over a rows x cols formation whose cell (r, c) starts at
+    (origin_x + c * pitch_x, origin_y + r * pitch_y).
+
+    Each enemy lies inside its pitch cell, so only the cells a rect overlaps
+    can hold an enemy that collides with it. The fleet moves as a block, so
+    staying in sync is a matter of translating the origin.
+    """
+    rows: int
+    cols: int
+    origin_x: int
+    origin_y: int
+    pitch_x: int
+    pitch_y: int
+
+    def translate(self, dx: int, dy: int) -> None:
+        """Moves the whole grid by (dx, dy)."""
+        self.origin_x += dx
+        self.origin_y += dy
+
+    def cell_range(self, rect: pygame.Rect):
+        """
+        Returns (row_start, row_end, col_start, col_end) of the cells the rect
+        overlaps, as half-open ranges, or None if it misses the grid entirely.
+        """
+        c0 = max(0, (rect.left - self.origin_x) // self.pitch_x)
+        c1 = min(self.cols, (rect.right - 1 - self.origin_x) // self.pitch_x + 1)
+        r0 = max(0, (rect.top - self.origin_y) // self.pitch_y)
+        r1 = min(self.rows, (rect.bottom - 1 - self.origin_y) // self.pitch_y + 1)
+        if c0 >= c1 or r0 >= r1:
+            return None
+        return r0, r1, c0, c1
+
+    def cells(self, rect: pygame.Rect):
+        """Yields the (row, col) cells the rect overlaps, in row-major order."""
+        span = self.cell_range(rect)
+        if span is None:
+            return
+        r0, r1, c0, c1 = span
+        for r in range(r0, r1):
+            for c in range(c0, c1):
+                yield r, c
+
+
+class FleetOccupancy:
+    """
+    Living-enemy bookkeeping for a rows x cols formation that starts full,
+    updated one kill at a time.
+
+    Counts change in O(1) per kill. The bottom-most row of a column and the
+    outermost occupied rows and columns only move inwards, so keeping them
+    current costs O(rows + cols) over the whole life of the fleet. Dropping
+    an emptied column from occupied_cols is an O(cols) list removal, done at
+    most once per column: O(cols * cols) over the fleet's life, amortized
+    O(cols / rows) per kill. The list stays in ascending order because seeded
+    shooter selection indexes into it, and a swap-remove would make the
+    order depend on kill history, which recount() cannot rebuild after a
+    snapshot restore.
+
+    Attributes:
+        alive (int): Number of living enemies.
+        row_counts, col_counts (list[int]): Living enemies per row and column.
+        bottom (list[int]): Row of the bottom-most living enemy in each
+            column, or -1 once the column is empty.
+        occupied_cols (list[int]): Columns with a living enemy, ascending.
+        first_row, last_row, first_col, last_col (int): Outermost occupied
+            rows and columns; meaningless once alive is 0.
+    """
+
+    def __init__(self, rows: int, cols: int, is_alive: Callable[[int, int], bool]):
+        self.rows = rows
+        self.cols = cols
+        self.is_alive = is_alive
+        self.alive = rows * cols
+        self.row_counts = [cols] * rows
+        self.col_counts = [rows] * cols
+        self.bottom = [rows - 1] * cols
+        self.occupied_cols = list(range(cols))
+        self.first_row, self.last_row = 0, rows - 1
+        self.first_col, self.last_col = 0, cols - 1
+
+    def recount(self, alive: np.ndarray) -> None:
+        """
+        Rebuilds everything from a rows x cols array of alive flags, after
+        enemies were revived or replaced in bulk.
+        """
+        row_counts = alive.sum(axis=1)
+        col_counts = alive.sum(axis=0)
+        # bottom-most alive row per column: first hit scanning the flipped grid
+        bottom = np.where(col_counts > 0, self.rows - 1 - alive[::-1].argmax(axis=0), -1)
+        self.alive = int(row_counts.sum())
+        self.row_counts = row_counts.tolist()
+        self.col_counts = col_counts.tolist()
+        self.bottom = bottom.tolist()
+        self.occupied_cols = np.flatnonzero(col_counts).tolist()
+        if self.alive:
+            rows = np.flatnonzero(row_counts)
+            self.first_row, self.last_row = int(rows[0]), int(rows[-1])
+            self.first_col, self.last_col = self.occupied_cols[0], self.occupied_cols[-1]
+
+    def kill(self, row: int, col: int) -> None:
+        """Records the death of the enemy at (row, col), after is_alive reflects it."""
+        self.alive -= 1
+        self.row_counts[row] -= 1
+        self.col_counts[col] -= 1
+
+        if not self.col_counts[col]:
+            self.bottom[col] = -1
+            # O(cols), once per column; see the class docstring
+            self.occupied_cols.remove(col)
+        elif self.bottom[col] == row:
+            r = row - 1
+            while not self.is_alive(r, col):
+                r -= 1
+            self.bottom[col] = r
+
+        if not self.alive:
+            return
+        counts = self.row_counts
+        while not counts[self.first_row]:
+            self.first_row += 1
+        while not counts[self.last_row]:
+            self.last_row -= 1
+        counts = self.col_counts
+        while not counts[self.first_col]:
+            self.first_col += 1
+        while not counts[self.last_col]:
+            self.last_col -= 1
+
+    def bounds(self, grid: FleetGrid, w: int, h: int) -> tuple[int, int, int, int] | None:
+        """
+        (left, top, right, bottom) of the living w x h enemies laid out on
+        the grid, or None if none are left.
+        """
+        if not self.alive:
+            return None
+        return (grid.origin_x + self.first_col * grid.pitch_x,
+                grid.origin_y + self.first_row * grid.pitch_y,
+                grid.origin_x + self.last_col * grid.pitch_x + w,
+                grid.origin_y + self.last_row * grid.pitch_y + h)
+
@@ -1,4 +1,7 @@
 import pygame
+import threading
+from collections import OrderedDict
+from src.constants import COLOR_ALIEN
 
 """
 Module containing pixel art data and sprite drawing utilities.
@@ -40,6 +43,10 @@ PLAYER_SHIP = [
     "1111111111111"
 ]
 
+# Every alien sprite the fleet draws, in animation-frame order; the index of
+# each entry is its area in the fleet's atlas
+ALIEN_ATLAS = [(ALIEN_A_1, COLOR_ALIEN), (ALIEN_A_2, COLOR_ALIEN)]
+
 def draw_pixel_sprite(screen: pygame.Surface, pattern: list[str], x: int, y: int, w: int, h: int, color: tuple[int, int, int]):
     """
     Draws a sprite based on a string pattern.
@@ -58,3 +65,144 @@ def draw_pixel_sprite(screen: pygame.Surface, pattern: list[str], x: int, y: int
                 py = y + r * pixel_h
                 # Draw slightly larger to avoid gaps or exact
                 pygame.draw.rect(screen, color, (px, py, pixel_w + 1, pixel_h + 1))
+
+
+# Maximum number of rasterized sprite surfaces kept in the cache
+SPRITE_CACHE_SIZE = 64
+
+
+class SpriteCache:
+    """
+    LRU cache of pre-rasterized sprite surfaces.
+    Each (pattern, width, height, color) is rasterized once into a
+    transparent pygame.Surface so drawing it is a single blit.
+    Safe to fill from a background thread while the game draws.
+    """
+
+    def __init__(self, max_size: int = SPRITE_CACHE_SIZE):
+        self.max_size = max_size
+        self._surfaces = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def clear(self) -> None:
+        """Drops every cached surface."""
+        with self._lock:
+            self._surfaces.clear()
+
+    def get(self, pattern: list[str], w: int, h: int, color: tuple[int, int, int]) -> pygame.Surface:
+        """Returns the rasterized surface for the sprite, building it on a miss."""
+        key = (tuple(pattern), w, h, tuple(color))
+        with self._lock:
+            surf = self._surfaces.get(key)
+            if surf is not None:
+                # mark as most recently used
+                self._surfaces.move_to_end(key)
+                return surf
+
+            surf = rasterize_sprite(pattern, w, h, color)
+            self._surfaces[key] = surf
+            if len(self._surfaces) > self.max_size:
+                # evict the least recently used entry
+                self._surfaces.popitem(last=False)
+            return surf
+
+
+def rasterize_sprite(pattern: list[str], w: int, h: int, color: tuple[int, int, int]) -> pygame.Surface:
+    """
+    Renders a sprite pattern into a new transparent surface.
+    The output matches draw_pixel_sprite drawn at the origin, including the
+    extra pixel it draws past the right and bottom edges.
+    """
+    surf = pygame.Surface((w + 1, h + 1), pygame.SRCALPHA)
+    draw_pixel_sprite(surf, pattern, 0, 0, w, h, color)
+    # convert to the display format when a display exists for faster blits
+    if pygame.display.get_surface() is not None:
+        surf = surf.convert_alpha()
+    return surf
+
+
+# Shared cache used by the entities
+sprite_cache = SpriteCache()
+
+
+class SpriteAtlas:
+    """
+    Sprites of one size rasterized side by side into a single surface, so
+    any number of them can be drawn with one Surface.blits call, each blit
+    picking its sprite by `areas[i]`.
+    """
+
+    def __init__(self, entries: list[tuple[list[str], tuple[int, int, int]]], w: int, h: int):
+        # each cell includes the extra pixel draw_pixel_sprite draws past w x h
+        surface = pygame.Surface(((w + 1) * len(entries), h + 1), pygame.SRCALPHA)
+        self.areas = []
+        for i, (pattern, color) in enumerate(entries):
+            area = pygame.Rect(i * (w + 1), 0, w + 1, h + 1)
+            draw_pixel_sprite(surface.subsurface(area), pattern, 0, 0, w, h, color)
+            self.areas.append(area)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        self.surface = surface
+
+
+class AtlasCache:
+    """Atlases by (entries, width, height), built once. Thread-safe like SpriteCache."""
+
+    def __init__(self):
+        self._atlases = {}
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        """Drops every cached atlas."""
+        with self._lock:
+            self._atlases.clear()
+
+    def get(self, entries: list[tuple[list[str], tuple[int, int, int]]], w: int, h: int) -> SpriteAtlas:
+        """Returns the atlas of the entries drawn at w x h, building it on a miss."""
+        key = (tuple((tuple(pattern), tuple(color)) for pattern, color in entries), w, h)
+        with self._lock:
+            atlas = self._atlases.get(key)
+            if atlas is None:
+                atlas = self._atlases[key] = SpriteAtlas(entries, w, h)
+            return atlas
+
+
+# Shared atlas cache used by the fleets
+atlas_cache = AtlasCache()
+
+
+def blit_sprite(screen: pygame.Surface, pattern: list[str], x: int, y: int, w: int, h: int,
+                color: tuple[int, int, int], scale: int = 1) -> None:
+    """
+    Draws a sprite with a single blit of its cached surface.
+    Drop-in replacement for draw_pixel_sprite. With `scale` above 1 the
+    position and size are given in screen coordinates and drawn at 1/scale.
+    """
+    screen.blit(sprite_cache.get(pattern, w // scale, h // scale, color), (x // scale, y // scale))
+
+
+def warm_sprite_cache(sprites: list[tuple[list[str], int, int, tuple[int, int, int]]],
+                      atlases: list[tuple[list, int, int]] = ()) -> None:
+    """
+    Rasterizes the given (pattern, w, h, color) sprites and (entries, w, h)
+    atlases ahead of time.
+    """
+    for pattern, w, h, color in sprites:
+        sprite_cache.get(pattern, w, h, color)
+    for entries, w, h in atlases:
+        atlas_cache.get(entries, w, h)
+
+
+def warm_sprite_cache_async(sprites: list[tuple[list[str], int, int, tuple[int, int, int]]],
+                            atlases: list[tuple[list, int, int]] = ()) -> threading.Thread:
+    """
+    Rasterizes the sprites and atlases on a background thread and returns
+    it. Anything drawn before it finishes is simply rasterized on demand.
+    """
+    thread = threading.Thread(target=warm_sprite_cache, args=(sprites, atlases), name="sprite-warmup",
+                              daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,103 @@
+"""
+Scrolling parallax starfield backed by NumPy arrays.
+
+Star positions and speeds are arrays updated in one vectorized pass, and
+drawing writes every star's pixels at once through pygame.surfarray, so the
+per-frame cost stays flat from a hundred stars to tens of thousands.
+"""
+import numpy as np
+import pygame
+from src.constants import *
+
+# Pixel offsets matching pygame.draw.circle for radius 1 (2x2) and radius 2
+_SMALL_STAMP = [(dx, dy) for dy in (-1, 0) for dx in (-1, 0)]
+_LARGE_STAMP = ([(dx, -2) for dx in (-1, 0)] + [(dx, dy) for dy in (-1, 0) for dx in range(-2, 2)]
+                + [(dx, 1) for dx in (-1, 0)])
+
+
+class Starfield:
+    """
+    A field of stars scrolling down the screen at per-layer speeds.
+
+    Attributes:
+        x, y (np.ndarray): Star positions.
+        layer (np.ndarray): Parallax layer of each star, indexing `speeds`.
+        speeds (tuple): Pixels per tick for each layer, slowest first.
+    """
+
+    def __init__(self, count: int = 100, width: int = SCREEN_WIDTH, height: int = SCREEN_HEIGHT,
+                 speeds: tuple[int, ...] = (1, 2, 3), rng: np.random.Generator | None = None):
+        self.width = width
+        self.height = height
+        self.speeds = speeds
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        self.x = self.rng.integers(0, width, count, endpoint=True, dtype=np.int32)
+        self.y = self.rng.integers(0, height, count, endpoint=True, dtype=np.int32)
+        self.layer = self.rng.integers(0, len(speeds), count, dtype=np.int32)
+        self._speed = np.asarray(speeds, dtype=np.int32)[self.layer]
+
+        # Dim stars are slower, bright are faster; the fastest are drawn larger
+        self._colors = [min(255, speed * 80) for speed in speeds]
+        self._large = [speed > 2 for speed in speeds]
+        self._members = [np.flatnonzero(self.layer == k) for k in range(len(speeds))]
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def update(self) -> None:
+        """Scrolls the stars down, wrapping those that leave the bottom."""
+        self.y += self._speed
+        wrapped = self.y > self.height
+        n = int(np.count_nonzero(wrapped))
+        if n:
+            self.y[wrapped] = 0
+            self.x[wrapped] = self.rng.integers(0, self.width, n, endpoint=True, dtype=np.int32)
+
+    def _stamp(self, k: int, scale: int) -> list[tuple[int, int]]:
+        """Pixel offsets drawn for a star of layer k."""
+        if scale > 1:
+            # stars shrink below a pixel on a low-resolution target
+            return [(0, 0)]
+        return _LARGE_STAMP if self._large[k] else _SMALL_STAMP
+
+    def draw(self, screen: pygame.Surface, scale: int = 1) -> None:
+        """
+        Draws every star in bulk, one array write per layer and stamp pixel.
+        `scale` above 1 draws onto a 1/scale render target.
+        """
+        try:
+            pixels = pygame.surfarray.pixels2d(screen)
+        except ValueError:
+            # Surface formats without direct pixel access (e.g. 24-bit)
+            self._draw_rects(screen, scale)
+            return
+
+        w, h = pixels.shape
+        for k, members in enumerate(self._members):
+            if not len(members):
+                continue
+            value = self._colors[k]
+            color = screen.map_rgb((value, value, value))
+            xs = self.x[members] // scale
+            ys = self.y[members] // scale
+            for dx, dy in self._stamp(k, scale):
+                px = xs + dx
+                py = ys + dy
+                visible = (px >= 0) & (px < w) & (py >= 0) & (py < h)
+                pixels[px[visible], py[visible]] = color
+        # release the surface lock
+        del pixels
+
+    def _draw_rects(self, screen: pygame.Surface, scale: int = 1) -> None:
+        """Fallback drawing with one fill per stamp pixel."""
+        for k, members in enumerate(self._members):
+            value = self._colors[k]
+            stamp = self._stamp(k, scale)
+            for x, y in zip((self.x[members] // scale).tolist(), (self.y[members] // scale).tolist()):
+                for dx, dy in stamp:
+                    screen.fill((value, value, value), (x + dx, y + dy, 1, 1))
+
+    def rects(self) -> list[pygame.Rect]:
+        """Bounds of every star as drawn, for dirty-rect tracking."""
+        return [pygame.Rect(x - 2, y - 2, 4, 4) for x, y in zip(self.x.tolist(), self.y.tolist())]
@@ -0,0 +1,75 @@
+"""
+Font loading and rendered-text caching.
+
+Fonts are created once per size and rendered strings are kept in an LRU
+cache keyed by (size, text, color), so static labels are rendered once.
+HudText covers values that change during play (score, lives, level) and
+only re-renders when its value changes.
+"""
+from collections import OrderedDict
+import pygame
+from src.constants import FONT_PATH
+
+# Maximum number of rendered text surfaces kept in the cache
+TEXT_CACHE_SIZE = 64
+
+
+class TextCache:
+    """
+    Loads fonts once and caches rendered text surfaces with an LRU policy.
+    Fonts come straight from `font_path` (pygame's bundled font for None),
+    so no system font discovery happens.
+    """
+
+    def __init__(self, max_size: int = TEXT_CACHE_SIZE, font_path: str | None = FONT_PATH):
+        self.max_size = max_size
+        self.font_path = font_path
+        self._fonts = {}
+        self._surfaces = OrderedDict()
+
+    def font(self, size: int) -> pygame.font.Font:
+        """Returns the font at the given size, loading it on first use."""
+        font = self._fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(self.font_path, size)
+            self._fonts[size] = font
+        return font
+
+    def render(self, text: str, size: int, color: tuple[int, int, int]) -> pygame.Surface:
+        """Returns the rendered (antialiased) text, rendering it on a miss."""
+        key = (size, text, tuple(color))
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            # mark as most recently used
+            self._surfaces.move_to_end(key)
+            return surf
+
+        surf = self.font(size).render(text, True, color)
+        self._surfaces[key] = surf
+        if len(self._surfaces) > self.max_size:
+            # evict the least recently used entry
+            self._surfaces.popitem(last=False)
+        return surf
+
+
+class HudText:
+    """
+    A label built from a template such as "Score: {}" that re-renders only
+    when the value it displays changes.
+    """
+
+    def __init__(self, text: TextCache, template: str, size: int, color: tuple[int, int, int]):
+        self.text = text
+        self.template = template
+        self.size = size
+        self.color = color
+        self._value = None
+        self._surface = None
+
+    def render(self, value) -> pygame.Surface:
+        """Returns the label surface for the value."""
+        if self._surface is None or value != self._value:
+            # Rendered directly so changing values don't churn the shared cache
+            self._surface = self.text.font(self.size).render(self.template.format(value), True, self.color)
+            self._value = value
+        return self._surface
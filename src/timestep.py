@@ -0,0 +1,58 @@
+"""
+Fixed-timestep scheduling.
+
+FixedTimestep turns variable frame times into a whole number of simulation
+ticks using an accumulator, so gameplay advances at the same rate whatever
+the display refresh rate or frame time.
+"""
+from src.constants import *
+from src.clock import FixedStepClock
+
+
+class FixedTimestep:
+    """
+    Accumulates elapsed frame time and releases it as fixed-length ticks.
+
+    Attributes:
+        tick_rate (int): Simulation ticks per second.
+        max_catch_up (int): Most ticks run in a single frame; time beyond it
+            is dropped so a long stall can't spiral into longer frames.
+        ticks (int): Ticks released so far.
+        dropped (int): Ticks discarded by the catch-up limit.
+    """
+
+    def __init__(self, tick_rate: int = TICK_RATE, max_catch_up: int = MAX_CATCH_UP_TICKS):
+        self.tick_rate = tick_rate
+        self.tick_ms = 1000 / tick_rate
+        self.max_catch_up = max_catch_up
+        self.accumulator = 0.0
+        self.dropped = 0
+        self._ticker = FixedStepClock(tick_rate)
+
+    @property
+    def ticks(self) -> int:
+        """Ticks released so far."""
+        return self._ticker.ticks
+
+    def add_time(self, frame_ms: float) -> int:
+        """Adds a frame's elapsed time; returns how many ticks to run now."""
+        self.accumulator += frame_ms
+        n = int(self.accumulator // self.tick_ms)
+        if n > self.max_catch_up:
+            self.dropped += n - self.max_catch_up
+            self.accumulator -= (n - self.max_catch_up) * self.tick_ms
+            n = self.max_catch_up
+        self.accumulator -= n * self.tick_ms
+        return n
+
+    def next_dt(self) -> int:
+        """
+        Integer milliseconds for the next tick. Values alternate (16, 17, 17
+        at 60 Hz) so simulation time stays exactly ticks * 1000 / tick_rate.
+        """
+        return self._ticker.tick()
+
+    @property
+    def alpha(self) -> float:
+        """How far rendering is between the last tick and the next (0..1)."""
+        return self.accumulator / self.tick_ms
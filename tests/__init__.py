@@ -0,0 +1,11 @@
+"""
+Regression tests. Run from the repository root with
+
+    python -m unittest
+
+Everything runs headless under SDL's dummy video driver.
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
@@ -0,0 +1,136 @@
+"""
+End-to-end co-op over localhost: a CoopServer on an ephemeral port and bot
+clients, plus the ways a malformed peer gets disconnected.
+"""
+import asyncio
+import unittest
+import numpy as np
+from src.client import CoopClient, BotPilot
+from src.netstate import (HELLO, INPUT, WELCOME, ProtocolError, WorldView, capture, encode_delta,
+                          delta_message, message, read_message, max_delta_message, MAX_WELCOME_MESSAGE)
+from src.server import CoopServer
+from src.simulation import GameConfig
+
+# A fast tick keeps the test short; the session is the same at any rate
+TICK_RATE = 240
+TICKS = 300
+TIMEOUT = 10.0
+
+
+def assert_views_equal(test: unittest.TestCase, view: WorldView, expected: WorldView) -> None:
+    test.assertEqual((view.tick, view.score, view.level, view.mode, view.in_transition, view.frame,
+                      view.rows, view.cols, view.origin_x, view.origin_y),
+                     (expected.tick, expected.score, expected.level, expected.mode, expected.in_transition,
+                      expected.frame, expected.rows, expected.cols, expected.origin_x, expected.origin_y))
+    np.testing.assert_array_equal(view.alive, expected.alive)
+    test.assertEqual(view.ships, expected.ships)
+    active = expected.bullets["active"]
+    np.testing.assert_array_equal(view.bullets["active"], active)
+    for name in ("x", "y", "w", "h", "vy", "owner"):
+        np.testing.assert_array_equal(view.bullets[name][active], expected.bullets[name][active], name)
+
+
+async def _until(condition, timeout: float = TIMEOUT) -> None:
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.005)
+
+
+class CoopTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.unhandled = []
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: self.unhandled.append(context))
+        self.server = CoopServer(GameConfig(enemy_shot_interval=200), tick_rate=TICK_RATE, seed=1)
+        self.port = await self.server.start("127.0.0.1", 0)
+
+    async def asyncTearDown(self):
+        await self.server.close()
+        self.assertEqual(self.unhandled, [])
+
+    async def _connect(self) -> CoopClient:
+        client = CoopClient()
+        await client.connect("127.0.0.1", self.port)
+        self.addAsyncCleanup(client.close)
+        return client
+
+    async def _raw_join(self):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        self.addCleanup(writer.close)
+        writer.write(message(HELLO))
+        msg_type, _ = await read_message(reader, MAX_WELCOME_MESSAGE)
+        self.assertEqual(msg_type, WELCOME)
+        return reader, writer
+
+    async def _disconnected(self, reader: asyncio.StreamReader) -> None:
+        """Waits for the server to close the stream, skipping the deltas sent until then."""
+        async with asyncio.timeout(TIMEOUT):
+            while await reader.read(4096):
+                pass
+
+    async def test_two_bots_stay_in_sync(self):
+        server = self.server
+        clients = [await self._connect(), await self._connect()]
+        self.assertEqual(sorted(client.player for client in clients), [0, 1])
+        pilots = [BotPilot(seed=i) for i in range(len(clients))]
+
+        async def play():
+            while server.state.tick < TICKS:
+                for client, pilot in zip(clients, pilots):
+                    client.send_input(pilot(client))
+                await asyncio.sleep(1 / TICK_RATE)
+        async with asyncio.timeout(TIMEOUT):
+            await play()
+
+        # freeze the session, then let the last deltas arrive
+        server._ticks.cancel()
+        tick = server.state.tick
+        await _until(lambda: all(client.view.tick == tick for client in clients))
+
+        expected = capture(server.state, server._fleet_id)
+        for client in clients:
+            self.assertTrue(client.connected)
+            assert_views_equal(self, client.view, expected)
+        self.assertGreater(server.metrics.stats()["delta_bytes"]["samples"], 0)
+
+    async def test_malformed_delta_disconnects_client(self):
+        client = await self._connect()
+        view = client.view
+        bad = bytearray(encode_delta(view, view))
+        # mode byte, after tick, score and level
+        bad[10] = 9
+        client._reader.feed_data(delta_message(0, bytes(bad)))
+        await _until(lambda: not client.connected)
+        self.assertIsInstance(client.error, ProtocolError)
+
+    async def test_short_input_disconnects_peer(self):
+        reader, writer = await self._raw_join()
+        await _until(lambda: len(self.server.clients) == 1)
+        writer.write(message(INPUT, b"\x01"))
+        await self._disconnected(reader)
+        await _until(lambda: not self.server.clients)
+
+    async def test_undefined_input_bits_disconnect_peer(self):
+        reader, writer = await self._raw_join()
+        writer.write(message(INPUT, (1).to_bytes(4, "little") + bytes([0x80])))
+        await self._disconnected(reader)
+        await _until(lambda: not self.server.clients)
+
+    async def test_oversized_length_disconnects_peer(self):
+        reader, writer = await self._raw_join()
+        writer.write((1 << 31).to_bytes(4, "little"))
+        await self._disconnected(reader)
+        await _until(lambda: not self.server.clients)
+
+    async def test_keyframe_fits_message_limit(self):
+        client = await self._connect()
+        config = client.config
+        state = self.server.state
+        for i in range(config.bullet_capacity):
+            state.bullets.spawn(i, i, 6, 14, 5, -1)
+        keyframe = delta_message(0, encode_delta(WorldView(config.bullet_capacity), capture(state, 0)))
+        self.assertLessEqual(len(keyframe) - 4, max_delta_message(config))
+
+
+if __name__ == "__main__":
+    unittest.main()
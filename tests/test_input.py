@@ -0,0 +1,83 @@
+"""
+InputQueue must turn every press and release into at least one tick, in the
+order the events happened.
+"""
+import unittest
+import pygame
+from src.input import InputQueue
+from src.simulation import Inputs
+
+
+def key(event_type: int, key_code: int) -> pygame.event.Event:
+    return pygame.event.Event(event_type, key=key_code)
+
+
+def tap(queue: InputQueue, key_code: int, now: float) -> None:
+    queue.push(key(pygame.KEYDOWN, key_code), now)
+    queue.push(key(pygame.KEYUP, key_code), now)
+
+
+def ticks(queue: InputQueue, n: int) -> list[Inputs]:
+    return [queue.next_inputs() for _ in range(n)]
+
+
+class InputQueueTest(unittest.TestCase):
+
+    def test_tap_within_one_frame_lasts_one_tick(self):
+        queue = InputQueue()
+        tap(queue, pygame.K_SPACE, 1.0)
+        self.assertEqual([inputs.fire for inputs in ticks(queue, 3)], [True, False, False])
+        self.assertEqual(len(queue), 0)
+        self.assertEqual(queue.held, set())
+
+    def test_each_tap_gets_its_own_tick(self):
+        queue = InputQueue()
+        tap(queue, pygame.K_RIGHT, 1.0)
+        tap(queue, pygame.K_RIGHT, 1.0)
+        self.assertEqual([inputs.right for inputs in ticks(queue, 5)], [True, False, True, False, False])
+
+    def test_events_keep_their_order(self):
+        queue = InputQueue()
+        tap(queue, pygame.K_LEFT, 1.0)
+        tap(queue, pygame.K_SPACE, 1.0)
+        first, second = ticks(queue, 2)
+        # the fire press waits behind the left release, which waits behind the left press
+        self.assertEqual((first.left, first.fire), (True, False))
+        self.assertEqual((second.left, second.fire), (False, True))
+
+    def test_hold_across_frames(self):
+        queue = InputQueue()
+        queue.push(key(pygame.KEYDOWN, pygame.K_LEFT), 1.0)
+        self.assertTrue(all(inputs.left for inputs in ticks(queue, 4)))
+        queue.push(key(pygame.KEYUP, pygame.K_LEFT), 2.0)
+        self.assertEqual([inputs.left for inputs in ticks(queue, 2)], [False, False])
+
+    def test_focus_loss_releases_everything(self):
+        queue = InputQueue()
+        queue.push(key(pygame.KEYDOWN, pygame.K_LEFT), 1.0)
+        queue.next_inputs()
+        queue.push(key(pygame.KEYDOWN, pygame.K_SPACE), 2.0)
+        self.assertTrue(queue.push(pygame.event.Event(pygame.WINDOWFOCUSLOST), 2.0))
+        self.assertEqual(ticks(queue, 3)[-1], Inputs())
+        self.assertEqual(queue.held, set())
+
+    def test_ignores_unbound_events(self):
+        queue = InputQueue()
+        self.assertFalse(queue.push(key(pygame.KEYDOWN, pygame.K_a), 1.0))
+        self.assertFalse(queue.push(pygame.event.Event(pygame.MOUSEMOTION, pos=(1, 2)), 1.0))
+        self.assertEqual(len(queue), 0)
+
+    def test_latency_from_oldest_applied_event(self):
+        queue = InputQueue()
+        self.assertIsNone(queue.take_latency(1.0))
+        tap(queue, pygame.K_SPACE, 1.0)
+        queue.next_inputs()
+        self.assertAlmostEqual(queue.take_latency(1.025), 25.0)
+        # the release was applied after the last call
+        queue.next_inputs()
+        self.assertAlmostEqual(queue.take_latency(1.05), 50.0)
+        self.assertIsNone(queue.take_latency(1.1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+The delta codec: a client applying every delta must hold exactly the view
+the server captured, and malformed input must be rejected without effect.
+"""
+import copy
+import unittest
+import numpy as np
+from src.clock import FixedStepClock
+from src.constants import *
+from src.coop import add_player, new_coop_game, step_coop
+from src.netstate import (ProtocolError, WorldView, apply_delta, capture, check_config, encode_delta,
+                          input_message, parse_input)
+from src.simulation import GameConfig, FLEET_BACKENDS, Inputs, PLAYING, GAMEOVER
+from tests.test_coop import assert_views_equal
+
+TICKS = 3000
+
+
+def config(backend: str) -> GameConfig:
+    # a small fleet and heavy fire: new levels, lost games and restarts come quickly
+    return GameConfig(fleet_backend=backend, enemy_rows=2, enemy_cols=3, enemy_shot_interval=200)
+
+
+def pilot(view: WorldView, config: GameConfig, player: int) -> Inputs:
+    """Keeps a ship under a living column, firing; restarts lost games."""
+    if view.mode == GAMEOVER:
+        return Inputs(restart=True)
+    cols = np.flatnonzero(view.alive.reshape(view.rows, view.cols).any(axis=0))
+    if not len(cols):
+        return Inputs()
+    col = cols[player % len(cols)]
+    target = view.origin_x + col * (config.enemy_w + config.enemy_h_spacing) + config.enemy_w // 2
+    x = view.ships[player][0] + config.ship_width // 2
+    return Inputs(left=x > target + 4, right=x < target - 4, fire=True)
+
+
+def session(backend: str):
+    """Yields the server's view after each tick of a two-player session."""
+    cfg = config(backend)
+    state = new_coop_game(cfg, seed=3)
+    players = [add_player(state), add_player(state)]
+    ticker = FixedStepClock(TICK_RATE)
+    fleet, fleet_id = state.fleet, 0
+    view = capture(state, fleet_id)
+    yield view
+    for _ in range(TICKS):
+        step_coop(state, {player: pilot(view, cfg, player) for player in players}, ticker.tick())
+        if state.fleet is not fleet:
+            fleet, fleet_id = state.fleet, fleet_id + 1
+        view = capture(state, fleet_id)
+        yield view
+
+
+def assert_unchanged(test: unittest.TestCase, view: WorldView, before: WorldView) -> None:
+    assert_views_equal(test, view, before)
+    test.assertEqual(view.fleet_id, before.fleet_id)
+    np.testing.assert_array_equal(view.bullets, before.bullets)
+
+
+class DeltaTest(unittest.TestCase):
+
+    def test_client_tracks_server(self):
+        for backend in FLEET_BACKENDS:
+            with self.subTest(backend=backend):
+                views = session(backend)
+                prev = next(views)
+                # a late joiner starts from an empty view and gets a keyframe
+                client = WorldView(config(backend).bullet_capacity)
+                apply_delta(client, encode_delta(WorldView(len(client.bullets)), prev))
+                assert_views_equal(self, client, prev)
+
+                modes = set()
+                for view in views:
+                    apply_delta(client, encode_delta(prev, view))
+                    assert_views_equal(self, client, view)
+                    self.assertEqual(client.fleet_id, view.fleet_id)
+                    modes.add(view.mode)
+                    prev = view
+                self.assertGreater(prev.fleet_id, 0, "the session should spawn a new fleet")
+                self.assertEqual(modes, {PLAYING, GAMEOVER})
+
+    def test_delta_offset(self):
+        views = session("objects")
+        first, second = next(views), next(views)
+        client = WorldView(len(first.bullets))
+        apply_delta(client, b"\xff" * 5 + encode_delta(WorldView(len(first.bullets)), first), pos=5)
+        apply_delta(client, b"\xff" * 3 + encode_delta(first, second), pos=3)
+        assert_views_equal(self, client, second)
+
+    def test_rejects_malformed_delta(self):
+        views = session("objects")
+        first = next(views)
+        capacity = len(first.bullets)
+        client = WorldView(capacity)
+        apply_delta(client, encode_delta(WorldView(capacity), first))
+        before = copy.deepcopy(client)
+
+        # one enemy of a fleet past the view's, then a bullet slot past the table
+        outside = copy.deepcopy(first)
+        outside.alive = np.ones(len(first.alive) + 1, dtype=bool)
+        killed = copy.deepcopy(outside)
+        killed.alive[-1] = False
+        bullet = copy.deepcopy(first)
+        bullet.bullets = np.zeros(capacity + 1, dtype=first.bullets.dtype)
+        bullet.bullets[capacity] = (True, 1, 2, 3, 4, 5, 0)
+        good = encode_delta(first, first)
+        bad_mode = bytearray(good)
+        # mode byte, after tick, score and level
+        bad_mode[10] = 9
+        bad = [bytes(bad_mode), encode_delta(outside, killed),
+               encode_delta(WorldView(capacity + 1), bullet), good[:-1], good[:5]]
+        for data in bad:
+            with self.assertRaises(ProtocolError):
+                apply_delta(client, data)
+            assert_unchanged(self, client, before)
+
+
+class InputTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        for inputs in (Inputs(), Inputs(left=True, fire=True), Inputs(True, True, True, True, True)):
+            data = input_message(70000, inputs.to_mask())[4:]
+            seq, mask = parse_input(data)
+            self.assertEqual((seq, Inputs.from_mask(mask)), (70000, inputs))
+
+    def test_rejects_malformed_input(self):
+        data = input_message(1, Inputs(fire=True).to_mask())[4:]
+        for bad in (data[:-1], data + b"\x00", data[:-1] + bytes([0x80])):
+            with self.assertRaises(ProtocolError):
+                parse_input(bad)
+
+
+class ConfigTest(unittest.TestCase):
+
+    def test_default_config_fits(self):
+        check_config(GameConfig())
+
+    def test_rejects_values_beyond_the_format(self):
+        for config in (GameConfig(bullet_capacity=70000), GameConfig(enemy_rows=300, enemy_cols=300),
+                       GameConfig(screen_width=40000), GameConfig(enemy_bullet_speed=200)):
+            with self.subTest(config=config), self.assertRaises(ProtocolError):
+                check_config(config)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Replays must survive serialization and reproduce the recorded session.
+"""
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.autopilot import DodgePolicy, RandomPolicy
+from src.clock import FixedStepClock
+from src.constants import *
+from src.particles import ParticleSystem
+from src.replay import MAGIC, Replay, ReplayError, play_headless
+from src.simulation import GameConfig, FLEET_BACKENDS, Inputs, new_game, step
+
+SEED = 7
+TICKS = 4000
+# Sparse enemy fire lets the dodging autopilot clear a level within TICKS
+CONFIG = GameConfig(enemy_shot_interval=400)
+
+
+def record(pilot, config: GameConfig | None = None, ticks: int = TICKS, **game) -> Replay:
+    """Plays a session with an autopilot, recording it as the game does."""
+    replay = Replay(SEED, TICK_RATE)
+    state = new_game(config, seed=SEED, **game)
+    ticker = FixedStepClock(TICK_RATE)
+    for _ in range(ticks):
+        inputs = pilot(state)
+        replay.record(inputs)
+        step(state, inputs, ticker.tick())
+    replay.finish(state)
+    return replay
+
+
+class ReplayTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        replay = record(RandomPolicy(SEED), ticks=500)
+        copy = Replay.from_bytes(replay.to_bytes())
+        self.assertEqual(copy, replay)
+        self.assertEqual(list(copy.inputs()), list(replay.inputs()))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "session.rpl")
+            replay.save(path)
+            self.assertEqual(Replay.load(path), replay)
+
+    def test_run_lengths_beyond_one_byte(self):
+        replay = Replay(SEED)
+        for inputs in [Inputs()] * 70000 + [Inputs(fire=True)] + [Inputs(left=True)] * 200:
+            replay.record(inputs)
+        data = replay.to_bytes()
+        self.assertLess(len(data), 40)
+        self.assertEqual(Replay.from_bytes(data), replay)
+
+    def test_playback_reproduces_outcome(self):
+        for backend in FLEET_BACKENDS:
+            with self.subTest(backend=backend):
+                config = GameConfig(fleet_backend=backend, enemy_shot_interval=CONFIG.enemy_shot_interval)
+                # explosions draw on their own RNG and must not disturb the game's
+                replay = record(DodgePolicy(SEED), config,
+                                particles=ParticleSystem(rng=np.random.default_rng(SEED)))
+                self.assertGreater(replay.level, 1, "the run should clear a level")
+                state = play_headless(Replay.from_bytes(replay.to_bytes()), config)
+                self.assertEqual((state.score, state.level), (replay.score, replay.level))
+
+    def test_other_seed_diverges(self):
+        replay = record(DodgePolicy(SEED), CONFIG)
+        replay.seed += 1
+        state = play_headless(replay, CONFIG)
+        self.assertNotEqual((state.score, state.level), (replay.score, replay.level))
+
+    def test_rejects_malformed_data(self):
+        data = record(RandomPolicy(SEED), ticks=100).to_bytes()
+        for bad in (data[:10], b"XXXX" + data[4:], MAGIC + bytes([99]) + data[5:], data[:-1], data + b"\x00\x01"):
+            with self.assertRaises(ReplayError):
+                Replay.from_bytes(bad)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Snapshots must continue a game exactly as the original would have, on both
+fleet backends.
+"""
+import unittest
+from src.autopilot import DodgePolicy
+from src.bullets import BulletPool
+from src.clock import FixedStepClock
+from src.constants import *
+from src.simulation import GameConfig, FLEET_BACKENDS, new_game, step
+from src.snapshot import SnapshotError, RollbackBuffer, snapshot, restore
+
+SEED = 7
+# Long enough for kills, lost lives and at least one new level
+TICKS = 4000
+SPLIT = 2345
+
+
+def play(state, pilot, ticker, ticks: int, record: list) -> None:
+    """Steps state for ticks ticks, recording each tick's inputs and length."""
+    for _ in range(ticks):
+        record.append((pilot(state), ticker.tick()))
+        step(state, *record[-1])
+
+
+class SnapshotTest(unittest.TestCase):
+
+    def config(self, backend: str) -> GameConfig:
+        return GameConfig(fleet_backend=backend, enemy_shot_interval=400)
+
+    def test_restore_continues_identically(self):
+        for backend in FLEET_BACKENDS:
+            with self.subTest(backend=backend):
+                config = self.config(backend)
+                original = new_game(config, seed=SEED)
+                ticker = FixedStepClock(TICK_RATE)
+                inputs = []
+                play(original, DodgePolicy(SEED), ticker, SPLIT, inputs)
+                saved = snapshot(original)
+                play(original, DodgePolicy(SEED + 1), ticker, TICKS - SPLIT, inputs)
+                self.assertGreater(original.level, 1, "the run should clear a level")
+
+                # a fresh game of the same config, restored mid-run and fed the same inputs
+                resumed = new_game(config, seed=0)
+                restore(resumed, saved)
+                self.assertEqual(snapshot(resumed), saved)
+                for tick_inputs, dt in inputs[SPLIT:]:
+                    step(resumed, tick_inputs, dt)
+                self.assertEqual(snapshot(resumed), snapshot(original))
+
+    def test_rollback_rewinds_and_replays(self):
+        for backend in FLEET_BACKENDS:
+            with self.subTest(backend=backend):
+                state = new_game(self.config(backend), seed=SEED)
+                pilot = DodgePolicy(SEED)
+                ticker = FixedStepClock(TICK_RATE)
+                buffer = RollbackBuffer(capacity=60)
+                inputs = []
+                for tick in range(200):
+                    play(state, pilot, ticker, 1, inputs)
+                    buffer.push(tick, state)
+                final = snapshot(state)
+
+                buffer.rollback(state, 150)
+                self.assertEqual(snapshot(state), buffer.get(150))
+                self.assertIsNone(buffer.get(151))
+                for tick_inputs, dt in inputs[151:]:
+                    step(state, tick_inputs, dt)
+                self.assertEqual(snapshot(state), final)
+                with self.assertRaises(KeyError):
+                    buffer.rollback(state, 100)
+
+    def test_rejects_mismatched_or_corrupt_data(self):
+        state = new_game(seed=SEED)
+        data = snapshot(state)
+        with self.assertRaises(SnapshotError):
+            restore(state, b"XXXX" + data[4:])
+        with self.assertRaises(SnapshotError):
+            restore(state, data[:-10])
+        with self.assertRaises(SnapshotError):
+            restore(new_game(GameConfig(bullet_capacity=16), seed=SEED), data)
+
+    def test_rejects_pools_beyond_u16_slots(self):
+        state = new_game(seed=SEED)
+        state.bullets = BulletPool(65537)
+        with self.assertRaises(SnapshotError):
+            snapshot(state)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+FleetOccupancy's incremental bookkeeping must always agree with a recount
+from scratch of the fleet's alive flags.
+"""
+import random
+import unittest
+import numpy as np
+from src.clock import ManualClock
+from src.simulation import GameConfig, FLEET_BACKENDS, new_fleet
+from src.spatial import FleetGrid, FleetOccupancy
+
+
+def brute_force(alive: np.ndarray) -> dict:
+    """Every FleetOccupancy field, recounted cell by cell."""
+    rows, cols = alive.shape
+    cells = [(r, c) for r in range(rows) for c in range(cols) if alive[r, c]]
+    expected = {
+        "alive": len(cells),
+        "row_counts": [sum(1 for r, _ in cells if r == row) for row in range(rows)],
+        "col_counts": [sum(1 for _, c in cells if c == col) for col in range(cols)],
+        "bottom": [max((r for r, c in cells if c == col), default=-1) for col in range(cols)],
+        "occupied_cols": sorted({c for _, c in cells}),
+    }
+    if cells:
+        expected.update(first_row=min(r for r, _ in cells), last_row=max(r for r, _ in cells),
+                        first_col=min(c for _, c in cells), last_col=max(c for _, c in cells))
+    return expected
+
+
+def fields(occupancy: FleetOccupancy, expected: dict) -> dict:
+    return {name: getattr(occupancy, name) for name in expected}
+
+
+class OccupancyTest(unittest.TestCase):
+
+    def assert_matches(self, occupancy: FleetOccupancy, alive: np.ndarray) -> None:
+        expected = brute_force(alive)
+        self.assertEqual(fields(occupancy, expected), expected)
+        fresh = FleetOccupancy(*alive.shape, lambda r, c: alive[r, c])
+        fresh.recount(alive)
+        self.assertEqual(fields(fresh, expected), expected)
+
+    def test_kills_in_random_order(self):
+        for seed in range(20):
+            rng = random.Random(seed)
+            rows, cols = rng.randint(1, 7), rng.randint(1, 13)
+            alive = np.ones((rows, cols), dtype=bool)
+            occupancy = FleetOccupancy(rows, cols, lambda r, c: alive[r, c])
+            cells = [(r, c) for r in range(rows) for c in range(cols)]
+            rng.shuffle(cells)
+            with self.subTest(seed=seed, rows=rows, cols=cols):
+                self.assert_matches(occupancy, alive)
+                for r, c in cells:
+                    alive[r, c] = False
+                    occupancy.kill(r, c)
+                    self.assert_matches(occupancy, alive)
+                self.assertIsNone(occupancy.bounds(FleetGrid(rows, cols, 0, 0, 10, 10), 8, 8))
+
+    def test_recount_after_revival(self):
+        rng = np.random.default_rng(1)
+        alive = rng.random((5, 11)) < 0.3
+        occupancy = FleetOccupancy(5, 11, lambda r, c: alive[r, c])
+        occupancy.recount(alive)
+        self.assert_matches(occupancy, alive)
+        # kills on top of a recount keep agreeing
+        for r, c in zip(*np.nonzero(alive)):
+            alive[r, c] = False
+            occupancy.kill(r, c)
+            self.assert_matches(occupancy, alive)
+
+    def test_fleet_backends(self):
+        for backend in FLEET_BACKENDS:
+            with self.subTest(backend=backend):
+                config = GameConfig(fleet_backend=backend)
+                fleet = new_fleet(config, ManualClock())
+                grid = fleet.grid
+                alive = np.ones((fleet.rows, fleet.cols), dtype=bool)
+                cells = [(r, c) for r in range(fleet.rows) for c in range(fleet.cols)]
+                random.Random(2).shuffle(cells)
+                for r, c in cells:
+                    fleet.enemies[r][c].hit()
+                    fleet.enemies[r][c].hit()  # a second hit on a dead enemy is ignored
+                    alive[r, c] = False
+                    self.assert_matches(fleet.occupancy, alive)
+
+                    living = [fleet.enemies[r][c].rect for r, c in zip(*np.nonzero(alive))]
+                    bounds = fleet.occupancy.bounds(grid, config.enemy_w, config.enemy_h)
+                    if living:
+                        union = living[0].unionall(living[1:])
+                        self.assertEqual(bounds, (union.left, union.top, union.right, union.bottom))
+                    else:
+                        self.assertIsNone(bounds)
+
+
+if __name__ == "__main__":
+    unittest.main()